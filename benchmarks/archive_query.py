@@ -0,0 +1,70 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+from array import array
+from pathlib import Path
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from tetris.analyze import METRICS, GameFilter, run_query  # noqa: E402
+from tetris.archive import ColumnTables, write_archive  # noqa: E402
+from tetris.constants import PIECE_CELLS  # noqa: E402
+
+
+def synthetic_tables(games: int, locks_per_game: int) -> ColumnTables:
+    rng = random.Random(0)
+    tables = ColumnTables()
+    total = games * locks_per_game
+    locks = tables.locks
+    locks["shape"] = array(
+        "B", (rng.choice(list(PIECE_CELLS.values())) for _ in range(total))
+    )
+    locks["rotation"] = array("B", bytes(total))
+    locks["lines"] = array("B", (rng.choice((0, 0, 0, 1, 2, 4)) for _ in range(total)))
+    locks["x"] = array("h", (rng.randrange(8) for _ in range(total)))
+    locks["time_ms"] = array("I", (idx % locks_per_game * 900 for idx in range(total)))
+    locks["score"] = array("i", (idx % locks_per_game * 40 for idx in range(total)))
+    table = tables.games
+    for game in range(games):
+        lines = rng.randrange(locks_per_game // 3)
+        table["player"].append(game % 2)
+        table["finished"].append(1)
+        table["level"].append(lines // 10 + 1)
+        table["start_ns"].append(game * 10**12)
+        table["duration_ms"].append(locks_per_game * 900)
+        table["score"].append(locks_per_game * 40)
+        table["lines"].append(lines)
+        table["garbage_sent"].append(rng.randrange(lines + 1))
+        table["garbage_received"].append(rng.randrange(20))
+        table["lock_start"].append(game * locks_per_game)
+        table["lock_count"].append(locks_per_game)
+    return tables
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Archive query time over many locks")
+    parser.add_argument("--games", type=int, default=50_000)
+    parser.add_argument("--locks-per-game", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.tcol"
+        start = time.perf_counter()
+        write_archive(path, synthetic_tables(args.games, args.locks_per_game))
+        print(
+            f"built {args.games * args.locks_per_game} locks "
+            f"({path.stat().st_size / 1e6:.0f} MB) in {time.perf_counter() - start:.1f} s"
+        )
+        for metric in METRICS:
+            for workers in sorted({1, args.workers}):
+                start = time.perf_counter()
+                run_query([path], metric, GameFilter(player=0), workers=workers)
+                elapsed = time.perf_counter() - start
+                print(f"{metric:>12} workers={workers:<3} {elapsed:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
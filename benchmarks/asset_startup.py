@@ -0,0 +1,101 @@
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+
+def startup(cache_dir: Path, use_bundle: bool) -> float:
+    start = time.perf_counter()
+    import pygame
+
+    from tetris.assets import ghost_tile, load_bundle
+    from tetris.audio import SOUND_EFFECTS, AudioManager, sine_pcm
+    from tetris.constants import CELL_COLORS
+    from tetris.game import static_text_labels
+
+    pygame.init()
+    pygame.display.set_mode((640, 640))
+    fonts = {
+        "title": pygame.font.Font(None, 64),
+        "font": pygame.font.Font(None, 32),
+        "small": pygame.font.Font(None, 24),
+    }
+    labels = static_text_labels()
+    if use_bundle:
+        bundle = load_bundle(fonts, labels, [32], SOUND_EFFECTS, sine_pcm, cache_dir)
+        assert bundle is not None
+        AudioManager(bundle)
+        for label in labels:
+            bundle.font(label.role, fonts[label.role]).render(
+                label.text, True, label.color
+            )
+        bundle.tiles(32)
+    else:
+        AudioManager()
+        for label in labels:
+            fonts[label.role].render(label.text, True, label.color)
+        for color in CELL_COLORS[1:]:
+            tile = pygame.Surface((32, 32))
+            tile.fill(color)
+            ghost_tile(color, 32)
+    elapsed = time.perf_counter() - start
+    pygame.quit()
+    return elapsed
+
+
+def run_child(cache_dir: Path, use_bundle: bool) -> float:
+    output = subprocess.check_output(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.asset_startup",
+            "--child",
+            str(cache_dir),
+            "--bundle" if use_bundle else "--no-bundle",
+        ],
+        text=True,
+    )
+    return float(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Cold and warm start time with and without the asset bundle"
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", type=Path)
+    parser.add_argument("--bundle", action=argparse.BooleanOptionalAction)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        print(startup(args.child, bool(args.bundle)))
+        return
+
+    cache_dir = Path(tempfile.mkdtemp())
+    try:
+        no_bundle = [run_child(cache_dir, False) for _ in range(args.runs)]
+        cold = []
+        for _ in range(args.runs):
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            cold.append(run_child(cache_dir, True))
+        warm = [run_child(cache_dir, True) for _ in range(args.runs)]
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    for name, samples in (
+        ("no bundle", no_bundle),
+        ("bundle cold", cold),
+        ("bundle warm", warm),
+    ):
+        print(f"{name:>12}: {min(samples) * 1000:7.1f} ms best of {len(samples)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import argparse
+import os
+import time
+from typing import Callable, List, Tuple
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame  # noqa: E402
+
+from tetris.audio import (  # noqa: E402
+    SOUND_EFFECTS,
+    VOICE_COUNT,
+    VoicePool,
+    player_pan,
+    sine_pcm,
+    stereo_pcm,
+)
+from tetris.constants import FPS  # noqa: E402
+
+LEGACY_CHANNELS = {"move": 1, "rotate": 2, "lock": 3, "line": 4, "hard_drop": 5}
+
+
+def frame_triggers(
+    frame: int, players: int, moves_per_frame: int
+) -> List[Tuple[str, int]]:
+    # Every player shifting at a sub-frame auto-repeat rate, rotating every
+    # few frames, and locking (sometimes clearing) about twice a second.
+    triggers = []
+    for player in range(players):
+        phase = frame + player * 7
+        triggers += [("move", player)] * moves_per_frame
+        if phase % 3 == 0:
+            triggers.append(("rotate", player))
+        if phase % 30 == 0:
+            triggers.append(("hard_drop", player))
+            triggers.append(("line" if phase % 90 == 0 else "lock", player))
+    return triggers
+
+
+def run(
+    name: str,
+    play: Callable[[str, int], None],
+    advance: Callable[[], None],
+    args: argparse.Namespace,
+    calls: Callable[[], int],
+) -> None:
+    elapsed = 0
+    issued = 0
+    clock = time.perf_counter_ns
+    for frame in range(args.frames):
+        triggers = frame_triggers(frame, args.players, args.moves_per_frame)
+        issued += len(triggers)
+        start = clock()
+        for effect, player in triggers:
+            play(effect, player)
+        elapsed += clock() - start
+        advance()
+    print(
+        f"{name:>7}: {elapsed / args.frames / 1000:6.1f} us/frame, "
+        f"{issued / args.frames:5.1f} triggers/frame, "
+        f"{calls() / args.frames:5.1f} mixer calls/frame"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Per-frame sound effect overhead: fixed channels vs voice pool"
+    )
+    parser.add_argument("--frames", type=int, default=3_000)
+    parser.add_argument("--players", type=int, nargs="+", default=[1, 2, 8])
+    parser.add_argument("--moves-per-frame", type=int, default=2)
+    args = parser.parse_args()
+
+    pygame.mixer.init(frequency=44_100, size=-16, channels=2)
+    pygame.mixer.set_num_channels(VOICE_COUNT)
+    sounds = {
+        name: pygame.mixer.Sound(buffer=stereo_pcm(sine_pcm(*spec)))
+        for name, spec in SOUND_EFFECTS.items()
+    }
+    lengths = {name: int(sound.get_length() * 1e9) for name, sound in sounds.items()}
+
+    for players in args.players:
+        print(f"{players} players")
+        run_args = argparse.Namespace(**{**vars(args), "players": players})
+        legacy_calls = [0]
+
+        def play_legacy(effect: str, player: int) -> None:
+            # What AudioManager used to do: a fresh Channel object per trigger.
+            pygame.mixer.Channel(LEGACY_CHANNELS[effect]).play(sounds[effect])
+            legacy_calls[0] += 1
+
+        run("fixed", play_legacy, lambda: None, run_args, lambda: legacy_calls[0])
+        pygame.mixer.stop()
+
+        now = [0]
+        channels = [pygame.mixer.Channel(idx) for idx in range(VOICE_COUNT)]
+        pool = VoicePool(channels, clock=lambda: now[0])
+        pans = [player_pan(player, players) for player in range(players)]
+
+        def play_pooled(effect: str, player: int) -> None:
+            pool.trigger(effect, sounds[effect], lengths[effect], player, pans[player])
+
+        def advance() -> None:
+            now[0] += 1_000_000_000 // FPS
+
+        run(
+            "pooled",
+            play_pooled,
+            advance,
+            run_args,
+            # A play and a set_volume for every voice started in stereo.
+            lambda: pool.played * 2,
+        )
+        pygame.mixer.stop()
+        print(f"         {pool.summary()}")
+    pygame.mixer.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import argparse
+import os
+import time
+
+from tetris.battle import BattleMatch
+
+
+def run(players: int, workers: int, ticks: int) -> float:
+    with BattleMatch(players, workers=workers, max_ticks=ticks) as match:
+        start = time.perf_counter()
+        match.start()
+        match.join()
+        elapsed = time.perf_counter() - start
+        pieces = sum(snapshot.pieces for snapshot in match.snapshots())
+    return pieces / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Bot battle throughput by player count and worker processes"
+    )
+    parser.add_argument("--ticks", type=int, default=60)
+    parser.add_argument("--players", type=int, nargs="+", default=[8, 16, 32, 64])
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    worker_counts = sorted({1, max(1, cores // 2), cores})
+    for players in args.players:
+        baseline = None
+        for workers in worker_counts:
+            rate = run(players, workers, args.ticks)
+            baseline = baseline or rate
+            print(
+                f"{players:>3} players, {workers:>3} workers: "
+                f"{rate:8.0f} pieces/s ({rate / baseline:4.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import argparse
+import itertools
+import os
+import random
+import time
+from typing import Callable, List, Tuple
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from tetris.board import Board  # noqa: E402
+from tetris.constants import GARBAGE_CELL  # noqa: E402
+from tetris.pieces import TETROMINO_SHAPES, Tetromino  # noqa: E402
+
+SIZES: List[Tuple[int, int]] = [(10, 20), (64, 200), (64, 10_000), (256, 1_000)]
+
+
+def time_per_call(fn: Callable[[], None], iterations: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter_ns() - start) / iterations / 1000
+
+
+def cluttered_board(width: int, height: int, rng: random.Random) -> Board:
+    board = Board(width, height)
+    for y in range(height // 2, height):
+        row = bytearray([GARBAGE_CELL]) * width
+        for _ in range(max(1, width // 4)):
+            row[rng.randrange(width)] = 0
+        board.grid[y] = row
+    return board
+
+
+def bench_collision(width: int, height: int, iterations: int) -> float:
+    rng = random.Random(0)
+    board = cluttered_board(width, height, rng)
+    pieces = [
+        Tetromino(key, rotation=rng.randrange(4), x=rng.randrange(-1, width - 2))
+        for key in TETROMINO_SHAPES
+        for _ in range(8)
+    ]
+    for piece in pieces:
+        piece.y = rng.randrange(height)
+    cursor = itertools.cycle(pieces)
+
+    def step() -> None:
+        board.valid(next(cursor))
+
+    return time_per_call(step, iterations)
+
+
+def bench_lock(width: int, height: int, iterations: int) -> float:
+    board = Board(width, height)
+    piece = Tetromino("O", x=0, y=height - 2)
+    empty = bytearray(width)
+
+    def step() -> None:
+        board.lock_piece(piece)
+        board.grid[-1][:] = empty
+        board.grid[-2][:] = empty
+
+    return time_per_call(step, iterations)
+
+
+def bench_clear(width: int, height: int, iterations: int) -> float:
+    board = Board(width, height)
+    piece = Tetromino("I", rotation=1, x=-2, y=height - 4)
+    full = bytearray([GARBAGE_CELL]) * width
+    full[0] = 0
+
+    def step() -> None:
+        for y in range(height - 4, height):
+            board.grid[y][:] = full
+        board.lock_piece(piece)
+
+    return time_per_call(step, iterations)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Lock, clear and collision cost across board sizes"
+    )
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f"{'size':>12} {'collision us':>14} {'lock us':>10} {'clear x4 us':>13}")
+    for width, height in SIZES:
+        collision = bench_collision(width, height, args.iterations)
+        lock = bench_lock(width, height, args.iterations)
+        clear = bench_clear(width, height, args.iterations)
+        label = f"{width}x{height}"
+        print(f"{label:>12} {collision:>14.2f} {lock:>10.2f} {clear:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
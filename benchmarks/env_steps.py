@@ -0,0 +1,40 @@
+import argparse
+import random
+import time
+
+from tetris.env import TetrisEnv
+from tetris.features import BoardFeatures
+
+
+def run(env: TetrisEnv, steps: int, recompute: bool) -> float:
+    rng = random.Random(0)
+    env.reset(seed=0)
+    start = time.perf_counter()
+    for _ in range(steps):
+        action = rng.randrange(env.action_count)
+        _, _, terminated, truncated, _ = env.step(action)
+        if recompute:
+            BoardFeatures(env.state.board).update_wells()
+        if terminated or truncated:
+            env.reset()
+    return steps / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="TetrisEnv steps per second")
+    parser.add_argument("--steps", type=int, default=20_000)
+    args = parser.parse_args()
+
+    for width, height in ((10, 20), (10, 40), (20, 40)):
+        for mode in ("placement", "primitive"):
+            env = TetrisEnv(width, height, action_mode=mode)
+            incremental = run(env, args.steps, recompute=False)
+            full = run(env, args.steps, recompute=True)
+            print(
+                f"{width}x{height} {mode:>9}: {incremental:9.0f} steps/s incremental, "
+                f"{full:9.0f} steps/s with full feature recompute"
+            )
+
+
+if __name__ == "__main__":
+    main()
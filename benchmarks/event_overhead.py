@@ -0,0 +1,76 @@
+import argparse
+import time
+
+from tetris.actions import hard_drop, move_piece
+from tetris.events import GLOBAL_EVENTS, GameListener
+from tetris.state import GameState
+
+
+class CountingListener(GameListener):
+    def __init__(self) -> None:
+        self.moves = 0
+        self.locks = 0
+
+    def on_move(self, state: GameState, dx: int, dy: int) -> None:
+        self.moves += 1
+
+    def on_lock(self, state: GameState, piece: object, lines: int) -> None:
+        self.locks += 1
+
+
+def shuffle_moves(state: GameState, iterations: int) -> float:
+    start = time.perf_counter_ns()
+    for i in range(iterations):
+        move_piece(state, dx=1 if i & 1 else -1)
+    return (time.perf_counter_ns() - start) / iterations
+
+
+def drop_pieces(state: GameState, pieces: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(pieces):
+        if state.game_over:
+            state.reset(seed=0)
+        hard_drop(state)
+    return (time.perf_counter_ns() - start) / pieces
+
+
+def emit_moves(state: GameState, iterations: int) -> float:
+    # The bare hook as written in actions.py, without the board check.
+    events = state.events
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        emit = events.move
+        if emit is not None:
+            emit(state, 1, 0)
+    return (time.perf_counter_ns() - start) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Event hook cost with zero, one and ten subscribers"
+    )
+    parser.add_argument("--events", type=int, default=300_000)
+    parser.add_argument("--pieces", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f"{'':>18} {'hook':>9} {'move_piece':>11} {'hard_drop':>10}")
+    for scope in ("per-state", "global"):
+        for count in (0, 1, 10):
+            state = GameState(seed=0)
+            bus = state.events if scope == "per-state" else GLOBAL_EVENTS
+            listeners = [CountingListener() for _ in range(count)]
+            for listener in listeners:
+                bus.subscribe(listener)
+            hook = emit_moves(state, args.events)
+            moves = shuffle_moves(state, args.events)
+            drops = drop_pieces(state, args.pieces)
+            for listener in listeners:
+                bus.unsubscribe(listener)
+            print(
+                f"{scope:>9} {count:2d} subs: {hook:6.0f} ns {moves:8.0f} ns "
+                f"{drops:7.0f} ns"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import argparse
+import os
+import random
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from tetris.actions import hard_drop, move_piece, rotate_piece  # noqa: E402
+from tetris.export import export_session  # noqa: E402
+from tetris.replay import telemetry_sessions  # noqa: E402
+from tetris.state import GameState  # noqa: E402
+from tetris.telemetry import Telemetry  # noqa: E402
+
+
+def record_session(directory: Path, seconds: float) -> None:
+    # Synthetic timestamps: two players making an input every 100 ms.
+    now = [0]
+    telemetry = Telemetry(directory, clock=lambda: now[0])
+    rng = random.Random(0)
+    players = [GameState(seed=1), GameState(seed=2)]
+    for idx, state in enumerate(players):
+        state.attach_telemetry(telemetry, idx)
+    while now[0] < seconds * 1e9:
+        now[0] += 50_000_000
+        for idx, state in enumerate(players):
+            if state.game_over:
+                state.reset()
+            roll = rng.random()
+            if roll < 0.4:
+                move_piece(state, dx=rng.choice((-1, 1)))
+            elif roll < 0.6:
+                rotate_piece(state, 1)
+            elif roll < 0.9:
+                if not move_piece(state, dy=1):
+                    state.lock_piece()
+                    state.spawn_next()
+            else:
+                lines = hard_drop(state)
+                if lines > 1:
+                    players[1 - idx].queue_garbage(lines - 1)
+    telemetry.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Headless export frames/s and peak memory by session length"
+    )
+    parser.add_argument("--seconds", type=float, nargs="+", default=[30.0, 120.0])
+    parser.add_argument("--fps", type=int, default=30)
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    for seconds in args.seconds:
+        with tempfile.TemporaryDirectory() as tmp:
+            logs = Path(tmp) / "logs"
+            record_session(logs, seconds)
+            paths = next(iter(telemetry_sessions(logs).values()))
+            for workers in sorted({1, cores}):
+                with open(os.devnull, "wb") as sink:
+                    start = time.perf_counter()
+                    frames, _ = export_session(
+                        paths,
+                        Path(tmp),
+                        "raw",
+                        fps=args.fps,
+                        workers=workers,
+                        sink=sink,
+                    )
+                    elapsed = time.perf_counter() - start
+                workers_peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+                main_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                print(
+                    f"{seconds:6.0f} s session, {workers:>2} workers: "
+                    f"{frames / elapsed:7.1f} frames/s, peak RSS "
+                    f"{main_peak / 1024:.0f} MB main / {workers_peak / 1024:.0f} MB worker"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import argparse
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame  # noqa: E402
+
+from tetris.audio import AudioManager  # noqa: E402
+from tetris.game import (  # noqa: E402
+    BoardConfig,
+    GameMode,
+    run_game,
+    show_menu,
+    window_size_for_mode,
+)
+from tetris.stats import StatsStore  # noqa: E402
+
+
+def key_event(key: int) -> pygame.event.Event:
+    return pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0)
+
+
+def measure(target: Callable[[], object], warmup: float, duration: float) -> float:
+    samples: List[float] = []
+
+    def sampler() -> None:
+        time.sleep(warmup)
+        samples.append(time.process_time())
+        time.sleep(duration)
+        samples.append(time.process_time())
+        pygame.event.post(key_event(pygame.K_ESCAPE))
+
+    thread = threading.Thread(target=sampler)
+    thread.start()
+    target()
+    thread.join()
+    return (samples[1] - samples[0]) / duration
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Process CPU usage on the menu, during play and after game over"
+    )
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    pygame.init()
+    config = BoardConfig()
+    screen = pygame.display.set_mode(window_size_for_mode(GameMode.SINGLE, config))
+    clock = pygame.time.Clock()
+    font = pygame.font.Font(None, 32)
+    small_font = pygame.font.Font(None, 24)
+    title_font = pygame.font.Font(None, 64)
+    audio = AudioManager()
+    tmp = tempfile.TemporaryDirectory()
+    stats = StatsStore(Path(tmp.name) / "stats.sqlite3")
+
+    def menu() -> None:
+        show_menu(screen, clock, title_font, font, small_font, stats)
+
+    def game() -> None:
+        run_game(screen, clock, font, small_font, audio, GameMode.SINGLE, config, stats)
+
+    results: Dict[str, float] = {}
+    results["menu"] = measure(menu, 0.5, args.seconds)
+
+    # A player tapping rotate five times a second on top of normal gravity.
+    pygame.time.set_timer(key_event(pygame.K_z), 200)
+    results["active play"] = measure(game, 0.5, args.seconds)
+    pygame.time.set_timer(key_event(pygame.K_z), 0)
+
+    # Hard drop every frame until the stack tops out, then stay on game over.
+    pygame.time.set_timer(key_event(pygame.K_SPACE), 16, loops=120)
+    results["game over"] = measure(game, 3.0, args.seconds)
+
+    stats.close()
+    tmp.cleanup()
+    pygame.quit()
+    for name, usage in results.items():
+        print(f"{name:>12}: {usage:6.1%} of one core")
+
+
+if __name__ == "__main__":
+    main()
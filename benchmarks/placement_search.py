@@ -0,0 +1,52 @@
+import argparse
+import random
+import time
+from typing import List
+
+from tetris.board import Board
+from tetris.constants import GARBAGE_CELL
+from tetris.pieces import TETROMINO_SHAPES, Tetromino
+from tetris.search import reachable_placements
+
+
+def cluttered_board(
+    rng: random.Random, width: int, height: int, density: float
+) -> Board:
+    board = Board(width, height)
+    # Fill the lower half with random cells so overhangs and tuck spots exist.
+    for y in range(height // 2, height):
+        for x in range(width):
+            if rng.random() < density:
+                board.grid[y][x] = GARBAGE_CELL
+    return board
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Reachable placement search time on cluttered boards"
+    )
+    parser.add_argument("--boards", type=int, default=200)
+    args = parser.parse_args()
+
+    shapes = list(TETROMINO_SHAPES)
+    for width, height in ((10, 20), (10, 40), (20, 40)):
+        for density in (0.0, 0.3, 0.6):
+            rng = random.Random(0)
+            boards = [
+                cluttered_board(rng, width, height, density) for _ in range(args.boards)
+            ]
+            pieces = [Tetromino(rng.choice(shapes), x=width // 2 - 2) for _ in boards]
+            counts: List[int] = []
+            start = time.perf_counter()
+            for board, piece in zip(boards, pieces):
+                counts.append(len(reachable_placements(board, piece)))
+            elapsed = time.perf_counter() - start
+            print(
+                f"{width}x{height} density {density:.1f}: "
+                f"{elapsed / len(boards) * 1000:6.2f} ms/search, "
+                f"{sum(counts) / len(counts):5.1f} placements avg"
+            )
+
+
+if __name__ == "__main__":
+    main()
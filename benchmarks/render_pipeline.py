@@ -0,0 +1,175 @@
+import argparse
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from array import array
+from typing import Dict, Optional, Sequence
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame  # noqa: E402
+
+from tetris.actions import hard_drop, move_piece, rotate_piece  # noqa: E402
+from tetris.constants import BLOCK_SIZE, FPS, IDLE_WAIT_MS, SIDE_PANEL  # noqa: E402
+from tetris.present import BUFFERING_MODES, FramePacing, RenderThread  # noqa: E402
+from tetris.render import PygameRenderer, panel_height  # noqa: E402
+from tetris.state import GameState  # noqa: E402
+from tetris.view import PlayerView, Renderer, frame_key  # noqa: E402
+
+PLAYER_WIDTH = 10 * BLOCK_SIZE + SIDE_PANEL + 60
+
+
+class SlowPresent:
+    """Stands in for a flip that blocks on vsync; the dummy driver never does."""
+
+    def __init__(self, renderer: Renderer, present_ms: float) -> None:
+        self.renderer = renderer
+        self.present_s = present_ms / 1000
+
+    def draw(self, views: Sequence[PlayerView]) -> None:
+        self.renderer.draw(views)
+        time.sleep(self.present_s)
+
+    def close(self) -> None:
+        self.renderer.close()
+
+
+def feed_inputs(
+    inputs: "queue.SimpleQueue[int]", rate: float, burst: int, stop: threading.Event
+) -> None:
+    # Key repeat plus the occasional burst of presses landing together.
+    rng = random.Random(0)
+    while not stop.is_set():
+        count = burst if rng.random() < 0.05 else 1
+        for _ in range(count):
+            inputs.put(time.perf_counter_ns())
+        time.sleep(rng.expovariate(rate))
+
+
+def apply_input(state: GameState, rng: random.Random) -> None:
+    if state.game_over:
+        state.reset()
+    roll = rng.random()
+    if roll < 0.4:
+        move_piece(state, dx=rng.choice((-1, 1)))
+    elif roll < 0.8:
+        rotate_piece(state, 1)
+    elif roll < 0.95:
+        move_piece(state, dy=1)
+    else:
+        hard_drop(state)
+
+
+def run(
+    renderer: Renderer, buffering: Optional[str], args: argparse.Namespace
+) -> Dict[str, float]:
+    states = [GameState(seed=seed) for seed in range(args.players)]
+    views = [
+        PlayerView(state, f"Player {idx + 1}", (20 + idx * PLAYER_WIDTH, 0), ())
+        for idx, state in enumerate(states)
+    ]
+    render_thread = (
+        RenderThread(renderer, BUFFERING_MODES[buffering])
+        if buffering is not None
+        else None
+    )
+    pacing = render_thread.pacing if render_thread is not None else FramePacing()
+    handled = array("q")
+    clock = pygame.time.Clock()
+    rng = random.Random(1)
+    inputs: "queue.SimpleQueue[int]" = queue.SimpleQueue()
+    stop = threading.Event()
+    feeder = threading.Thread(
+        target=feed_inputs, args=(inputs, args.input_rate, args.burst, stop)
+    )
+    feeder.start()
+
+    drawn = None
+    end = time.perf_counter() + args.duration
+    while time.perf_counter() < end:
+        try:
+            arrivals = [inputs.get(timeout=IDLE_WAIT_MS / 1000)]
+        except queue.Empty:
+            arrivals = []
+        while True:
+            try:
+                arrivals.append(inputs.get_nowait())
+            except queue.Empty:
+                break
+        now = time.perf_counter_ns()
+        for arrived in arrivals:
+            handled.append(now - arrived)
+            apply_input(rng.choice(states), rng)
+
+        frame = [frame_key(state) for state in states]
+        if frame == drawn:
+            continue
+        drawn = frame
+        oldest = arrivals[0] if arrivals else 0
+        if render_thread is not None:
+            render_thread.submit(views, oldest)
+        else:
+            renderer.draw(views)
+            pacing.record(oldest, time.perf_counter_ns())
+            clock.tick(FPS)
+
+    stop.set()
+    feeder.join()
+    if render_thread is not None:
+        render_thread.close()
+    result = pacing.summary()
+    samples = sorted(handled)
+    result["handled_p99_ms"] = (
+        samples[int(len(samples) * 0.99)] / 1e6 if samples else 0.0
+    )
+    if render_thread is not None:
+        result["replaced"] = render_thread.buffer.replaced
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Input latency and frame pacing, rendering inline vs on a thread"
+    )
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per mode")
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--present-ms", type=float, default=12.0)
+    parser.add_argument("--input-rate", type=float, default=120.0, help="inputs/s")
+    parser.add_argument("--burst", type=int, default=20)
+    args = parser.parse_args()
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(
+        f"python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}, "
+        f"{args.present_ms:.0f} ms present, {args.input_rate:.0f} inputs/s"
+    )
+    pygame.init()
+    size = (args.players * PLAYER_WIDTH, panel_height(20, BLOCK_SIZE))
+    screen = pygame.display.set_mode(size)
+    font = pygame.font.Font(None, 32)
+    small_font = pygame.font.Font(None, 24)
+    renderer = SlowPresent(PygameRenderer(screen, font, small_font), args.present_ms)
+
+    print(
+        f"{'':>7} {'frames':>6} {'input->present p50/p99':>23} "
+        f"{'handled p99':>11} {'interval mean/p99/jitter':>25} {'replaced':>8}"
+    )
+    for buffering in (None, "double", "triple"):
+        result = run(renderer, buffering, args)
+        print(
+            f"{buffering or 'inline':>7} {result['frames']:6.0f} "
+            f"{result['latency_p50_ms']:9.1f} /{result['latency_p99_ms']:6.1f} ms "
+            f"{result['handled_p99_ms']:8.1f} ms "
+            f"{result['interval_mean_ms']:9.1f} /{result['interval_p99_ms']:5.1f} "
+            f"/{result['interval_jitter_ms']:5.1f} ms "
+            f"{result.get('replaced', 0):8.0f}"
+        )
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import argparse
+import io
+import os
+import time
+from typing import Callable, Iterator
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame  # noqa: E402
+
+from tetris.actions import hard_drop, move_piece, rotate_piece  # noqa: E402
+from tetris.battle import choose_placement  # noqa: E402
+from tetris.constants import BLOCK_SIZE, SIDE_PANEL  # noqa: E402
+from tetris.render import PygameRenderer, panel_height  # noqa: E402
+from tetris.state import GameState  # noqa: E402
+from tetris.terminal import TerminalRenderer  # noqa: E402
+from tetris.view import NullRenderer, PlayerView, Renderer  # noqa: E402
+
+
+def trace(seed: int, pieces: int) -> Iterator[GameState]:
+    # A bot game replayed one input at a time, so every frame shows a change.
+    state = GameState(seed=seed)
+    yield state
+    for _ in range(pieces):
+        placement = choose_placement(state)
+        if placement is None or state.game_over:
+            break
+        for action in placement.inputs:
+            if action == "left":
+                move_piece(state, dx=-1)
+            elif action == "right":
+                move_piece(state, dx=1)
+            elif action == "soft_drop":
+                move_piece(state, dy=1)
+            elif action == "rotate_cw":
+                rotate_piece(state, 1)
+            elif action == "rotate_ccw":
+                rotate_piece(state, -1)
+            else:
+                hard_drop(state)
+            yield state
+
+
+def measure(
+    name: str, renderer: Renderer, args: argparse.Namespace, extra: Callable[[int], str]
+) -> None:
+    frames = 0
+    elapsed = 0.0
+    for state in trace(args.seed, args.pieces):
+        view = PlayerView(state, "Player 1", (20, 0), ())
+        start = time.perf_counter()
+        renderer.draw([view])
+        elapsed += time.perf_counter() - start
+        frames += 1
+    renderer.close()
+    print(
+        f"{name:>8}: {elapsed / frames * 1e6:8.1f} us/frame over {frames} frames"
+        f"{extra(frames)}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Per-frame cost of each renderer backend on one game trace"
+    )
+    parser.add_argument("--pieces", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    pygame.init()
+    size = (
+        10 * BLOCK_SIZE + SIDE_PANEL + 60,
+        panel_height(20, BLOCK_SIZE),
+    )
+    screen = pygame.display.set_mode(size)
+    font = pygame.font.Font(None, 32)
+    small_font = pygame.font.Font(None, 24)
+    measure("pygame", PygameRenderer(screen, font, small_font), args, lambda frames: "")
+
+    stream = io.StringIO()
+    terminal = TerminalRenderer(stream)
+    measure(
+        "terminal",
+        terminal,
+        args,
+        lambda frames: f", {terminal.bytes_written / frames:.0f} bytes/frame",
+    )
+    measure("null", NullRenderer(), args, lambda frames: "")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import pickle
+import time
+from typing import Callable
+
+from tetris.actions import hard_drop
+from tetris.serialize import dump_state, load_state
+from tetris.state import GameState
+
+
+def per_call_us(func: Callable[[], object], iterations: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter_ns() - start) / iterations / 1000
+
+
+def midgame_state(pieces: int) -> GameState:
+    state = GameState(seed=0)
+    for _ in range(pieces):
+        if state.game_over:
+            break
+        hard_drop(state)
+    return state
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compact game-state snapshot size and speed against pickle"
+    )
+    parser.add_argument("--iterations", type=int, default=5_000)
+    parser.add_argument("--pieces", type=int, default=20)
+    args = parser.parse_args()
+
+    state = midgame_state(args.pieces)
+    cases = [
+        (
+            "compact + rng",
+            dump_state(state),
+            lambda: dump_state(state),
+            load_state,
+        ),
+        (
+            "compact",
+            dump_state(state, include_rng=False),
+            lambda: dump_state(state, include_rng=False),
+            load_state,
+        ),
+        (
+            "pickle",
+            pickle.dumps(state, pickle.HIGHEST_PROTOCOL),
+            lambda: pickle.dumps(state, pickle.HIGHEST_PROTOCOL),
+            pickle.loads,
+        ),
+    ]
+    print(f"{'':>14} {'bytes':>6} {'dump':>9} {'load':>9}")
+    for name, blob, dump, load in cases:
+        dump_us = per_call_us(dump, args.iterations)
+        load_us = per_call_us(lambda: load(blob), args.iterations)
+        print(f"{name:>14} {len(blob):6d} {dump_us:6.1f} us {load_us:6.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+def parse_stats(line: str) -> Dict[str, float]:
+    return {
+        key: float(value) for key, value in (field.split("=") for field in line.split())
+    }
+
+
+def measure(
+    players: int, duration: float, rate: float, load_nice: int
+) -> Optional[Dict[str, float]]:
+    with tempfile.TemporaryDirectory() as tmp:
+        socket = str(Path(tmp) / "server.sock")
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "tetris.server",
+                "serve",
+                "--socket",
+                socket,
+                "--stats-interval",
+                "1.0",
+            ],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        assert server.stdout is not None
+        while not Path(socket).exists():
+            time.sleep(0.05)
+        load = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "tetris.server",
+                "load",
+                "--socket",
+                socket,
+                "--players",
+                str(players),
+                "--rate",
+                str(rate),
+                "--duration",
+                str(duration),
+            ],
+            stdout=subprocess.PIPE,
+            text=True,
+            # On small machines the generator competes with the server for
+            # CPU; a lower priority keeps it from starving the tick loop.
+            preexec_fn=lambda: os.nice(load_nice),
+        )
+        # Skip the window in which clients were still connecting.
+        windows: List[Dict[str, float]] = []
+        for line in server.stdout:
+            stats = parse_stats(line)
+            if stats["games"] == players:
+                windows.append(stats)
+            elif windows or load.poll() is not None:
+                break
+        output, _ = load.communicate()
+        server.terminate()
+        server.wait()
+    if len(windows) < 2:
+        return None
+    steady = windows[1:]
+    sent = re.search(r"\((\d+)/s\)", output)
+    return {
+        "inputs": float(sent.group(1)) if sent else 0.0,
+        "bytes_per_game": steady[-1]["bytes_per_game"],
+        "p50_ms": max(window["p50_ms"] for window in steady),
+        "p99_ms": max(window["p99_ms"] for window in steady),
+        "ticks": sum(window["ticks"] for window in steady) / len(steady),
+        "skipped": sum(window["skipped"] for window in steady) / len(steady),
+        "cpu_pct": sum(window["cpu_pct"] for window in steady) / len(steady),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Match server memory and tick latency as concurrency grows"
+    )
+    parser.add_argument(
+        "--players", type=int, nargs="+", default=[100, 1000, 3000, 10000]
+    )
+    parser.add_argument("--duration", type=float, default=8.0)
+    parser.add_argument("--rate", type=float, default=4.0, help="inputs per second")
+    parser.add_argument("--load-nice", type=int, default=10)
+    args = parser.parse_args()
+
+    for players in args.players:
+        result = measure(players, args.duration, args.rate, args.load_nice)
+        if result is None:
+            print(f"{players:6d} games: no steady-state window")
+            continue
+        print(
+            f"{players:6d} games: {result['bytes_per_game']:6.0f} bytes/game, "
+            f"tick latency p50 {result['p50_ms']:6.2f} ms "
+            f"p99 {result['p99_ms']:7.2f} ms, {result['ticks']:.0f} ticks/s "
+            f"({result['skipped']:.0f}/s skipped), server cpu {result['cpu_pct']:.0f}%, "
+            f"{result['inputs']:.0f} inputs/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
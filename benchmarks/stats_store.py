@@ -0,0 +1,76 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from tetris.pieces import TETROMINO_SHAPES  # noqa: E402
+from tetris.stats import SessionRecord, StatsStore  # noqa: E402
+
+
+def make_record(rng: random.Random, pieces: int) -> SessionRecord:
+    shapes = list(TETROMINO_SHAPES)
+    return SessionRecord(
+        player="Player 1",
+        mode="SINGLE",
+        started_at=time.time(),
+        duration=rng.uniform(30, 600),
+        score=rng.randrange(100_000),
+        level=rng.randrange(1, 20),
+        lines=rng.randrange(200),
+        piece_times=[
+            (rng.choice(shapes), rng.uniform(200, 2000)) for _ in range(pieces)
+        ],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Stats store write latency and startup cost with a large history"
+    )
+    parser.add_argument("--sessions", type=int, default=20_000)
+    parser.add_argument("--pieces", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    records = [make_record(rng, args.pieces) for _ in range(args.sessions)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "stats.sqlite3"
+        store = StatsStore(path)
+        worst = 0
+        start = time.perf_counter_ns()
+        for record in records:
+            call_start = time.perf_counter_ns()
+            store.record_session(record)
+            worst = max(worst, time.perf_counter_ns() - call_start)
+        enqueue_ns = time.perf_counter_ns() - start
+        drain_start = time.perf_counter()
+        store.close()
+        drain = time.perf_counter() - drain_start
+        print(
+            f"record_session: {enqueue_ns / len(records) / 1000:.2f} us avg, "
+            f"{worst / 1000:.1f} us worst"
+        )
+        print(f"background drain after last enqueue: {drain:.2f} s")
+
+        start = time.perf_counter()
+        store = StatsStore(path)
+        opened = time.perf_counter() - start
+        start = time.perf_counter()
+        store.top_scores(10)
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        store.top_scores(10)
+        warm = time.perf_counter() - start
+        store.close()
+        print(
+            f"startup with {args.sessions} sessions: open {opened * 1000:.2f} ms, "
+            f"leaderboard cold {cold * 1000:.3f} ms, cached {warm * 1e6:.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from tetris.actions import move_piece  # noqa: E402
+from tetris.state import GameState  # noqa: E402
+from tetris.telemetry import (  # noqa: E402
+    Telemetry,
+    TelemetryEvent,
+    read_records,
+    telemetry_files,
+)
+
+
+def per_call_ns(start: int, iterations: int) -> float:
+    return (time.perf_counter_ns() - start) / iterations
+
+
+def shuffle_moves(state: GameState, iterations: int) -> float:
+    start = time.perf_counter_ns()
+    for i in range(iterations):
+        move_piece(state, dx=1 if i & 1 else -1)
+    return per_call_ns(start, iterations)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Game-thread cost of telemetry events")
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--max-file-bytes", type=int, default=4 * 1024 * 1024)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        telemetry = Telemetry(directory, max_file_bytes=args.max_file_bytes)
+        piece = GameState().current_piece
+
+        start = time.perf_counter_ns()
+        for i in range(args.events):
+            telemetry.record(TelemetryEvent.MOVE, 0, x=i & 0xFF)
+        record_ns = per_call_ns(start, args.events)
+
+        start = time.perf_counter_ns()
+        for _ in range(args.events):
+            telemetry.piece_event(TelemetryEvent.MOVE, 0, piece)
+        piece_ns = per_call_ns(start, args.events)
+
+        state = GameState()
+        baseline_ns = shuffle_moves(state, args.events)
+        state.attach_telemetry(telemetry, 0)
+        traced_ns = shuffle_moves(state, args.events)
+
+        start = time.perf_counter()
+        telemetry.close()
+        drain = time.perf_counter() - start
+
+        files = telemetry_files(directory)
+        total = sum(1 for path in files for _ in read_records(path))
+        size = sum(path.stat().st_size for path in files)
+
+    print(f"record():       {record_ns:8.0f} ns/event")
+    print(f"piece_event():  {piece_ns:8.0f} ns/event")
+    print(f"move_piece():   {baseline_ns:8.0f} ns untraced, {traced_ns:.0f} ns traced")
+    print(
+        f"wrote {total} records to {len(files)} files ({size / 1e6:.1f} MB), "
+        f"close() drained in {drain * 1000:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from tetris.actions import hard_drop, move_piece, rotate_piece
+from tetris.dataset import (
+    SOURCE_BOT,
+    SampleDataset,
+    SampleWriter,
+    attach_samples,
+)
+from tetris.state import GameState
+
+
+def play(states: List[GameState], pieces: int, seed: int) -> List[int]:
+    # Random placements are cheap, so the cost of the hooks stays visible.
+    rng = random.Random(seed)
+    durations = []
+    clock = time.perf_counter_ns
+    for piece in range(pieces):
+        state = states[piece % len(states)]
+        if state.game_over:
+            state.reset()
+        rotate_piece(state, rng.randrange(-1, 2))
+        move_piece(state, dx=rng.randint(-5, 5))
+        start = clock()
+        hard_drop(state)
+        durations.append(clock() - start)
+    return durations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Training-sample export throughput and loader sampling rate"
+    )
+    parser.add_argument("--pieces", type=int, default=200_000)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--batch", type=int, default=256)
+    parser.add_argument("--batches", type=int, default=200)
+    args = parser.parse_args()
+
+    baseline = play([GameState(seed=idx) for idx in range(args.players)], 20_000, 0)
+    base_us = sum(baseline) / len(baseline) / 1000
+    base_max_us = max(baseline) / 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        states = [GameState(seed=idx) for idx in range(args.players)]
+        writer = SampleWriter(directory)
+        for idx, state in enumerate(states):
+            attach_samples(state, writer, idx, SOURCE_BOT)
+        start = time.perf_counter()
+        durations = play(states, args.pieces, 0)
+        played = time.perf_counter() - start
+        writer.close()
+        total = time.perf_counter() - start
+        durations.sort()
+        on_disk = sum(path.stat().st_size for path in writer.shards)
+        print(
+            f"export: {args.pieces / total:,.0f} samples/s end to end "
+            f"({args.pieces / played:,.0f}/s while playing), "
+            f"{len(writer.shards)} shards, {on_disk / args.pieces:.1f} bytes/sample, "
+            f"{writer.dropped} dropped"
+        )
+        print(
+            f"  hard_drop without export {base_us:.1f} us (max {base_max_us:.0f} us), "
+            f"with {sum(durations) / len(durations) / 1000:.1f} us "
+            f"(p99 {durations[int(len(durations) * 0.99)] / 1000:.1f} us, "
+            f"max {durations[-1] / 1000:.0f} us)"
+        )
+
+        dataset = SampleDataset(directory)
+        rng = random.Random(1)
+        start = time.perf_counter()
+        for _ in range(args.batches):
+            dataset.sample(args.batch, rng)
+        batched = args.batches * args.batch / (time.perf_counter() - start)
+        start = time.perf_counter()
+        count = args.batches * args.batch
+        for _ in range(count):
+            dataset[rng.randrange(len(dataset))]
+        single = count / (time.perf_counter() - start)
+        start = time.perf_counter()
+        for index in range(len(dataset)):
+            dataset[index]
+        sequential = len(dataset) / (time.perf_counter() - start)
+        dataset.close()
+        print(
+            f"loader: {batched:,.0f} samples/s in batches of {args.batch}, "
+            f"{single:,.0f}/s one at a time, {sequential:,.0f}/s sequential"
+        )
+
+
+if __name__ == "__main__":
+    main()
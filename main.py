@@ -1,4 +1,74 @@
-from tetris import main
+import argparse
+from pathlib import Path
+
+from tetris import BoardConfig, main
+from tetris.constants import BATTLE_PLAYERS
+from tetris.profiler import FRAME_BUDGET_MS
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Tetris")
+    parser.add_argument("--width", type=int, default=BoardConfig.width)
+    parser.add_argument("--height", type=int, default=BoardConfig.height)
+    parser.add_argument("--block-size", type=int, default=BoardConfig.block_size)
+    parser.add_argument(
+        "--telemetry",
+        type=Path,
+        metavar="DIR",
+        help="record gameplay events to rotating binary files in DIR",
+    )
+    parser.add_argument(
+        "--battle-players",
+        type=int,
+        default=BATTLE_PLAYERS,
+        help="number of bots in the menu's bot battle",
+    )
+    parser.add_argument(
+        "--renderer",
+        choices=("pygame", "terminal"),
+        default="pygame",
+        help="draw with pygame or as ANSI text in the current terminal",
+    )
+    parser.add_argument(
+        "--profile-slow-frames",
+        type=Path,
+        metavar="DIR",
+        help="save a stack profile and game state to DIR for frames over budget",
+    )
+    parser.add_argument(
+        "--frame-budget",
+        type=float,
+        default=FRAME_BUDGET_MS,
+        metavar="MS",
+        help="frame time that counts as slow (default: %(default).1f)",
+    )
+    parser.add_argument(
+        "--render-thread",
+        choices=("double", "triple"),
+        help="draw on a separate thread from double- or triple-buffered snapshots",
+    )
+    parser.add_argument(
+        "--training-samples",
+        type=Path,
+        metavar="DIR",
+        help="save every placement as a training sample in compressed shards in DIR",
+    )
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.renderer == "terminal":
+        from tetris.terminal import run_terminal_game
+
+        run_terminal_game(args.width, args.height, args.telemetry)
+    else:
+        main(
+            BoardConfig(args.width, args.height, args.block_size),
+            args.telemetry,
+            args.battle_players,
+            args.profile_slow_frames,
+            args.frame_budget,
+            args.render_thread,
+            args.training_samples,
+        )
@@ -0,0 +1,50 @@
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Optional
+
+from tetris.actions import hard_drop
+from tetris.analyze import GameFilter, run_query
+from tetris.archive import Archive, convert_telemetry
+from tetris.state import GameState
+from tetris.telemetry import Telemetry, telemetry_files
+
+
+class InterleavedMultiplayerTest(unittest.TestCase):
+    def test_lock_ranges_belong_to_their_game(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            telemetry = Telemetry(directory / "logs")
+            players = [GameState(seed=1), GameState(seed=2)]
+            for player_id, state in enumerate(players):
+                state.attach_telemetry(telemetry, player_id)
+            drops = {0: 9, 1: 4}
+            for turn in range(9):
+                for player_id, state in enumerate(players):
+                    if turn < drops[player_id]:
+                        hard_drop(state)
+            players[1]._end_game()
+            players[0]._end_game()
+            telemetry.close()
+
+            output = directory / "games.tcol"
+            convert_telemetry(telemetry_files(directory / "logs"), output)
+            with Archive(output) as archive:
+                games = archive.games
+                self.assertEqual(list(games["player"]), [1, 0])
+                self.assertEqual(list(games["lock_start"]), [0, 4])
+                self.assertEqual(list(games["lock_count"]), [4, 9])
+
+            def locks(player: Optional[int]) -> int:
+                counts = run_query(
+                    [output], "pieces", GameFilter(player=player), workers=1
+                )
+                return sum(counts.values())
+
+            self.assertEqual(locks(0), 9)
+            self.assertEqual(locks(1), 4)
+            self.assertEqual(locks(None), 13)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import unittest
+from typing import List, Tuple
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from tetris.audio import VoicePool, player_pan  # noqa: E402
+
+
+class FakeChannel:
+    def __init__(self) -> None:
+        self.played: List[str] = []
+        self.volumes: List[Tuple[float, float]] = []
+
+    def play(self, sound: str) -> None:
+        self.played.append(sound)
+
+    def set_volume(self, left: float, right: float) -> None:
+        self.volumes.append((left, right))
+
+
+class VoicePoolTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.now = 0
+        self.channels = [FakeChannel(), FakeChannel()]
+        self.pool = VoicePool(self.channels, coalesce_ms=20, clock=lambda: self.now)
+
+    def test_repeats_within_the_window_are_coalesced_per_player(self) -> None:
+        ms = 1_000_000
+        self.assertTrue(self.pool.trigger("move", "m", 5 * ms, player=0))
+        self.now = 10 * ms
+        self.assertFalse(self.pool.trigger("move", "m", 5 * ms, player=0))
+        self.assertTrue(self.pool.trigger("move", "m", 5 * ms, player=1))
+        self.now = 25 * ms
+        self.assertTrue(self.pool.trigger("move", "m", 5 * ms, player=0))
+        self.assertEqual((self.pool.issued, self.pool.coalesced), (4, 1))
+
+    def test_busy_pool_steals_lowest_priority_then_drops(self) -> None:
+        long = 10**9
+        self.pool.trigger("rotate", "r", long, player=0)
+        self.now = 1
+        self.pool.trigger("move", "m", long, player=0)
+        self.now = 2
+        self.assertTrue(self.pool.trigger("line", "l", long, player=0))
+        self.assertEqual(self.channels[1].played, ["m", "l"])
+        self.now = 3
+        self.assertFalse(self.pool.trigger("move", "m", long, player=1))
+        self.assertEqual((self.pool.stolen, self.pool.dropped), (1, 1))
+        self.now = 4
+        self.assertTrue(self.pool.trigger("lock", "k", long, player=1))
+        self.assertEqual(self.channels[0].played, ["r", "k"])
+
+    def test_panning_is_set_after_every_play(self) -> None:
+        left, right = player_pan(0, 2), player_pan(1, 2)
+        self.assertGreater(left[0], left[1])
+        self.assertGreater(right[1], right[0])
+        self.assertEqual(player_pan(0, 1), (1.0, 1.0))
+        self.pool.trigger("move", "m", 1, pan=left)
+        self.now = 10**9
+        self.pool.trigger("lock", "k", 1, pan=left)
+        self.assertEqual(self.channels[0].volumes, [left, left])
+        self.now = 2 * 10**9
+        self.pool.trigger("lock", "k", 1, pan=right)
+        self.assertEqual(self.channels[0].volumes, [left, left, right])
+
+
+if __name__ == "__main__":
+    unittest.main()
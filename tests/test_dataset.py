@@ -0,0 +1,138 @@
+import random
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from typing import List
+from unittest import mock
+
+from tetris.actions import hard_drop, move_piece
+from tetris.constants import PIECE_CELLS
+from tetris.dataset import (
+    SOURCE_HUMAN,
+    SampleDataset,
+    SampleWriter,
+    attach_samples,
+    occupancy_rows,
+    write_shard,
+)
+from tetris.events import GameListener
+from tetris.pieces import Tetromino
+from tetris.state import GameState
+
+
+class ExpectedSamples(GameListener):
+    def __init__(self) -> None:
+        self.boards: List[List[bytes]] = []
+        self.placements: List[tuple] = []
+        self._board: List[bytes] = []
+
+    def _capture(self, state: GameState) -> None:
+        self._board = [bytes(min(cell, 1) for cell in row) for row in state.board.grid]
+
+    def on_game_start(self, state: GameState) -> None:
+        self._capture(state)
+
+    def on_spawn(self, state: GameState) -> None:
+        self._capture(state)
+
+    def on_garbage_applied(self, state: GameState, holes: object) -> None:
+        self._capture(state)
+
+    def on_lock(self, state: GameState, piece: Tetromino, lines: int) -> None:
+        self.boards.append(self._board)
+        self.placements.append(
+            (
+                PIECE_CELLS[piece.shape_key],
+                PIECE_CELLS[state.next_piece.shape_key],
+                piece.rotation,
+                piece.x,
+                piece.y,
+                lines,
+                state.score,
+            )
+        )
+
+
+class SampleShardsTest(unittest.TestCase):
+    def test_locks_round_trip_through_shards(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            writer = SampleWriter(directory, shard_samples=50, block_samples=16)
+            rng = random.Random(0)
+            state = GameState(8, 12, seed=5)
+            state.score = 3 << 31
+            expected = ExpectedSamples()
+            state.events.subscribe(expected)
+            expected.on_game_start(state)
+            attach_samples(state, writer, 1, SOURCE_HUMAN)
+            while len(expected.placements) < 130:
+                if state.game_over:
+                    state.reset()
+                if len(expected.placements) % 7 == 0:
+                    state.queue_garbage(1)
+                move_piece(state, dx=rng.randint(-4, 4))
+                hard_drop(state)
+            writer.close()
+            self.assertEqual(len(writer.shards), 3)
+
+            dataset = SampleDataset(directory, cache_blocks=2)
+            self.assertEqual(len(dataset), 130)
+            for index in [0, 49, 50, 129, *rng.sample(range(130), 20)]:
+                sample = dataset[index]
+                self.assertEqual(
+                    (
+                        sample.shape,
+                        sample.next_shape,
+                        sample.rotation,
+                        sample.x,
+                        sample.y,
+                        sample.lines,
+                        sample.score,
+                    ),
+                    expected.placements[index],
+                )
+                self.assertEqual(sample.player, 1)
+                self.assertEqual(dataset.dimensions(index), (8, 12))
+                self.assertEqual(
+                    occupancy_rows(sample.board, 8, 12), expected.boards[index]
+                )
+            batch = dataset.sample(40, rng)
+            self.assertEqual(len(batch), 40)
+            with self.assertRaises(IndexError):
+                dataset[130]
+            dataset.close()
+
+    def test_samples_are_dropped_while_the_writer_is_behind(self) -> None:
+        release = threading.Event()
+
+        def stalled_write(*args: object) -> None:
+            release.wait()
+            write_shard(*args)
+
+        with (
+            tempfile.TemporaryDirectory() as tmp,
+            mock.patch("tetris.dataset.write_shard", stalled_write),
+        ):
+            directory = Path(tmp)
+            writer = SampleWriter(directory, shard_samples=10)
+            state = GameState(8, 12, seed=1)
+            expected = ExpectedSamples()
+            state.events.subscribe(expected)
+            attach_samples(state, writer, 0, SOURCE_HUMAN)
+            while len(expected.placements) < 60:
+                if state.game_over:
+                    state.reset()
+                hard_drop(state)
+            # One spare buffer per shard the stalled writer holds; the rest drop.
+            self.assertEqual(writer.dropped, 30)
+            release.set()
+            writer.close()
+            self.assertEqual(len(writer.shards), 3)
+            dataset = SampleDataset(directory)
+            self.assertEqual(len(dataset), 30)
+            dataset.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
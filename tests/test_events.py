@@ -0,0 +1,74 @@
+import unittest
+from typing import List, Tuple
+
+from tetris.actions import hard_drop, move_piece
+from tetris.events import GLOBAL_EVENTS, GameListener
+from tetris.pieces import Tetromino
+from tetris.state import GameState
+
+
+class Recorder(GameListener):
+    def __init__(self, name: str, log: List[Tuple[str, str]]) -> None:
+        self.name = name
+        self.log = log
+
+    def on_move(self, state: GameState, dx: int, dy: int) -> None:
+        self.log.append((self.name, f"move {dx} {dy}"))
+
+    def on_lock(self, state: GameState, piece: Tetromino, lines: int) -> None:
+        self.log.append((self.name, "lock"))
+
+    def on_game_start(self, state: GameState) -> None:
+        self.log.append((self.name, "start"))
+
+
+class EventBusTest(unittest.TestCase):
+    def test_unused_events_have_no_dispatcher(self) -> None:
+        state = GameState(seed=0)
+        self.assertIsNone(state.events.move)
+        state.events.subscribe(Recorder("a", []))
+        self.assertIsNotNone(state.events.move)
+        self.assertIsNone(state.events.spawn)
+
+    def test_global_and_local_listeners_run_in_order(self) -> None:
+        log: List[Tuple[str, str]] = []
+        state = GameState(seed=0)
+        other = GameState(seed=1)
+        local = [Recorder(name, log) for name in ("a", "b", "c")]
+        for listener in local:
+            state.events.subscribe(listener)
+        shared = Recorder("global", log)
+        GLOBAL_EVENTS.subscribe(shared)
+        try:
+            move_piece(state, dx=1)
+            move_piece(other, dx=-1)
+            hard_drop(other)
+        finally:
+            GLOBAL_EVENTS.unsubscribe(shared)
+        self.assertEqual(
+            log,
+            [
+                ("global", "move 1 0"),
+                ("a", "move 1 0"),
+                ("b", "move 1 0"),
+                ("c", "move 1 0"),
+                ("global", "move -1 0"),
+                ("global", "lock"),
+            ],
+        )
+        self.assertIsNone(other.events.move)
+
+    def test_reset_keeps_subscribers(self) -> None:
+        log: List[Tuple[str, str]] = []
+        state = GameState(seed=0)
+        listener = Recorder("a", log)
+        state.events.subscribe(listener)
+        state.reset(seed=1)
+        move_piece(state, dx=1)
+        state.events.unsubscribe(listener)
+        move_piece(state, dx=1)
+        self.assertEqual(log, [("a", "start"), ("a", "move 1 0")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import threading
+import time
+import unittest
+from typing import List, Sequence
+
+from tetris.actions import hard_drop, move_piece
+from tetris.present import Frame, RenderThread, SnapshotBuffer
+from tetris.state import GameState
+from tetris.view import PlayerView, frame_key
+
+
+class RecordingRenderer:
+    def __init__(self) -> None:
+        self.keys: List[tuple] = []
+
+    def draw(self, views: Sequence[PlayerView]) -> None:
+        self.keys.append(frame_key(views[0].state))
+
+    def close(self) -> None:
+        pass
+
+
+class SnapshotBufferTest(unittest.TestCase):
+    def test_triple_buffer_keeps_latest_frame_and_oldest_input(self) -> None:
+        buffer = SnapshotBuffer(3)
+        buffer.publish(Frame((), input_ns=5))
+        buffer.publish(Frame((), input_ns=9))
+        latest = Frame((), input_ns=0)
+        buffer.publish(latest)
+        frame = buffer.take()
+        assert frame is not None
+        self.assertIs(frame.views, latest.views)
+        self.assertEqual(frame.input_ns, 5)
+        self.assertEqual(buffer.replaced, 2)
+
+    def test_double_buffer_waits_for_the_renderer(self) -> None:
+        buffer = SnapshotBuffer(2)
+        buffer.publish(Frame((), input_ns=1))
+        second = threading.Thread(target=buffer.publish, args=(Frame((), 2),))
+        second.start()
+        second.join(0.05)
+        self.assertTrue(second.is_alive())
+        first = buffer.take()
+        second.join()
+        last = buffer.take()
+        assert first is not None and last is not None
+        self.assertEqual((first.input_ns, last.input_ns), (1, 2))
+        buffer.close()
+        self.assertIsNone(buffer.take())
+
+
+class RenderThreadTest(unittest.TestCase):
+    def test_draws_snapshots_not_the_live_game(self) -> None:
+        renderer = RecordingRenderer()
+        thread = RenderThread(renderer, depth=2, fps=0)
+        state = GameState(seed=0)
+        view = PlayerView(state, "Player 1", (0, 0), ())
+        expected = []
+        for _ in range(20):
+            expected.append(frame_key(state))
+            thread.submit([view], time.perf_counter_ns())
+            if not move_piece(state, dx=1):
+                hard_drop(state)
+        thread.close()
+        self.assertEqual(renderer.keys, expected)
+        self.assertEqual(len(thread.pacing.latencies), 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from tetris.profiler import SlowFrameProfiler
+from tetris.state import GameState
+
+
+def spin(ms: float) -> None:
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        pass
+
+
+class SlowFrameProfilerTest(unittest.TestCase):
+    def test_only_slow_frames_are_captured(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            state = GameState(seed=0)
+            profiler = SlowFrameProfiler(directory, budget_ms=20, history_frames=2)
+            try:
+                for ms in (1, 2, 60, 1):
+                    profiler.start_frame()
+                    spin(ms)
+                    profiler.end_frame([state])
+            finally:
+                profiler.close()
+
+            self.assertEqual(
+                [path.name for path in profiler.captures], ["slow-frame-0000003.json"]
+            )
+            report = json.loads(profiler.captures[0].read_text())
+            self.assertEqual([frame["index"] for frame in report["frames"]], [1, 2, 3])
+            slow = report["frames"][-1]
+            self.assertGreater(slow["samples"], 5)
+            hottest, count = slow["stacks"][0]
+            self.assertIn("spin", hottest)
+            self.assertGreater(count, slow["samples"] // 2)
+            self.assertEqual(len(report["states"]), 1)
+            self.assertEqual(len(report["states"][0]["board"]), state.board.height)
+
+    def test_cancelled_frame_is_not_captured(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            profiler = SlowFrameProfiler(Path(tmp), budget_ms=20)
+            try:
+                profiler.start_frame()
+                spin(40)
+                profiler.cancel_frame()
+                self.assertFalse(profiler.sampler.active.is_set())
+                profiler.end_frame([GameState(seed=0)])
+            finally:
+                profiler.close()
+
+            self.assertEqual(profiler.captures, [])
+            self.assertEqual(list(Path(tmp).iterdir()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import copy
+import random
+import unittest
+
+from tetris.actions import move_piece, rotate_piece
+from tetris.constants import GARBAGE_CELL
+from tetris.search import reachable_placements
+from tetris.state import GameState
+
+INPUTS = {
+    "left": lambda state: move_piece(state, dx=-1),
+    "right": lambda state: move_piece(state, dx=1),
+    "soft_drop": lambda state: move_piece(state, dy=1),
+    "rotate_cw": lambda state: rotate_piece(state, 1),
+    "rotate_ccw": lambda state: rotate_piece(state, -1),
+}
+
+
+class ReachablePlacementsTest(unittest.TestCase):
+    def test_inputs_replay_to_each_placement(self) -> None:
+        rng = random.Random(7)
+        for seed in range(40):
+            state = GameState(seed=seed)
+            for y in range(10, state.board.height):
+                for x in range(state.board.width):
+                    if rng.random() < 0.4:
+                        state.board.grid[y][x] = GARBAGE_CELL
+            for placement in reachable_placements(state.board, state.current_piece):
+                replay = copy.deepcopy(state)
+                self.assertEqual(placement.inputs[-1], "hard_drop")
+                for name in placement.inputs[:-1]:
+                    self.assertTrue(INPUTS[name](replay))
+                piece = replay.current_piece
+                while replay.board.valid(piece, dy=1):
+                    piece.y += 1
+                self.assertEqual(
+                    (piece.rotation, piece.x, piece.y),
+                    (placement.rotation, placement.x, placement.y),
+                )
+
+    def test_tuck_under_overhang(self) -> None:
+        state = GameState(seed=0)
+        board = state.board
+        for x in range(6):
+            board.grid[board.height - 3][x] = GARBAGE_CELL
+        state.current_piece.shape_key = "O"
+        state.current_piece.rotation = 0
+        placements = reachable_placements(board, state.current_piece)
+        # The O layout occupies columns x + 1 and x + 2.
+        tucked = [p for p in placements if p.y == board.height - 2 and p.x + 1 < 6]
+        self.assertEqual(len(tucked), 6)
+        for placement in tucked:
+            self.assertIn("soft_drop", placement.inputs)
+            self.assertIn("left", placement.inputs)
+
+
+if __name__ == "__main__":
+    unittest.main()
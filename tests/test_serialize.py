@@ -0,0 +1,127 @@
+import contextlib
+import io
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from tetris.actions import hard_drop
+from tetris.constants import CELL_COLORS, PIECE_CELLS
+from tetris.pieces import Tetromino
+from tetris.serialize import (
+    AutoSave,
+    dump_state,
+    load_state,
+    load_state_file,
+    save_state_file,
+)
+from tetris.state import GameState
+
+
+def random_state(rng: random.Random) -> GameState:
+    width, height = rng.randint(4, 40), rng.randint(4, 60)
+    state = GameState(width, height, seed=rng.getrandbits(32))
+    density = rng.random()
+    for row in state.board.grid:
+        for x in range(width):
+            if rng.random() < density:
+                row[x] = rng.randrange(1, len(CELL_COLORS))
+    shapes = list(PIECE_CELLS)
+    state.current_piece = Tetromino(
+        rng.choice(shapes), rng.randrange(4), rng.randint(-3, width), rng.randint(-3, 4)
+    )
+    state.next_piece = Tetromino(rng.choice(shapes))
+    state.score = rng.randint(0, 2**40)
+    state.level = rng.randint(1, 99)
+    state.board.lines_cleared = rng.randint(0, 10**6)
+    state.pending_garbage = rng.randint(0, 20)
+    state.player_id = rng.randint(0, 3)
+    state.game_over = rng.random() < 0.2
+    if rng.random() < 0.5:
+        state.rng.gauss(0, 1)
+    return state
+
+
+def snapshot(state: GameState) -> tuple:
+    piece = state.current_piece
+    return (
+        state.board.width,
+        state.board.height,
+        [bytes(row) for row in state.board.grid],
+        state.board.lines_cleared,
+        (piece.shape_key, piece.rotation, piece.x, piece.y),
+        state.next_piece.shape_key,
+        state.score,
+        state.level,
+        state.pending_garbage,
+        state.player_id,
+        state.game_over,
+    )
+
+
+class RoundTripTest(unittest.TestCase):
+    def test_random_states_round_trip(self) -> None:
+        rng = random.Random(40)
+        for _ in range(300):
+            state = random_state(rng)
+            include_rng = rng.random() < 0.7
+            restored = load_state(dump_state(state, include_rng))
+            self.assertEqual(snapshot(restored), snapshot(state))
+            if include_rng:
+                self.assertEqual(restored.rng.getstate(), state.rng.getstate())
+                self.assertEqual(restored.rng.random(), state.rng.random())
+
+    def test_restored_game_continues_identically(self) -> None:
+        state = GameState(seed=7)
+        for _ in range(15):
+            hard_drop(state)
+        restored = load_state(dump_state(state))
+        for _ in range(30):
+            hard_drop(state)
+            hard_drop(restored)
+        self.assertEqual(snapshot(restored), snapshot(state))
+
+    def test_corrupt_blobs_raise_value_error(self) -> None:
+        rng = random.Random(41)
+        for _ in range(200):
+            blob = bytearray(dump_state(random_state(rng), rng.random() < 0.3))
+            if rng.random() < 0.5:
+                del blob[rng.randrange(len(blob)) :]
+            else:
+                for _ in range(rng.randint(1, 4)):
+                    blob[rng.randrange(len(blob))] ^= 1 << rng.randrange(8)
+            try:
+                state = load_state(bytes(blob))
+            except ValueError:
+                continue
+            self.assertGreaterEqual(state.board.width, 4)
+            self.assertEqual(len(state.board.grid), state.board.height)
+
+
+class AutoSaveTest(unittest.TestCase):
+    def test_save_follows_the_game_and_is_removed_on_game_over(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "quicksave.bin"
+            state = GameState(seed=3)
+            state.events.subscribe(AutoSave(path))
+            hard_drop(state)
+            saved = load_state_file(path)
+            assert saved is not None
+            self.assertEqual(snapshot(saved), snapshot(state))
+            while not state.game_over:
+                hard_drop(state)
+            self.assertFalse(path.exists())
+
+    def test_unreadable_save_is_ignored(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "quicksave.bin"
+            self.assertIsNone(load_state_file(path))
+            save_state_file(path, GameState(seed=0))
+            path.write_bytes(path.read_bytes()[:-3])
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                self.assertIsNone(load_state_file(path))
+            self.assertIn("Ignoring saved game", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
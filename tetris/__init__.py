@@ -1,3 +1,13 @@
-from .game import main
+from typing import Any
 
-__all__ = ["main"]
+__all__ = ["BoardConfig", "main"]
+
+
+def __getattr__(name: str) -> Any:
+    # The front end pulls in pygame; headless tools such as tetris.analyze
+    # should be importable without it.
+    if name in __all__:
+        from . import game
+
+        return getattr(game, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
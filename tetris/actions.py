@@ -1,42 +1,51 @@
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from .audio import AudioManager
 from .state import GameState
 
+if TYPE_CHECKING:
+    from .audio import AudioManager
+
+ROTATION_KICKS = ((0, 0), (-1, 0), (1, 0), (0, -1))
+
 
 def move_piece(
-    state: GameState, dx: int = 0, dy: int = 0, audio: Optional[AudioManager] = None
+    state: GameState, dx: int = 0, dy: int = 0, audio: Optional["AudioManager"] = None
 ) -> bool:
     piece = state.current_piece
     state.apply_pending_garbage()
     if state.board.valid(piece, dx=dx, dy=dy):
         piece.x += dx
         piece.y += dy
+        emit = state.events.move
+        if emit is not None:
+            emit(state, dx, dy)
         if dx != 0 and audio:
-            audio.play_move()
+            audio.play_move(state.player_id)
         return True
     return False
 
 
 def rotate_piece(
-    state: GameState, direction: int, audio: Optional[AudioManager] = None
+    state: GameState, direction: int, audio: Optional["AudioManager"] = None
 ) -> bool:
     piece = state.current_piece
     state.apply_pending_garbage()
     target_rotation = piece.rotated(direction)
-    kicks = [(0, 0), (-1, 0), (1, 0), (0, -1)]
-    for dx, dy in kicks:
+    for dx, dy in ROTATION_KICKS:
         if state.board.valid(piece, dx=dx, dy=dy, rotation=target_rotation):
             piece.rotation = target_rotation
             piece.x += dx
             piece.y += dy
+            emit = state.events.rotate
+            if emit is not None:
+                emit(state, direction)
             if audio:
-                audio.play_rotate()
+                audio.play_rotate(state.player_id)
             return True
     return False
 
 
-def hard_drop(state: GameState, audio: Optional[AudioManager] = None) -> int:
+def hard_drop(state: GameState, audio: Optional["AudioManager"] = None) -> int:
     piece = state.current_piece
     state.apply_pending_garbage()
     distance = 0
@@ -45,9 +54,8 @@ def hard_drop(state: GameState, audio: Optional[AudioManager] = None) -> int:
         distance += 1
     if distance:
         state.score += distance * 2
-    lines = state.board.lock_piece(piece)
+    lines = state.lock_piece()
     if audio:
-        audio.play_hard_drop(lines)
-    state.add_score_for_lines(lines)
+        audio.play_hard_drop(lines, state.player_id)
     state.spawn_next()
     return lines
@@ -0,0 +1,266 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .archive import Archive, convert_telemetry
+from .constants import PIECE_CELLS
+from .telemetry import telemetry_files
+
+METRICS = ("lpm", "garbage", "pieces", "score-curve")
+SHAPE_NAMES = {cell: key for key, cell in PIECE_CELLS.items()}
+
+
+@dataclass(frozen=True)
+class GameFilter:
+    player: Optional[int] = None
+    min_score: int = 0
+    max_score: Optional[int] = None
+    min_duration_ms: int = 0
+    finished_only: bool = False
+
+
+@dataclass(frozen=True)
+class ScanTask:
+    path: Path
+    start: int
+    stop: int
+    metric: str
+    game_filter: GameFilter
+    bucket_ms: int
+
+
+def selected_runs(archive: Archive, task: ScanTask) -> Iterator[Tuple[int, int]]:
+    games = archive.games
+    player = games["player"]
+    score = games["score"]
+    duration = games["duration_ms"]
+    finished = games["finished"]
+    game_filter = task.game_filter
+    max_score = game_filter.max_score
+    for idx in range(task.start, task.stop):
+        if game_filter.player is not None and player[idx] != game_filter.player:
+            continue
+        if score[idx] < game_filter.min_score:
+            continue
+        if max_score is not None and score[idx] > max_score:
+            continue
+        if duration[idx] < game_filter.min_duration_ms:
+            continue
+        if game_filter.finished_only and not finished[idx]:
+            continue
+        yield idx, idx + 1
+
+
+def merged_runs(runs: Iterator[Tuple[int, int]]) -> Iterator[Tuple[int, int]]:
+    current: Optional[Tuple[int, int]] = None
+    for start, stop in runs:
+        if current is not None and current[1] == start:
+            current = (current[0], stop)
+            continue
+        if current is not None:
+            yield current
+        current = (start, stop)
+    if current is not None:
+        yield current
+
+
+def scan(task: ScanTask) -> Any:
+    with Archive(task.path) as archive:
+        games = archive.games
+        runs = merged_runs(selected_runs(archive, task))
+        if task.metric == "lpm":
+            values: List[float] = []
+            for start, stop in runs:
+                for idx in range(start, stop):
+                    minutes = games["duration_ms"][idx] / 60_000
+                    if minutes > 0:
+                        values.append(games["lines"][idx] / minutes)
+            return values
+        if task.metric == "garbage":
+            totals = [0, 0, 0, 0]
+            for start, stop in runs:
+                totals[0] += stop - start
+                totals[1] += sum(games["lines"][start:stop])
+                totals[2] += sum(games["garbage_sent"][start:stop])
+                totals[3] += sum(games["garbage_received"][start:stop])
+            return totals
+        lock_start = games["lock_start"]
+        lock_count = games["lock_count"]
+        lock_runs = [
+            (lock_start[start], lock_start[stop - 1] + lock_count[stop - 1])
+            for start, stop in runs
+        ]
+        if task.metric == "pieces":
+            counts: Dict[int, int] = dict.fromkeys(SHAPE_NAMES, 0)
+            shapes = archive.locks["shape"]
+            for first, last in lock_runs:
+                chunk = shapes[first:last].tobytes()
+                for cell in counts:
+                    counts[cell] += chunk.count(cell)
+            return counts
+        buckets: Dict[int, List[int]] = {}
+        bucket_ms = task.bucket_ms
+        times = archive.locks["time_ms"]
+        scores = archive.locks["score"]
+        for first, last in lock_runs:
+            for elapsed, score in zip(times[first:last], scores[first:last]):
+                entry = buckets.get(elapsed // bucket_ms)
+                if entry is None:
+                    buckets[elapsed // bucket_ms] = [score, 1]
+                else:
+                    entry[0] += score
+                    entry[1] += 1
+        return buckets
+
+
+def plan_tasks(
+    paths: Sequence[Path],
+    metric: str,
+    game_filter: GameFilter,
+    bucket_ms: int,
+    workers: int,
+) -> List[ScanTask]:
+    tasks = []
+    for path in paths:
+        with Archive(path) as archive:
+            game_count = archive.game_count
+        chunks = max(1, min(game_count, workers * 4))
+        step = -(-game_count // chunks) if game_count else 1
+        for start in range(0, game_count, step):
+            tasks.append(
+                ScanTask(
+                    path,
+                    start,
+                    min(game_count, start + step),
+                    metric,
+                    game_filter,
+                    bucket_ms,
+                )
+            )
+    return tasks
+
+
+def run_query(
+    paths: Sequence[Path],
+    metric: str,
+    game_filter: GameFilter,
+    bucket_ms: int = 30_000,
+    workers: Optional[int] = None,
+) -> Any:
+    workers = workers or os.cpu_count() or 1
+    tasks = plan_tasks(paths, metric, game_filter, bucket_ms, workers)
+    if workers == 1:
+        partials = [scan(task) for task in tasks]
+    else:
+        with Pool(workers) as pool:
+            partials = pool.map(scan, tasks, chunksize=1)
+    return merge(metric, partials)
+
+
+def merge(metric: str, partials: Sequence[Any]) -> Any:
+    if metric == "lpm":
+        return [value for part in partials for value in part]
+    if metric == "garbage":
+        totals = [0, 0, 0, 0]
+        for part in partials:
+            totals = [a + b for a, b in zip(totals, part)]
+        return totals
+    if metric == "pieces":
+        counts: Dict[int, int] = dict.fromkeys(SHAPE_NAMES, 0)
+        for part in partials:
+            for cell, count in part.items():
+                counts[cell] += count
+        return counts
+    buckets: Dict[int, List[int]] = {}
+    for part in partials:
+        for bucket, (total, count) in part.items():
+            entry = buckets.setdefault(bucket, [0, 0])
+            entry[0] += total
+            entry[1] += count
+    return buckets
+
+
+def report(metric: str, result: Any, bucket_ms: int) -> None:
+    if metric == "lpm":
+        values = sorted(result)
+        if not values:
+            print("no games matched")
+            return
+        deciles = statistics.quantiles(values, n=10) if len(values) > 1 else values
+        print(f"games: {len(values)}  mean LPM: {statistics.fmean(values):.2f}")
+        print("deciles: " + " ".join(f"{value:.1f}" for value in deciles))
+    elif metric == "garbage":
+        games, lines, sent, received = result
+        efficiency = sent / lines if lines else 0.0
+        print(f"games: {games}  lines: {lines}  sent: {sent}  received: {received}")
+        print(f"garbage per line cleared: {efficiency:.3f}")
+    elif metric == "pieces":
+        counts: Dict[int, int] = result
+        total = sum(counts.values()) or 1
+        for cell, count in counts.items():
+            print(f"{SHAPE_NAMES[cell]}: {count:>12} {count / total:7.2%}")
+    else:
+        buckets: Dict[int, List[int]] = result
+        for bucket in sorted(buckets):
+            total, count = buckets[bucket]
+            print(
+                f"{bucket * bucket_ms / 1000:>8.0f}s  mean score {total / count:10.1f}"
+            )
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m tetris.analyze", description="Recorded game analysis"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    convert = commands.add_parser("convert", help="build an archive from telemetry")
+    convert.add_argument("logs", type=Path, help="telemetry directory")
+    convert.add_argument("-o", "--output", type=Path, required=True)
+
+    query = commands.add_parser("query", help="run an aggregate query")
+    query.add_argument("archives", type=Path, nargs="+")
+    query.add_argument("--metric", choices=METRICS, required=True)
+    query.add_argument("--player", type=int)
+    query.add_argument("--min-score", type=int, default=0)
+    query.add_argument("--max-score", type=int)
+    query.add_argument("--min-duration", type=float, default=0.0, help="seconds")
+    query.add_argument("--finished-only", action="store_true")
+    query.add_argument("--bucket", type=float, default=30.0, help="seconds")
+    query.add_argument("--workers", type=int)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    start = time.perf_counter()
+    if args.command == "convert":
+        files = telemetry_files(args.logs)
+        if not files:
+            sys.exit(f"No telemetry files in {args.logs}")
+        games, locks = convert_telemetry(files, args.output)
+        print(f"wrote {games} games / {locks} locks to {args.output}")
+    else:
+        game_filter = GameFilter(
+            player=args.player,
+            min_score=args.min_score,
+            max_score=args.max_score,
+            min_duration_ms=int(args.min_duration * 1000),
+            finished_only=args.finished_only,
+        )
+        bucket_ms = max(1, int(args.bucket * 1000))
+        result = run_query(
+            args.archives, args.metric, game_filter, bucket_ms, args.workers
+        )
+        report(args.metric, result, bucket_ms)
+    print(f"({time.perf_counter() - start:.2f} s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
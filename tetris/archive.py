@@ -0,0 +1,202 @@
+import mmap
+import struct
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from .telemetry import TelemetryEvent, TelemetryRecord, read_records
+
+ARCHIVE_MAGIC = b"TCOL"
+ARCHIVE_VERSION = 1
+HEADER = struct.Struct("<4sHHQQ")
+COLUMN_ENTRY = struct.Struct("<32s2sxxxxxxQQ")
+ALIGNMENT = 8
+
+GAME_COLUMNS: Dict[str, str] = {
+    "player": "B",
+    "finished": "B",
+    "level": "H",
+    "start_ns": "q",
+    "duration_ms": "I",
+    "score": "i",
+    "lines": "i",
+    "garbage_sent": "I",
+    "garbage_received": "I",
+    "lock_start": "Q",
+    "lock_count": "I",
+}
+LOCK_COLUMNS: Dict[str, str] = {
+    "time_ms": "I",
+    "shape": "B",
+    "rotation": "B",
+    "lines": "B",
+    "x": "h",
+    "score": "i",
+}
+
+
+def _lock_columns() -> Dict[str, array]:
+    return {name: array(code) for name, code in LOCK_COLUMNS.items()}
+
+
+@dataclass
+class ColumnTables:
+    games: Dict[str, array] = field(
+        default_factory=lambda: {
+            name: array(code) for name, code in GAME_COLUMNS.items()
+        }
+    )
+    locks: Dict[str, array] = field(default_factory=_lock_columns)
+
+
+def write_archive(path: Path, tables: ColumnTables) -> None:
+    columns: List[Tuple[str, str, array]] = [
+        (f"g.{name}", GAME_COLUMNS[name], tables.games[name]) for name in GAME_COLUMNS
+    ] + [(f"l.{name}", LOCK_COLUMNS[name], tables.locks[name]) for name in LOCK_COLUMNS]
+    game_rows = len(tables.games["score"])
+    lock_rows = len(tables.locks["score"])
+    offset = _align(HEADER.size + COLUMN_ENTRY.size * len(columns))
+    directory = []
+    for name, code, values in columns:
+        directory.append((name, code, offset, len(values)))
+        offset = _align(offset + len(values) * values.itemsize)
+    with path.open("wb") as handle:
+        handle.write(
+            HEADER.pack(
+                ARCHIVE_MAGIC, ARCHIVE_VERSION, len(columns), game_rows, lock_rows
+            )
+        )
+        for name, code, column_offset, count in directory:
+            handle.write(
+                COLUMN_ENTRY.pack(name.encode(), code.encode(), column_offset, count)
+            )
+        for (_, _, values), (_, _, column_offset, _) in zip(columns, directory):
+            handle.write(b"\0" * (column_offset - handle.tell()))
+            values.tofile(handle)
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class Archive:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        magic, version, column_count, self.game_count, self.lock_count = (
+            HEADER.unpack_from(view)
+        )
+        if magic != ARCHIVE_MAGIC or version != ARCHIVE_VERSION:
+            view.release()
+            self._map.close()
+            raise ValueError(f"{path} is not a v{ARCHIVE_VERSION} game archive")
+        self.games: Dict[str, memoryview] = {}
+        self.locks: Dict[str, memoryview] = {}
+        for idx in range(column_count):
+            raw_name, raw_code, offset, count = COLUMN_ENTRY.unpack_from(
+                view, HEADER.size + idx * COLUMN_ENTRY.size
+            )
+            name = raw_name.rstrip(b"\0").decode()
+            code = raw_code.rstrip(b"\0").decode()
+            itemsize = array(code).itemsize
+            column = view[offset : offset + count * itemsize].cast(code)
+            table, _, column_name = name.partition(".")
+            (self.games if table == "g" else self.locks)[column_name] = column
+        view.release()
+
+    def close(self) -> None:
+        for column in (*self.games.values(), *self.locks.values()):
+            column.release()
+        self.games.clear()
+        self.locks.clear()
+        self._map.close()
+
+    def __enter__(self) -> "Archive":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+@dataclass
+class _OpenGame:
+    player: int
+    start_ns: int
+    # Buffered until the game closes so each game's locks stay contiguous
+    # even when several players' records are interleaved.
+    locks: Dict[str, array] = field(default_factory=_lock_columns)
+    last_ns: int = 0
+    score: int = 0
+    lines: int = 0
+    level: int = 1
+    garbage_sent: int = 0
+    garbage_received: int = 0
+
+
+def convert_telemetry(paths: Iterable[Path], output: Path) -> Tuple[int, int]:
+    tables = ColumnTables()
+    open_games: Dict[Tuple[str, int], _OpenGame] = {}
+    for path in sorted(paths):
+        session = path.name.rsplit("-", 1)[0]
+        for record in read_records(path):
+            key = (session, record.player)
+            game = open_games.get(key)
+            if record.event == TelemetryEvent.GAME_START:
+                if game is not None:
+                    _close_game(tables, game, finished=False)
+                open_games[key] = _OpenGame(record.player, record.timestamp_ns)
+                continue
+            if game is None:
+                continue
+            game.last_ns = record.timestamp_ns
+            _apply_record(game, record)
+            if record.event == TelemetryEvent.GAME_OVER:
+                _close_game(tables, game, finished=True)
+                del open_games[key]
+    for game in open_games.values():
+        _close_game(tables, game, finished=False)
+    write_archive(output, tables)
+    return len(tables.games["score"]), len(tables.locks["score"])
+
+
+def _apply_record(game: _OpenGame, record: TelemetryRecord) -> None:
+    event = record.event
+    if event == TelemetryEvent.LOCK:
+        locks = game.locks
+        locks["time_ms"].append((record.timestamp_ns - game.start_ns) // 1_000_000)
+        locks["shape"].append(record.shape)
+        locks["rotation"].append(record.rotation)
+        locks["lines"].append(record.value)
+        locks["x"].append(record.x)
+        locks["score"].append(record.extra)
+        game.lines += record.value
+        game.score = record.extra
+    elif event == TelemetryEvent.GARBAGE_SENT:
+        game.garbage_sent += record.value
+    elif event == TelemetryEvent.GARBAGE_RECEIVED:
+        game.garbage_received += record.value
+    elif event == TelemetryEvent.LEVEL_UP:
+        game.level = record.value
+    elif event == TelemetryEvent.GAME_OVER:
+        game.score = record.value
+        game.lines = record.extra
+
+
+def _close_game(tables: ColumnTables, game: _OpenGame, finished: bool) -> None:
+    games = tables.games
+    games["player"].append(game.player)
+    games["finished"].append(int(finished))
+    games["level"].append(game.level)
+    games["start_ns"].append(game.start_ns)
+    games["duration_ms"].append(max(0, game.last_ns - game.start_ns) // 1_000_000)
+    games["score"].append(game.score)
+    games["lines"].append(game.lines)
+    games["garbage_sent"].append(game.garbage_sent)
+    games["garbage_received"].append(game.garbage_received)
+    games["lock_start"].append(len(tables.locks["score"]))
+    games["lock_count"].append(len(game.locks["score"]))
+    for name, values in game.locks.items():
+        tables.locks[name].extend(values)
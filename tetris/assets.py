@@ -0,0 +1,272 @@
+import hashlib
+import mmap
+import os
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import pygame
+
+from .constants import ASSET_CACHE_DIR, CELL_COLORS, PIECE_CELLS, PIECE_COLORS
+from .render import TileSet
+
+ASSET_BUNDLE_VERSION = 1
+BUNDLE_MAGIC = b"TAST"
+HEADER = struct.Struct("<4sHI")
+ENTRY = struct.Struct("<BHIIQQ")
+KIND_SURFACE = 1
+KIND_PCM = 2
+CONSTANTS_PATH = Path(__file__).resolve().parent / "constants.py"
+
+Color = Tuple[int, int, int]
+
+
+@dataclass(frozen=True)
+class TextLabel:
+    role: str
+    text: str
+    color: Color
+
+
+def text_key(role: str, text: str, color: Sequence[int]) -> str:
+    return f"text|{role}|{','.join(map(str, color[:3]))}|{text}"
+
+
+def tile_key(kind: str, cell: int, size: int) -> str:
+    return f"{kind}|{cell}|{size}"
+
+
+class BundledFont:
+    def __init__(self, font: pygame.font.Font, role: str, bundle: "AssetBundle"):
+        self._font = font
+        self._role = role
+        self._bundle = bundle
+
+    def render(
+        self, text: str, antialias: bool, color: Sequence[int], *args: Any
+    ) -> pygame.Surface:
+        if antialias and not args:
+            surface = self._bundle.surface(text_key(self._role, text, color))
+            if surface is not None:
+                return surface
+        return self._font.render(text, antialias, color, *args)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._font, name)
+
+
+class AssetBundle:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        self._entries: Dict[str, Tuple[int, int, int, memoryview]] = {}
+        self._surfaces: Dict[str, pygame.Surface] = {}
+        self._tile_sets: Dict[int, TileSet] = {}
+        try:
+            self._read_directory()
+        except (struct.error, ValueError) as exc:
+            self.close()
+            raise ValueError(f"{path} is not a valid asset bundle: {exc}") from None
+
+    def _read_directory(self) -> None:
+        view = self._view
+        size = len(view)
+        magic, version, count = HEADER.unpack_from(view)
+        if magic != BUNDLE_MAGIC or version != ASSET_BUNDLE_VERSION:
+            raise ValueError(f"expected a v{ASSET_BUNDLE_VERSION} bundle")
+        offset = HEADER.size
+        for _ in range(count):
+            kind, key_length, width, height, start, length = ENTRY.unpack_from(
+                view, offset
+            )
+            offset += ENTRY.size
+            if offset + key_length > size or start + length > size:
+                raise ValueError("truncated")
+            key = bytes(view[offset : offset + key_length]).decode()
+            offset += key_length
+            if kind == KIND_SURFACE and length != width * height * 4:
+                raise ValueError(f"bad surface size for {key}")
+            self._entries[key] = (kind, width, height, view[start : start + length])
+
+    def surface(self, key: str) -> Optional[pygame.Surface]:
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            return surface
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != KIND_SURFACE:
+            return None
+        _, width, height, data = entry
+        surface = pygame.image.frombuffer(data, (width, height), "RGBA")
+        self._surfaces[key] = surface
+        return surface
+
+    def pcm(self, name: str) -> Optional[memoryview]:
+        entry = self._entries.get(f"sound|{name}")
+        if entry is None or entry[0] != KIND_PCM:
+            return None
+        return entry[3]
+
+    def tiles(self, block_size: int) -> Optional[TileSet]:
+        tile_set = self._tile_sets.get(block_size)
+        if tile_set is not None:
+            return tile_set
+        sets: List[Dict[int, pygame.Surface]] = []
+        for kind, size in (
+            ("tile", block_size),
+            ("ghost", block_size),
+            ("tile", preview_size(block_size)),
+        ):
+            surfaces = {}
+            for cell in range(1, len(CELL_COLORS)):
+                surface = self.surface(tile_key(kind, cell, size))
+                if surface is not None:
+                    surfaces[cell] = surface
+            sets.append(surfaces)
+        if not sets[0]:
+            return None
+        tile_set = TileSet(blocks=sets[0], ghosts=sets[1], previews=sets[2])
+        self._tile_sets[block_size] = tile_set
+        return tile_set
+
+    def font(self, role: str, font: pygame.font.Font) -> BundledFont:
+        return BundledFont(font, role, self)
+
+    def close(self) -> None:
+        self._surfaces.clear()
+        self._tile_sets.clear()
+        self._entries = {}
+        self._view.release()
+        try:
+            self._map.close()
+        except BufferError:
+            # A surface handed out earlier still references the mapping.
+            pass
+
+
+def preview_size(block_size: int) -> int:
+    return max(8, block_size) // 2
+
+
+def bundle_digest(
+    labels: Iterable[TextLabel],
+    block_sizes: Iterable[int],
+    sounds: Mapping[str, Tuple[float, float, float]],
+) -> str:
+    digest = hashlib.sha256()
+    digest.update(CONSTANTS_PATH.read_bytes())
+    digest.update(
+        repr(
+            (
+                ASSET_BUNDLE_VERSION,
+                pygame.version.ver,
+                sorted(set(block_sizes)),
+                sorted(labels, key=repr),
+                sorted(sounds.items()),
+            )
+        ).encode()
+    )
+    return digest.hexdigest()[:16]
+
+
+def build_bundle(
+    path: Path,
+    fonts: Mapping[str, pygame.font.Font],
+    labels: Iterable[TextLabel],
+    block_sizes: Iterable[int],
+    sounds: Mapping[str, bytes],
+) -> None:
+    entries: List[Tuple[str, int, int, int, bytes]] = []
+    for label in labels:
+        surface = fonts[label.role].render(label.text, True, label.color)
+        key = text_key(label.role, label.text, label.color)
+        entries.append(_surface_entry(key, surface))
+    for block_size in sorted(set(block_sizes)):
+        for cell, color in enumerate(CELL_COLORS):
+            if color is None:
+                continue
+            for size in (block_size, preview_size(block_size)):
+                tile = pygame.Surface((size, size), pygame.SRCALPHA)
+                tile.fill((*color, 255))
+                entries.append(_surface_entry(tile_key("tile", cell, size), tile))
+        for shape, cell in PIECE_CELLS.items():
+            ghost = ghost_tile(PIECE_COLORS[shape], block_size)
+            entries.append(_surface_entry(tile_key("ghost", cell, block_size), ghost))
+    for name, pcm in sounds.items():
+        entries.append((f"sound|{name}", KIND_PCM, 0, 0, pcm))
+
+    directory_size = HEADER.size + sum(
+        ENTRY.size + len(key.encode()) for key, *_ in entries
+    )
+    offset = directory_size
+    directory = bytearray(HEADER.pack(BUNDLE_MAGIC, ASSET_BUNDLE_VERSION, len(entries)))
+    for key, kind, width, height, data in entries:
+        encoded = key.encode()
+        directory += ENTRY.pack(kind, len(encoded), width, height, offset, len(data))
+        directory += encoded
+        offset += len(data)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(f".{os.getpid()}.tmp")
+    with temporary.open("wb") as handle:
+        handle.write(directory)
+        for *_, data in entries:
+            handle.write(data)
+    os.replace(temporary, path)
+
+
+def ghost_tile(color: Color, block_size: int) -> pygame.Surface:
+    tile = pygame.Surface((block_size, block_size), pygame.SRCALPHA)
+    tile.fill((*color, 80))
+    outline = tuple(min(255, c + 60) for c in color)
+    pygame.draw.rect(tile, (*outline, 255), tile.get_rect(), 2)
+    return tile
+
+
+def _surface_entry(
+    key: str, surface: pygame.Surface
+) -> Tuple[str, int, int, int, bytes]:
+    width, height = surface.get_size()
+    data = pygame.image.tobytes(surface, "RGBA")
+    return key, KIND_SURFACE, width, height, data
+
+
+def load_bundle(
+    fonts: Mapping[str, pygame.font.Font],
+    labels: Sequence[TextLabel],
+    block_sizes: Sequence[int],
+    sounds: Mapping[str, Tuple[float, float, float]],
+    synthesize: Callable[[float, float, float], bytes],
+    cache_dir: Path = ASSET_CACHE_DIR,
+) -> Optional[AssetBundle]:
+    digest = bundle_digest(labels, block_sizes, sounds)
+    path = cache_dir / f"assets-v{ASSET_BUNDLE_VERSION}-{digest}.bin"
+    try:
+        if path.exists():
+            try:
+                return AssetBundle(path)
+            except ValueError as exc:
+                print(f"Rebuilding asset bundle: {exc}")
+        for stale in cache_dir.glob("assets-v*.bin"):
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+        pcm = {name: synthesize(*spec) for name, spec in sounds.items()}
+        build_bundle(path, fonts, labels, block_sizes, pcm)
+        return AssetBundle(path)
+    except (OSError, ValueError, pygame.error) as exc:
+        print(f"Asset bundle unavailable: {exc}")
+        return None
@@ -1,41 +1,183 @@
 import math
+import time
 from array import array
-from typing import Optional
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 import pygame
 
 from .constants import SAMPLE_RATE, TRACK_PATH
 
+if TYPE_CHECKING:
+    from .assets import AssetBundle
 
-def _sine_wave(
-    freq: float, duration: float, volume: float
-) -> Optional[pygame.mixer.Sound]:
+# name -> (frequency, duration, volume)
+SOUND_EFFECTS: Dict[str, Tuple[float, float, float]] = {
+    "move": (700, 0.05, 0.25),
+    "rotate": (920, 0.08, 0.25),
+    "lock": (320, 0.09, 0.35),
+    "line": (880, 0.12, 0.4),
+    "hard_drop": (180, 0.1, 0.4),
+}
+# When every voice is busy, a trigger may steal one of lower or equal priority.
+EFFECT_PRIORITY: Dict[str, int] = {
+    "move": 0,
+    "rotate": 1,
+    "lock": 2,
+    "hard_drop": 3,
+    "line": 4,
+}
+VOICE_COUNT = 8
+COALESCE_MS = 25.0
+# Pan of the outermost players; 1.0 would put them fully in one speaker.
+PLAYER_SPREAD = 0.7
+
+
+def sine_pcm(freq: float, duration: float, volume: float) -> bytes:
     if freq <= 0 or duration <= 0:
-        return None
+        return b""
     sample_count = max(1, int(duration * SAMPLE_RATE))
     amplitude = int(32767 * volume)
     data = array("h")
     for i in range(sample_count):
         sample = int(amplitude * math.sin(2 * math.pi * freq * (i / SAMPLE_RATE)))
         data.append(sample)
-    return pygame.mixer.Sound(buffer=data.tobytes())
+    return data.tobytes()
+
+
+def stereo_pcm(pcm: bytes) -> bytes:
+    mono = array("h")
+    mono.frombytes(pcm)
+    stereo = array("h", bytes(len(mono) * 4))
+    stereo[0::2] = mono
+    stereo[1::2] = mono
+    return stereo.tobytes()
+
+
+def player_pan(player: int, players: int) -> Tuple[float, float]:
+    """Left and right volume placing a player between the speakers."""
+    if players <= 1:
+        return 1.0, 1.0
+    offset = (player / (players - 1) * 2 - 1) * PLAYER_SPREAD
+    return min(1.0, 1.0 - offset), min(1.0, 1.0 + offset)
+
+
+@dataclass(slots=True)
+class Voice:
+    channel: Any
+    effect: str = ""
+    priority: int = -1
+    started_ns: int = 0
+    ends_ns: int = 0
+
+
+class VoicePool:
+    """A fixed set of mixer channels shared by every sound effect.
+
+    Repeats of one player's effect inside the coalescing window are merged
+    into the voice already playing it. When no voice is free, the oldest
+    voice of the lowest priority not above the new effect's is stolen;
+    otherwise the trigger is dropped.
+    """
+
+    def __init__(
+        self,
+        channels: Sequence[Any],
+        coalesce_ms: float = COALESCE_MS,
+        stereo: bool = True,
+        clock: Callable[[], int] = time.perf_counter_ns,
+    ) -> None:
+        self.voices = [Voice(channel) for channel in channels]
+        self.coalesce_ns = int(coalesce_ms * 1e6)
+        self.stereo = stereo
+        self.clock = clock
+        self.issued = 0
+        self.played = 0
+        self.coalesced = 0
+        self.stolen = 0
+        self.dropped = 0
+        self._last: Dict[Tuple[str, int], int] = {}
+
+    def trigger(
+        self,
+        effect: str,
+        sound: Any,
+        length_ns: int,
+        player: int = 0,
+        pan: Tuple[float, float] = (1.0, 1.0),
+    ) -> bool:
+        self.issued += 1
+        now = self.clock()
+        key = (effect, player)
+        if now - self._last.get(key, -self.coalesce_ns) < self.coalesce_ns:
+            self.coalesced += 1
+            return False
+        self._last[key] = now
+        priority = EFFECT_PRIORITY.get(effect, 0)
+        voice = self._free_voice(now, priority)
+        if voice is None:
+            self.dropped += 1
+            return False
+        voice.effect = effect
+        voice.priority = priority
+        voice.started_ns = now
+        voice.ends_ns = now + length_ns
+        voice.channel.play(sound)
+        # play() resets the channel volume, so the pan is set after every play.
+        if self.stereo:
+            voice.channel.set_volume(*pan)
+        self.played += 1
+        return True
+
+    def _free_voice(self, now: int, priority: int) -> Optional[Voice]:
+        victim: Optional[Voice] = None
+        victim_priority = priority + 1
+        victim_started = 0
+        for voice in self.voices:
+            if voice.ends_ns <= now:
+                return voice
+            candidate = voice.priority
+            if candidate < victim_priority or (
+                candidate == victim_priority and voice.started_ns < victim_started
+            ):
+                victim = voice
+                victim_priority = candidate
+                victim_started = voice.started_ns
+        if victim is not None:
+            self.stolen += 1
+        return victim
+
+    def busy(self) -> int:
+        now = self.clock()
+        return sum(voice.ends_ns > now for voice in self.voices)
+
+    def summary(self) -> str:
+        return (
+            f"{self.issued} triggers: {self.played} played "
+            f"({self.stolen} by stealing), {self.coalesced} coalesced, "
+            f"{self.dropped} dropped"
+        )
 
 
 class AudioManager:
-    def __init__(self) -> None:
+    def __init__(self, bundle: Optional["AssetBundle"] = None) -> None:
+        self.bundle = bundle
         self.enabled = False
-        self.move_sound: Optional[pygame.mixer.Sound] = None
-        self.rotate_sound: Optional[pygame.mixer.Sound] = None
-        self.lock_sound: Optional[pygame.mixer.Sound] = None
-        self.line_sound: Optional[pygame.mixer.Sound] = None
-        self.hard_drop_sound: Optional[pygame.mixer.Sound] = None
+        self.pans = [player_pan(0, 1)]
+        self.voices: Optional[VoicePool] = None
+        self._sounds: Dict[str, Tuple[pygame.mixer.Sound, int]] = {}
 
         self._ensure_mixer()
         if not self.enabled:
             return
 
-        pygame.mixer.set_num_channels(8)
-        self._load_effects()
+        pygame.mixer.set_num_channels(VOICE_COUNT)
+        init = pygame.mixer.get_init()
+        stereo = init is not None and init[2] >= 2
+        self.voices = VoicePool(
+            [pygame.mixer.Channel(idx) for idx in range(VOICE_COUNT)], stereo=stereo
+        )
+        self._load_effects(stereo)
         self._start_music()
 
     def _ensure_mixer(self) -> None:
@@ -43,19 +185,26 @@ class AudioManager:
             self.enabled = True
             return
         try:
-            pygame.mixer.init(frequency=SAMPLE_RATE, size=-16, channels=1)
+            pygame.mixer.init(frequency=SAMPLE_RATE, size=-16, channels=2)
         except pygame.error as exc:
             print(f"Audio unavailable: {exc}")
             self.enabled = False
         else:
             self.enabled = True
 
-    def _load_effects(self) -> None:
-        self.move_sound = _sine_wave(700, 0.05, 0.25)
-        self.rotate_sound = _sine_wave(920, 0.08, 0.25)
-        self.lock_sound = _sine_wave(320, 0.09, 0.35)
-        self.line_sound = _sine_wave(880, 0.12, 0.4)
-        self.hard_drop_sound = _sine_wave(180, 0.1, 0.4)
+    def _load_effects(self, stereo: bool) -> None:
+        for name in SOUND_EFFECTS:
+            sound = self._effect(name, stereo)
+            if sound is not None:
+                self._sounds[name] = (sound, int(sound.get_length() * 1e9))
+
+    def _effect(self, name: str, stereo: bool) -> Optional[pygame.mixer.Sound]:
+        pcm = self.bundle.pcm(name) if self.bundle is not None else None
+        if pcm is None:
+            pcm = sine_pcm(*SOUND_EFFECTS[name])
+        if not pcm:
+            return None
+        return pygame.mixer.Sound(buffer=stereo_pcm(pcm) if stereo else pcm)
 
     def _start_music(self) -> None:
         if not TRACK_PATH.exists():
@@ -68,25 +217,33 @@ class AudioManager:
         except pygame.error as exc:
             print(f"Unable to play music track: {exc}")
 
-    def play_move(self) -> None:
-        if self.enabled and self.move_sound:
-            pygame.mixer.Channel(1).play(self.move_sound)
+    def set_players(self, players: int) -> None:
+        self.pans = [player_pan(player, players) for player in range(players)]
 
-    def play_rotate(self) -> None:
-        if self.enabled and self.rotate_sound:
-            pygame.mixer.Channel(2).play(self.rotate_sound)
-
-    def play_lock(self, lines: int) -> None:
-        if not self.enabled:
+    def _play(self, effect: str, player: int) -> None:
+        voices = self.voices
+        entry = self._sounds.get(effect)
+        if voices is None or entry is None:
             return
-        channel = pygame.mixer.Channel(3 if lines == 0 else 4)
-        sound = self.lock_sound if lines == 0 else self.line_sound
-        if sound:
-            channel.play(sound)
+        sound, length_ns = entry
+        pans = self.pans
+        pan = pans[player] if player < len(pans) else pans[0]
+        voices.trigger(effect, sound, length_ns, player, pan)
+
+    def play_move(self, player: int = 0) -> None:
+        if self.enabled:
+            self._play("move", player)
+
+    def play_rotate(self, player: int = 0) -> None:
+        if self.enabled:
+            self._play("rotate", player)
+
+    def play_lock(self, lines: int, player: int = 0) -> None:
+        if self.enabled:
+            self._play("lock" if lines == 0 else "line", player)
 
-    def play_hard_drop(self, lines: int) -> None:
+    def play_hard_drop(self, lines: int, player: int = 0) -> None:
         if not self.enabled:
             return
-        if self.hard_drop_sound:
-            pygame.mixer.Channel(5).play(self.hard_drop_sound)
-        self.play_lock(lines)
+        self._play("hard_drop", player)
+        self.play_lock(lines, player)
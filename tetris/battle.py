@@ -0,0 +1,417 @@
+import multiprocessing
+import os
+import struct
+import threading
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import List, Optional, Sequence
+
+from .actions import hard_drop
+from .board import Board
+from .constants import BOARD_HEIGHT, BOARD_WIDTH, EMPTY_CELL, PIECE_CELLS
+from .pieces import TETROMINO_SHAPES
+from .search import Placement, reachable_placements
+from .state import GameState
+
+# seq, tick, over_tick, score, level, lines, pieces, shape, rotation, x, y, next
+SLOT_HEADER = struct.Struct("<IIIiiiiBBhhBxxx")
+# head, tail; then RING_SLOTS entries of (tick, lines)
+RING_HEADER = struct.Struct("<II")
+RING_ENTRY = struct.Struct("<II")
+RING_SLOTS = 8
+# Torn reads before falling back to the player's last consistent snapshot.
+SNAPSHOT_RETRIES = 64
+SHAPE_KEYS = {cell: key for key, cell in PIECE_CELLS.items()}
+
+
+def _align(size: int) -> int:
+    return (size + 7) // 8 * 8
+
+
+@dataclass(frozen=True)
+class BattleLayout:
+    players: int
+    width: int
+    height: int
+
+    @property
+    def slot_size(self) -> int:
+        return _align(SLOT_HEADER.size + self.width * self.height)
+
+    @property
+    def ring_size(self) -> int:
+        return RING_HEADER.size + RING_SLOTS * RING_ENTRY.size
+
+    @property
+    def rings_offset(self) -> int:
+        return self.players * self.slot_size
+
+    @property
+    def total_size(self) -> int:
+        return self.rings_offset + self.players * self.players * self.ring_size
+
+    def slot_offset(self, player: int) -> int:
+        return player * self.slot_size
+
+    def ring_offset(self, sender: int, receiver: int) -> int:
+        return self.rings_offset + (receiver * self.players + sender) * self.ring_size
+
+
+@dataclass
+class PlayerSnapshot:
+    tick: int
+    eliminated_at: int
+    score: int
+    level: int
+    lines: int
+    pieces: int
+    shape: str
+    rotation: int
+    x: int
+    y: int
+    next_shape: str
+    grid: bytes
+
+
+class GarbageRing:
+    """Single-producer, single-consumer queue of (tick, lines) in shared memory."""
+
+    def __init__(self, buffer: memoryview, offset: int) -> None:
+        self.buffer = buffer
+        self.offset = offset
+
+    def push(self, tick: int, lines: int) -> bool:
+        head, tail = RING_HEADER.unpack_from(self.buffer, self.offset)
+        if tail - head >= RING_SLOTS:
+            return False
+        entry = self.offset + RING_HEADER.size + (tail % RING_SLOTS) * RING_ENTRY.size
+        RING_ENTRY.pack_into(self.buffer, entry, tick, lines)
+        # Publish the entry before the new tail becomes visible.
+        struct.pack_into("<I", self.buffer, self.offset + 4, tail + 1)
+        return True
+
+    def pop_before(self, tick: int) -> int:
+        head, tail = RING_HEADER.unpack_from(self.buffer, self.offset)
+        lines = 0
+        while head != tail:
+            entry = (
+                self.offset + RING_HEADER.size + (head % RING_SLOTS) * RING_ENTRY.size
+            )
+            sent_tick, sent_lines = RING_ENTRY.unpack_from(self.buffer, entry)
+            if sent_tick >= tick:
+                break
+            lines += sent_lines
+            head += 1
+        struct.pack_into("<I", self.buffer, self.offset, head)
+        return lines
+
+
+def evaluate_placement(board: Board, shape_key: str, placement: Placement) -> int:
+    layout = TETROMINO_SHAPES[shape_key][placement.rotation]
+    cells = [
+        (placement.x + col, placement.y + row)
+        for row, line in enumerate(layout)
+        for col, char in enumerate(line)
+        if char == "X"
+    ]
+    grid = board.grid
+    height = board.height
+    occupied = set(cells)
+    rows = {y for _, y in cells}
+    cleared = sum(
+        1
+        for y in rows
+        if 0 <= y < height
+        and all(
+            grid[y][x] != EMPTY_CELL or (x, y) in occupied for x in range(board.width)
+        )
+    )
+    holes = 0
+    for x in {x for x, _ in cells}:
+        y = max(y for cx, y in cells if cx == x) + 1
+        while y < height and grid[y][x] == EMPTY_CELL:
+            holes += 1
+            y += 1
+    lowest = max(y for _, y in cells)
+    return cleared * 40 - holes * 30 + lowest * 4 - placement.rotation
+
+
+def choose_placement(state: GameState) -> Optional[Placement]:
+    placements = reachable_placements(state.board, state.current_piece)
+    if not placements:
+        return None
+    shape_key = state.current_piece.shape_key
+    return max(
+        placements,
+        key=lambda placement: evaluate_placement(state.board, shape_key, placement),
+    )
+
+
+class _PlayerSide:
+    def __init__(
+        self, player: int, layout: BattleLayout, buffer: memoryview, seed: int
+    ) -> None:
+        self.player = player
+        self.layout = layout
+        self.buffer = buffer
+        self.state = GameState(layout.width, layout.height, seed)
+        self.pieces = 0
+        self.eliminated_at = 0
+        self.inbound = [
+            GarbageRing(buffer, layout.ring_offset(sender, player))
+            for sender in range(layout.players)
+        ]
+
+    def play_tick(self, tick: int) -> int:
+        state = self.state
+        if self.eliminated_at:
+            return 0
+        for ring in self.inbound:
+            state.queue_garbage(ring.pop_before(tick))
+        state.apply_pending_garbage()
+        lines = 0
+        if not state.game_over:
+            placement = choose_placement(state)
+            if placement is None:
+                state.game_over = True
+            else:
+                piece = state.current_piece
+                piece.rotation = placement.rotation
+                piece.x = placement.x
+                piece.y = placement.y
+                lines = hard_drop(state)
+                self.pieces += 1
+        if state.game_over:
+            self.eliminated_at = tick
+        self.publish(tick)
+        return max(0, lines - 1)
+
+    def publish(self, tick: int) -> None:
+        buffer = self.buffer
+        offset = self.layout.slot_offset(self.player)
+        state = self.state
+        piece = state.current_piece
+        seq = struct.unpack_from("<I", buffer, offset)[0] + 1
+        struct.pack_into("<I", buffer, offset, seq)
+        SLOT_HEADER.pack_into(
+            buffer,
+            offset,
+            seq,
+            tick,
+            self.eliminated_at,
+            state.score,
+            state.level,
+            state.board.lines_cleared,
+            self.pieces,
+            PIECE_CELLS[piece.shape_key],
+            piece.rotation,
+            piece.x,
+            piece.y,
+            PIECE_CELLS[state.next_piece.shape_key],
+        )
+        start = offset + SLOT_HEADER.size
+        width = self.layout.width
+        for y, row in enumerate(state.board.grid):
+            buffer[start + y * width : start + (y + 1) * width] = row
+        struct.pack_into("<I", buffer, offset, seq + 1)
+
+
+def _eliminated_before(
+    buffer: memoryview, layout: BattleLayout, tick: int
+) -> List[bool]:
+    # Eliminations are stamped with their tick, so every worker reaches the
+    # same answer even while faster workers already publish the next tick.
+    out = []
+    for player in range(layout.players):
+        eliminated_at = struct.unpack_from(
+            "<I", buffer, layout.slot_offset(player) + 8
+        )[0]
+        out.append(0 < eliminated_at <= tick)
+    return out
+
+
+def _next_target(sender: int, eliminated: Sequence[bool]) -> Optional[int]:
+    players = len(eliminated)
+    for step in range(1, players):
+        target = (sender + step) % players
+        if not eliminated[target]:
+            return target
+    return None
+
+
+def _run_worker(
+    name: str,
+    layout: BattleLayout,
+    players: Sequence[int],
+    seeds: Sequence[int],
+    barrier: "multiprocessing.synchronize.Barrier",
+    max_ticks: int,
+) -> None:
+    memory = shared_memory.SharedMemory(name=name)
+    buffer = memory.buf
+    sides = [
+        _PlayerSide(player, layout, buffer, seed)
+        for player, seed in zip(players, seeds)
+    ]
+    try:
+        for side in sides:
+            side.publish(0)
+        barrier.wait()
+        eliminated = _eliminated_before(buffer, layout, 0)
+        for tick in range(1, max_ticks + 1):
+            for side in sides:
+                garbage = side.play_tick(tick)
+                target = _next_target(side.player, eliminated)
+                if garbage and target is not None:
+                    ring = GarbageRing(buffer, layout.ring_offset(side.player, target))
+                    ring.push(tick, garbage)
+            barrier.wait()
+            eliminated = _eliminated_before(buffer, layout, tick)
+            if layout.players - sum(eliminated) <= (1 if layout.players > 1 else 0):
+                break
+    except threading.BrokenBarrierError:
+        pass
+    finally:
+        memory.close()
+
+
+class BattleMatch:
+    def __init__(
+        self,
+        players: int,
+        width: int = BOARD_WIDTH,
+        height: int = BOARD_HEIGHT,
+        workers: Optional[int] = None,
+        seed: int = 0,
+        max_ticks: int = 10_000,
+    ) -> None:
+        self.layout = BattleLayout(players, width, height)
+        self.workers = max(1, min(players, workers or os.cpu_count() or 1))
+        self.seed = seed
+        self.max_ticks = max_ticks
+        self._memory = shared_memory.SharedMemory(
+            create=True, size=self.layout.total_size
+        )
+        self._memory.buf[:] = bytes(self.layout.total_size)
+        context = multiprocessing.get_context("spawn")
+        self._barrier = context.Barrier(self.workers)
+        self._last_snapshots: List[Optional[PlayerSnapshot]] = [None] * players
+        self._processes = []
+        for worker in range(self.workers):
+            hosted = list(range(worker, players, self.workers))
+            self._processes.append(
+                context.Process(
+                    target=_run_worker,
+                    args=(
+                        self._memory.name,
+                        self.layout,
+                        hosted,
+                        [seed * 1_000_003 + player for player in hosted],
+                        self._barrier,
+                        max_ticks,
+                    ),
+                    name=f"battle-worker-{worker}",
+                    daemon=True,
+                )
+            )
+
+    def start(self) -> None:
+        for process in self._processes:
+            process.start()
+
+    def running(self) -> bool:
+        return any(process.is_alive() for process in self._processes)
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        for process in self._processes:
+            process.join(timeout)
+
+    def snapshot(self, player: int) -> PlayerSnapshot:
+        buffer = self._memory.buf
+        layout = self.layout
+        offset = layout.slot_offset(player)
+        start = offset + SLOT_HEADER.size
+        size = layout.width * layout.height
+        consistent = False
+        for _ in range(SNAPSHOT_RETRIES):
+            fields = SLOT_HEADER.unpack_from(buffer, offset)
+            grid = bytes(buffer[start : start + size])
+            seq = struct.unpack_from("<I", buffer, offset)[0]
+            if fields[0] == seq and not seq & 1:
+                consistent = True
+                break
+            # A worker that died mid-publish leaves the seq odd for good.
+            if not self._processes[player % self.workers].is_alive():
+                break
+        last = self._last_snapshots[player]
+        if not consistent and last is not None:
+            return last
+        (
+            _,
+            tick,
+            eliminated_at,
+            score,
+            level,
+            lines,
+            pieces,
+            shape,
+            rotation,
+            x,
+            y,
+            next_shape,
+        ) = fields
+        snapshot = PlayerSnapshot(
+            tick=tick,
+            eliminated_at=eliminated_at,
+            score=score,
+            level=level,
+            lines=lines,
+            pieces=pieces,
+            shape=SHAPE_KEYS.get(shape, "I"),
+            rotation=rotation,
+            x=x,
+            y=y,
+            next_shape=SHAPE_KEYS.get(next_shape, "I"),
+            grid=grid,
+        )
+        if consistent:
+            self._last_snapshots[player] = snapshot
+        return snapshot
+
+    def snapshots(self) -> List[PlayerSnapshot]:
+        return [self.snapshot(player) for player in range(self.layout.players)]
+
+    def close(self) -> None:
+        if self.running():
+            self._barrier.abort()
+        self.join(5.0)
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+        self._memory.close()
+        self._memory.unlink()
+
+    def __enter__(self) -> "BattleMatch":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def load_snapshot(state: GameState, snapshot: PlayerSnapshot) -> None:
+    board = state.board
+    width = board.width
+    grid = snapshot.grid
+    for y in range(board.height):
+        board.grid[y][:] = grid[y * width : (y + 1) * width]
+    board.lines_cleared = snapshot.lines
+    board.revision = snapshot.tick
+    state.score = snapshot.score
+    state.level = snapshot.level
+    state.game_over = snapshot.eliminated_at > 0
+    piece = state.current_piece
+    piece.shape_key = snapshot.shape
+    piece.rotation = snapshot.rotation
+    piece.x = snapshot.x
+    piece.y = snapshot.y
+    state.next_piece.shape_key = snapshot.next_shape
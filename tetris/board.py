@@ -1,16 +1,29 @@
 import random
-from typing import List, Optional, Tuple
+from typing import List, Optional, Set, Tuple
 
-from .constants import BOARD_HEIGHT, BOARD_WIDTH, GARBAGE_COLOR, PIECE_COLORS
+from .constants import (
+    BOARD_HEIGHT,
+    BOARD_WIDTH,
+    CELL_COLORS,
+    EMPTY_CELL,
+    GARBAGE_CELL,
+    PIECE_CELLS,
+)
 from .pieces import Tetromino
 
 
 class Board:
-    def __init__(self) -> None:
-        self.grid: List[List[Optional[Tuple[int, int, int]]]] = [
-            [None for _ in range(BOARD_WIDTH)] for _ in range(BOARD_HEIGHT)
-        ]
+    __slots__ = ("width", "height", "grid", "lines_cleared", "last_cleared", "revision")
+
+    def __init__(self, width: int = BOARD_WIDTH, height: int = BOARD_HEIGHT) -> None:
+        if width < 4 or height < 4:
+            raise ValueError(f"Board must be at least 4x4, got {width}x{height}")
+        self.width = width
+        self.height = height
+        self.grid: List[bytearray] = [bytearray(width) for _ in range(height)]
         self.lines_cleared = 0
+        self.last_cleared: List[int] = []
+        self.revision = 0
 
     def valid(
         self,
@@ -19,47 +32,65 @@ class Board:
         dy: int = 0,
         rotation: Optional[int] = None,
     ) -> bool:
-        rot = piece._normalized_rotation(rotation)
-        for cx, cy in piece.cells(rot):
-            px = piece.x + cx + dx
-            py = piece.y + cy + dy
-            if px < 0 or px >= BOARD_WIDTH or py >= BOARD_HEIGHT:
+        width = self.width
+        height = self.height
+        grid = self.grid
+        x = piece.x + dx
+        y = piece.y + dy
+        for cx, cy in piece.cells(rotation):
+            px = x + cx
+            py = y + cy
+            if px < 0 or px >= width or py >= height:
                 return False
-            if py >= 0 and self.grid[py][px]:
+            if py >= 0 and grid[py][px]:
                 return False
         return True
 
     def lock_piece(self, piece: Tetromino) -> int:
+        cell = PIECE_CELLS[piece.shape_key]
+        touched: Set[int] = set()
         for cx, cy in piece.cells():
             px = piece.x + cx
             py = piece.y + cy
-            if 0 <= px < BOARD_WIDTH and 0 <= py < BOARD_HEIGHT:
-                self.grid[py][px] = PIECE_COLORS[piece.shape_key]
-        lines = self._clear_lines()
+            if 0 <= px < self.width and 0 <= py < self.height:
+                self.grid[py][px] = cell
+                touched.add(py)
+        lines = self._clear_lines(touched)
         self.lines_cleared += lines
+        self.revision += 1
         return lines
 
-    def _clear_lines(self) -> int:
-        new_grid = [row for row in self.grid if any(cell is None for cell in row)]
-        cleared = BOARD_HEIGHT - len(new_grid)
-        while len(new_grid) < BOARD_HEIGHT:
-            new_grid.insert(0, [None for _ in range(BOARD_WIDTH)])
-        self.grid = new_grid
-        return cleared
+    def _clear_lines(self, rows: Set[int]) -> int:
+        full = sorted((y for y in rows if EMPTY_CELL not in self.grid[y]), reverse=True)
+        self.last_cleared = full
+        for y in full:
+            del self.grid[y]
+        if full:
+            self.grid[0:0] = [bytearray(self.width) for _ in full]
+        return len(full)
 
     def occupied(self, x: int, y: int) -> bool:
         return (
-            0 <= x < BOARD_WIDTH
-            and 0 <= y < BOARD_HEIGHT
-            and self.grid[y][x] is not None
+            0 <= x < self.width
+            and 0 <= y < self.height
+            and self.grid[y][x] != EMPTY_CELL
         )
 
-    def add_garbage(self, lines: int) -> None:
+    def color_at(self, x: int, y: int) -> Optional[Tuple[int, int, int]]:
+        return CELL_COLORS[self.grid[y][x]]
+
+    def add_garbage(self, lines: int, rng: Optional[random.Random] = None) -> List[int]:
+        randrange = (rng or random).randrange
+        holes = []
         for _ in range(lines):
-            hole = random.randrange(BOARD_WIDTH)
-            garbage_row: List[Optional[Tuple[int, int, int]]] = [
-                GARBAGE_COLOR for _ in range(BOARD_WIDTH)
-            ]
-            garbage_row[hole] = None
-            self.grid.pop(0)
-            self.grid.append(garbage_row)
+            hole = randrange(self.width)
+            holes.append(hole)
+            self.add_garbage_row(hole)
+        return holes
+
+    def add_garbage_row(self, hole: int) -> None:
+        garbage_row = bytearray([GARBAGE_CELL]) * self.width
+        garbage_row[hole] = EMPTY_CELL
+        self.grid.pop(0)
+        self.grid.append(garbage_row)
+        self.revision += 1
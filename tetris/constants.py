@@ -6,7 +6,13 @@ BLOCK_SIZE = 32
 SIDE_PANEL = 200
 BOARD_PIXEL_WIDTH = BOARD_WIDTH * BLOCK_SIZE
 WINDOW_HEIGHT = BOARD_HEIGHT * BLOCK_SIZE
+MIN_WINDOW_HEIGHT = 480
 FPS = 60
+IDLE_WAIT_MS = 500
+
+BATTLE_PLAYERS = 16
+BATTLE_COLUMNS = 8
+BATTLE_WINDOW = (1280, 900)
 
 AUTO_REPEAT_INITIAL = 180
 AUTO_REPEAT_INTERVAL = 60
@@ -27,4 +33,13 @@ PIECE_COLORS = {
 
 GARBAGE_COLOR = (90, 90, 90)
 
+EMPTY_CELL = 0
+PIECE_CELLS = {key: idx + 1 for idx, key in enumerate(PIECE_COLORS)}
+GARBAGE_CELL = len(PIECE_CELLS) + 1
+CELL_COLORS = (None, *PIECE_COLORS.values(), GARBAGE_COLOR)
+
+ASSET_CACHE_DIR = Path.home() / ".cache" / "tetris"
+STATS_PATH = Path.home() / ".tetris" / "stats.sqlite3"
+QUICKSAVE_PATH = Path.home() / ".tetris" / "quicksave.bin"
+
 TRACK_PATH = Path(__file__).resolve().parent.parent / "assets" / "yi_jian_mei.mp3"
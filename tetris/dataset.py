@@ -0,0 +1,450 @@
+import argparse
+import bisect
+import mmap
+import os
+import queue
+import random
+import struct
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from .actions import hard_drop
+from .board import Board
+from .constants import BOARD_HEIGHT, BOARD_WIDTH, PIECE_CELLS
+from .events import GameListener
+from .pieces import Tetromino
+from .serialize import pack_occupancy
+from .state import GameState
+
+SHARD_MAGIC = b"TSMP"
+SHARD_VERSION = 2
+# magic, version, width, height, record size, samples, samples per block, blocks
+SHARD_HEADER = struct.Struct("<4sHHHHIHH")
+BLOCK_OFFSET = struct.Struct("<Q")
+# player, source, shape, next shape, rotation, x, y, lines, level, score;
+# the board bitset before the piece locked follows each sample.
+SAMPLE = struct.Struct("<BBBBBhhBHq")
+SOURCE_HUMAN = 0
+SOURCE_BOT = 1
+SHARD_SAMPLES = 8192
+BLOCK_SAMPLES = 64
+# Buffers queued for or held by the writer beyond the one being filled.
+SPARE_BUFFERS = 3
+COMPRESS_LEVEL = 6
+_BIT_VALUES = bytes.maketrans(b"01", b"\x00\x01")
+
+
+class Sample(NamedTuple):
+    player: int
+    source: int
+    shape: int
+    next_shape: int
+    rotation: int
+    x: int
+    y: int
+    lines: int
+    level: int
+    score: int
+    board: bytes
+
+
+def record_size(width: int, height: int) -> int:
+    return SAMPLE.size + (width * height + 7) // 8
+
+
+def occupancy_rows(bits: bytes, width: int, height: int) -> List[bytes]:
+    """Unpack a board bitset into rows of 0/1 bytes."""
+    cells = width * height
+    flat = format(int.from_bytes(bits, "big"), f"0{len(bits) * 8}b")[:cells]
+    values = flat.encode().translate(_BIT_VALUES)
+    return [values[row : row + width] for row in range(0, cells, width)]
+
+
+class SampleWriter:
+    """Packs placement samples into preallocated buffers; a thread writes shards.
+
+    Each full buffer becomes one shard of shard_samples records, split into
+    zlib blocks of block_samples so a reader can decompress just the block
+    it needs. If the writer falls SPARE_BUFFERS shards behind, the buffer
+    being filled is discarded and counted in dropped instead of blocking the
+    caller or growing memory.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        shard_samples: int = SHARD_SAMPLES,
+        block_samples: int = BLOCK_SAMPLES,
+        level: int = COMPRESS_LEVEL,
+    ) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+        self.shard_samples = shard_samples
+        self.block_samples = block_samples
+        self.level = level
+        self.shards: List[Path] = []
+        self.dropped = 0
+        self._prefix = time.strftime("samples-%Y%m%d-%H%M%S") + f"-{os.getpid()}"
+        self._dims = (0, 0)
+        self._record_size = 0
+        self._buffer = bytearray()
+        self._offset = 0
+        self._failed = False
+        self._pack = SAMPLE.pack_into
+        self._free: "queue.SimpleQueue[bytearray]" = queue.SimpleQueue()
+        self._full: "queue.SimpleQueue[Optional[Tuple[int, int, memoryview]]]" = (
+            queue.SimpleQueue()
+        )
+        self._writer = threading.Thread(
+            target=self._write_loop, name="sample-writer", daemon=True
+        )
+        self._writer.start()
+
+    def record(
+        self,
+        player: int,
+        source: int,
+        state: GameState,
+        piece: Tetromino,
+        lines: int,
+        board_bits: bytes,
+    ) -> None:
+        board = state.board
+        if (board.width, board.height) != self._dims:
+            self._switch(board)
+        offset = self._offset
+        self._pack(
+            self._buffer,
+            offset,
+            player,
+            source,
+            PIECE_CELLS[piece.shape_key],
+            PIECE_CELLS[state.next_piece.shape_key],
+            piece.rotation,
+            piece.x,
+            piece.y,
+            lines,
+            state.level,
+            state.score,
+        )
+        offset += self._record_size
+        self._buffer[offset - len(board_bits) : offset] = board_bits
+        if offset == len(self._buffer):
+            self._hand_off(offset)
+        else:
+            self._offset = offset
+
+    def _switch(self, board: Board) -> None:
+        if self._offset:
+            self._submit(self._offset)
+        self._dims = (board.width, board.height)
+        self._record_size = record_size(board.width, board.height)
+        size = self._record_size * self.shard_samples
+        self._buffer = bytearray(size)
+        for _ in range(SPARE_BUFFERS):
+            self._free.put(bytearray(size))
+
+    def flush(self) -> None:
+        if self._offset:
+            self._hand_off(self._offset)
+
+    def close(self) -> None:
+        if self._offset:
+            self._submit(self._offset)
+        self._full.put(None)
+        self._writer.join()
+
+    def _hand_off(self, length: int) -> None:
+        if self._failed:
+            self._offset = 0
+            return
+        buffer = self._take_free()
+        if buffer is None:
+            self.dropped += length // self._record_size
+            self._offset = 0
+            return
+        self._submit(length)
+        self._buffer = buffer
+
+    def _submit(self, length: int) -> None:
+        if not self._failed:
+            width, height = self._dims
+            self._full.put((width, height, memoryview(self._buffer)[:length]))
+        self._offset = 0
+
+    def _take_free(self) -> Optional[bytearray]:
+        size = len(self._buffer)
+        while True:
+            try:
+                buffer = self._free.get_nowait()
+            except queue.Empty:
+                return None
+            # Buffers sized for earlier board dimensions are let go.
+            if len(buffer) == size:
+                return buffer
+
+    def _write_loop(self) -> None:
+        index = 0
+        while True:
+            item = self._full.get()
+            if item is None:
+                break
+            width, height, chunk = item
+            if not self._failed:
+                path = self.directory / f"{self._prefix}-{index:05d}.tsd"
+                try:
+                    write_shard(
+                        path, width, height, chunk, self.block_samples, self.level
+                    )
+                    self.shards.append(path)
+                    index += 1
+                except OSError as exc:
+                    print(f"Training samples disabled: {exc}")
+                    self._failed = True
+            buffer = chunk.obj
+            chunk.release()
+            self._free.put(buffer)
+
+
+def write_shard(
+    path: Path,
+    width: int,
+    height: int,
+    records: memoryview,
+    block_samples: int = BLOCK_SAMPLES,
+    level: int = COMPRESS_LEVEL,
+) -> None:
+    size = record_size(width, height)
+    samples = len(records) // size
+    block_bytes = block_samples * size
+    blocks = [
+        zlib.compress(records[start : start + block_bytes], level)
+        for start in range(0, len(records), block_bytes)
+    ]
+    offset = SHARD_HEADER.size + BLOCK_OFFSET.size * (len(blocks) + 1)
+    offsets = []
+    for block in blocks:
+        offsets.append(offset)
+        offset += len(block)
+    offsets.append(offset)
+    partial = path.with_suffix(".tmp")
+    with partial.open("wb") as handle:
+        handle.write(
+            SHARD_HEADER.pack(
+                SHARD_MAGIC,
+                SHARD_VERSION,
+                width,
+                height,
+                size,
+                samples,
+                block_samples,
+                len(blocks),
+            )
+        )
+        handle.write(b"".join(BLOCK_OFFSET.pack(value) for value in offsets))
+        handle.writelines(blocks)
+    os.replace(partial, path)
+
+
+class SampleListener(GameListener):
+    """Turns one player's locks into samples, paired with the board they landed on."""
+
+    def __init__(self, writer: SampleWriter, player: int, source: int) -> None:
+        self.writer = writer
+        self.player = player
+        self.source = source
+        self._board = b""
+
+    def on_game_start(self, state: GameState) -> None:
+        self._board = pack_occupancy(state.board)
+
+    def on_spawn(self, state: GameState) -> None:
+        self._board = pack_occupancy(state.board)
+
+    def on_garbage_applied(self, state: GameState, holes: Sequence[int]) -> None:
+        self._board = pack_occupancy(state.board)
+
+    def on_lock(self, state: GameState, piece: Tetromino, lines: int) -> None:
+        self.writer.record(self.player, self.source, state, piece, lines, self._board)
+
+
+def attach_samples(
+    state: GameState, writer: SampleWriter, player: int, source: int
+) -> None:
+    listener = SampleListener(writer, player, source)
+    state.events.subscribe(listener)
+    listener.on_game_start(state)
+
+
+class SampleShard:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            version,
+            self.width,
+            self.height,
+            self.record_size,
+            self.samples,
+            self.block_samples,
+            blocks,
+        ) = SHARD_HEADER.unpack_from(self._map)
+        if magic != SHARD_MAGIC or version != SHARD_VERSION:
+            raise ValueError(f"{path} is not a v{SHARD_VERSION} sample shard")
+        if self.record_size != record_size(self.width, self.height):
+            raise ValueError(f"{path} has a bad record size")
+        self.offsets = [
+            BLOCK_OFFSET.unpack_from(self._map, SHARD_HEADER.size + idx * 8)[0]
+            for idx in range(blocks + 1)
+        ]
+
+    def block(self, index: int) -> bytes:
+        return zlib.decompress(self._map[self.offsets[index] : self.offsets[index + 1]])
+
+    def close(self) -> None:
+        self._map.close()
+
+
+class SampleDataset:
+    """Random access over every shard in a directory.
+
+    Shards are memory-mapped; a lookup inflates only the block holding the
+    sample and keeps the most recent cache_blocks blocks.
+    """
+
+    def __init__(self, directory: Path, cache_blocks: int = 64) -> None:
+        self.shards = [SampleShard(path) for path in sorted(directory.glob("*.tsd"))]
+        self.starts: List[int] = []
+        total = 0
+        for shard in self.shards:
+            self.starts.append(total)
+            total += shard.samples
+        self.total = total
+        self.cache_blocks = cache_blocks
+        self._cache: "OrderedDict[Tuple[int, int], bytes]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return self.total
+
+    def __getitem__(self, index: int) -> Sample:
+        if not 0 <= index < self.total:
+            raise IndexError(index)
+        shard_index = bisect.bisect_right(self.starts, index) - 1
+        shard = self.shards[shard_index]
+        block_index, row = divmod(index - self.starts[shard_index], shard.block_samples)
+        return self._read(shard_index, block_index, row)
+
+    def _read(self, shard_index: int, block_index: int, row: int) -> Sample:
+        key = (shard_index, block_index)
+        block = self._cache.get(key)
+        if block is None:
+            block = self.shards[shard_index].block(block_index)
+            self._cache[key] = block
+            if len(self._cache) > self.cache_blocks:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        size = self.shards[shard_index].record_size
+        offset = row * size
+        return Sample(
+            *SAMPLE.unpack_from(block, offset),
+            block[offset + SAMPLE.size : offset + size],
+        )
+
+    def sample(self, count: int, rng: random.Random) -> List[Sample]:
+        # Sorted so every block in the batch is inflated once.
+        indices = sorted(rng.randrange(self.total) for _ in range(count))
+        batch = [self[index] for index in indices]
+        rng.shuffle(batch)
+        return batch
+
+    def dimensions(self, index: int) -> Tuple[int, int]:
+        shard = self.shards[bisect.bisect_right(self.starts, index) - 1]
+        return shard.width, shard.height
+
+    def close(self) -> None:
+        for shard in self.shards:
+            shard.close()
+
+
+def generate_bot_games(
+    writer: SampleWriter, games: int, width: int, height: int, seed: int
+) -> int:
+    from .battle import choose_placement
+
+    pieces = 0
+    for game in range(games):
+        state = GameState(width, height, seed=seed + game)
+        attach_samples(state, writer, 0, SOURCE_BOT)
+        while not state.game_over:
+            placement = choose_placement(state)
+            if placement is None:
+                break
+            piece = state.current_piece
+            piece.rotation = placement.rotation
+            piece.x = placement.x
+            piece.y = placement.y
+            hard_drop(state)
+            pieces += 1
+    return pieces
+
+
+def summarize(directory: Path) -> None:
+    dataset = SampleDataset(directory)
+    by_source: Dict[int, int] = {}
+    size = 0
+    for shard in dataset.shards:
+        size += shard.path.stat().st_size
+    for index in range(0, len(dataset), max(1, len(dataset) // 1000)):
+        source = dataset[index].source
+        by_source[source] = by_source.get(source, 0) + 1
+    print(
+        f"{len(dataset)} samples in {len(dataset.shards)} shards, "
+        f"{size / max(1, len(dataset)):.1f} bytes/sample on disk"
+    )
+    names = {SOURCE_HUMAN: "human", SOURCE_BOT: "bot"}
+    for source, count in sorted(by_source.items()):
+        print(f"  {names.get(source, source)}: ~{count / sum(by_source.values()):.0%}")
+    dataset.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m tetris.dataset", description="Placement training samples"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    generate = commands.add_parser("generate", help="record bot games as samples")
+    generate.add_argument("directory", type=Path)
+    generate.add_argument("--games", type=int, default=10)
+    generate.add_argument("--width", type=int, default=BOARD_WIDTH)
+    generate.add_argument("--height", type=int, default=BOARD_HEIGHT)
+    generate.add_argument("--seed", type=int, default=0)
+    info = commands.add_parser("info", help="summarize a sample directory")
+    info.add_argument("directory", type=Path)
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        writer = SampleWriter(args.directory)
+        pieces = generate_bot_games(
+            writer, args.games, args.width, args.height, args.seed
+        )
+        writer.close()
+        print(
+            f"{pieces - writer.dropped} samples from {args.games} games "
+            f"({writer.dropped} dropped)"
+        )
+    else:
+        if not any(args.directory.glob("*.tsd")):
+            sys.exit(f"No shards in {args.directory}")
+        summarize(args.directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set, Tuple
+
+from .actions import hard_drop, move_piece, rotate_piece
+from .constants import BOARD_HEIGHT, BOARD_WIDTH, PIECE_CELLS
+from .features import BoardFeatures
+from .pieces import TETROMINO_SHAPES
+from .state import GameState
+
+PRIMITIVE_ACTIONS = (
+    "left",
+    "right",
+    "soft_drop",
+    "rotate_cw",
+    "rotate_ccw",
+    "hard_drop",
+)
+MAX_ROTATIONS = max(len(layouts) for layouts in TETROMINO_SHAPES.values())
+# Leftmost x a piece can occupy: layouts leave up to three empty columns.
+PLACEMENT_X_OFFSET = 3
+
+
+@dataclass
+class Observation:
+    grid: memoryview
+    heights: array
+    holes: array
+    wells: array
+    row_transitions: array
+    # current shape, rotation, x, y, next shape
+    pieces: array
+    # total holes, bumpiness, max well depth, total row transitions
+    summary: array
+
+
+class TetrisEnv:
+    def __init__(
+        self,
+        width: int = BOARD_WIDTH,
+        height: int = BOARD_HEIGHT,
+        action_mode: str = "placement",
+        gravity_interval: int = 4,
+        max_steps: Optional[int] = None,
+    ) -> None:
+        if action_mode not in ("placement", "primitive"):
+            raise ValueError(f"Unknown action mode: {action_mode}")
+        self.width = width
+        self.height = height
+        self.action_mode = action_mode
+        self.gravity_interval = gravity_interval
+        self.max_steps = max_steps
+        self.state = GameState(width, height)
+        self.features = BoardFeatures(self.state.board)
+        self.steps = 0
+        self._pieces = array("i", [0] * 5)
+        self._summary = array("i", [0] * 4)
+        self.observation = Observation(
+            grid=memoryview(self.features.occupancy),
+            heights=self.features.heights,
+            holes=self.features.holes,
+            wells=self.features.wells,
+            row_transitions=self.features.row_transitions,
+            pieces=self._pieces,
+            summary=self._summary,
+        )
+
+    @property
+    def action_count(self) -> int:
+        if self.action_mode == "primitive":
+            return len(PRIMITIVE_ACTIONS)
+        return MAX_ROTATIONS * (self.width + PLACEMENT_X_OFFSET)
+
+    def reset(self, seed: Optional[int] = None) -> Tuple[Observation, Dict[str, Any]]:
+        self.state.reset(seed)
+        self.features.refresh(self.state.board)
+        self.steps = 0
+        self._update_observation()
+        return self.observation, {}
+
+    def step(
+        self, action: int
+    ) -> Tuple[Observation, float, bool, bool, Dict[str, Any]]:
+        state = self.state
+        if state.game_over:
+            raise RuntimeError("step() called after the episode ended; call reset()")
+        score = state.score
+        piece = state.current_piece
+        info: Dict[str, Any] = {}
+        if self.action_mode == "placement":
+            info["valid"] = self._place(action)
+            lines = hard_drop(state)
+            locked = True
+        else:
+            lines, locked = self._primitive(action)
+        if locked:
+            self.features.on_lock(piece, state.board.last_cleared)
+            info["lines"] = lines
+        self.steps += 1
+        self._update_observation()
+        truncated = self.max_steps is not None and self.steps >= self.max_steps
+        return (
+            self.observation,
+            float(state.score - score),
+            state.game_over,
+            truncated,
+            info,
+        )
+
+    def valid_placements(self) -> Set[int]:
+        state = self.state
+        piece = state.current_piece
+        rotations = len(TETROMINO_SHAPES[piece.shape_key])
+        stride = self.width + PLACEMENT_X_OFFSET
+        valid = set()
+        for rotation in range(rotations):
+            for slot in range(stride):
+                dx = slot - PLACEMENT_X_OFFSET - piece.x
+                if state.board.valid(piece, dx=dx, rotation=rotation):
+                    valid.add(rotation * stride + slot)
+        return valid
+
+    def _place(self, action: int) -> bool:
+        stride = self.width + PLACEMENT_X_OFFSET
+        rotation, slot = divmod(action, stride)
+        piece = self.state.current_piece
+        rotation %= len(TETROMINO_SHAPES[piece.shape_key])
+        dx = slot - PLACEMENT_X_OFFSET - piece.x
+        if not self.state.board.valid(piece, dx=dx, rotation=rotation):
+            return False
+        piece.rotation = rotation
+        piece.x += dx
+        return True
+
+    def _primitive(self, action: int) -> Tuple[int, bool]:
+        state = self.state
+        name = PRIMITIVE_ACTIONS[action]
+        if name == "hard_drop":
+            return hard_drop(state), True
+        if name == "left":
+            move_piece(state, dx=-1)
+        elif name == "right":
+            move_piece(state, dx=1)
+        elif name == "rotate_cw":
+            rotate_piece(state, 1)
+        elif name == "rotate_ccw":
+            rotate_piece(state, -1)
+        gravity = name == "soft_drop" or (self.steps + 1) % self.gravity_interval == 0
+        if gravity and not move_piece(state, dy=1):
+            lines = state.lock_piece()
+            state.spawn_next()
+            return lines, True
+        return 0, False
+
+    def _update_observation(self) -> None:
+        state = self.state
+        features = self.features
+        piece = state.current_piece
+        pieces = self._pieces
+        pieces[0] = PIECE_CELLS[piece.shape_key]
+        pieces[1] = piece.rotation
+        pieces[2] = piece.x
+        pieces[3] = piece.y
+        pieces[4] = PIECE_CELLS[state.next_piece.shape_key]
+        features.update_wells()
+        summary = self._summary
+        summary[0] = features.total_holes
+        summary[1] = features.bumpiness
+        summary[2] = max(features.wells)
+        summary[3] = sum(features.row_transitions)
@@ -0,0 +1,153 @@
+import weakref
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from .pieces import Tetromino
+
+if TYPE_CHECKING:
+    from .state import GameState
+
+# Parameters each event passes to its handlers, after the GameState.
+EVENT_PARAMETERS: Dict[str, Tuple[str, ...]] = {
+    "game_start": (),
+    "spawn": (),
+    "move": ("dx", "dy"),
+    "rotate": ("direction",),
+    "lock": ("piece", "lines"),
+    "line_clear": ("rows",),
+    "garbage_queued": ("lines", "source"),
+    "garbage_applied": ("holes",),
+    "level_change": ("level",),
+    "game_over": (),
+}
+
+
+class GameListener:
+    """Base class for event subscribers; only overridden methods are hooked up."""
+
+    def on_game_start(self, state: "GameState") -> None:
+        pass
+
+    def on_spawn(self, state: "GameState") -> None:
+        pass
+
+    def on_move(self, state: "GameState", dx: int, dy: int) -> None:
+        pass
+
+    def on_rotate(self, state: "GameState", direction: int) -> None:
+        pass
+
+    def on_lock(self, state: "GameState", piece: Tetromino, lines: int) -> None:
+        pass
+
+    def on_line_clear(self, state: "GameState", rows: List[int]) -> None:
+        pass
+
+    def on_garbage_queued(self, state: "GameState", lines: int, source: int) -> None:
+        pass
+
+    def on_garbage_applied(self, state: "GameState", holes: List[int]) -> None:
+        pass
+
+    def on_level_change(self, state: "GameState", level: int) -> None:
+        pass
+
+    def on_game_over(self, state: "GameState") -> None:
+        pass
+
+
+_dispatchers: Dict[Tuple[str, int], Callable[..., Callable[..., None]]] = {}
+
+
+def _dispatcher_factory(event: str, count: int) -> Callable[..., Callable[..., None]]:
+    # Generates a function that calls each handler in turn with the event's
+    # exact signature, so fan-out costs no *args tuple or loop.
+    key = (event, count)
+    factory = _dispatchers.get(key)
+    if factory is None:
+        params = ", ".join(("state",) + EVENT_PARAMETERS[event])
+        handlers = ", ".join(f"h{idx}" for idx in range(count))
+        calls = "".join(f"        h{idx}({params})\n" for idx in range(count))
+        source = (
+            f"def factory({handlers}):\n"
+            f"    def dispatch({params}):\n{calls}"
+            f"    return dispatch\n"
+        )
+        namespace: Dict[str, Callable[..., Callable[..., None]]] = {}
+        exec(source, namespace)
+        factory = _dispatchers[key] = namespace["factory"]
+    return factory
+
+
+class EventBus:
+    """Per-event dispatch slots that are None when nothing listens.
+
+    Emitters check the slot before building arguments, so an event without
+    subscribers costs one attribute load and comparison.
+    """
+
+    __slots__ = (
+        *EVENT_PARAMETERS,
+        "parent",
+        "_listeners",
+        "_children",
+        "__weakref__",
+    )
+
+    game_start: Optional[Callable[["GameState"], None]]
+    spawn: Optional[Callable[["GameState"], None]]
+    move: Optional[Callable[["GameState", int, int], None]]
+    rotate: Optional[Callable[["GameState", int], None]]
+    lock: Optional[Callable[["GameState", Tetromino, int], None]]
+    line_clear: Optional[Callable[["GameState", List[int]], None]]
+    garbage_queued: Optional[Callable[["GameState", int, int], None]]
+    garbage_applied: Optional[Callable[["GameState", List[int]], None]]
+    level_change: Optional[Callable[["GameState", int], None]]
+    game_over: Optional[Callable[["GameState"], None]]
+
+    def __init__(self, parent: Optional["EventBus"] = None) -> None:
+        self.parent = parent
+        self._listeners: List[GameListener] = []
+        # Only buses that have children pay for the WeakSet.
+        self._children: Optional["weakref.WeakSet[EventBus]"] = None
+        if parent is not None:
+            if parent._children is None:
+                parent._children = weakref.WeakSet()
+            parent._children.add(self)
+        self._compile()
+
+    def subscribe(self, listener: GameListener) -> None:
+        self._listeners.append(listener)
+        self._compile()
+
+    def unsubscribe(self, listener: GameListener) -> None:
+        self._listeners.remove(listener)
+        self._compile()
+
+    def listeners(self) -> List[GameListener]:
+        inherited = self.parent.listeners() if self.parent is not None else []
+        return inherited + self._listeners
+
+    def _compile(self) -> None:
+        listeners = self.listeners()
+        for event in EVENT_PARAMETERS:
+            method = f"on_{event}"
+            base = getattr(GameListener, method)
+            handlers = [
+                getattr(listener, method)
+                for listener in listeners
+                if getattr(type(listener), method) is not base
+            ]
+            if not handlers:
+                setattr(self, event, None)
+            elif len(handlers) == 1:
+                setattr(self, event, handlers[0])
+            else:
+                setattr(
+                    self, event, _dispatcher_factory(event, len(handlers))(*handlers)
+                )
+        if self._children is not None:
+            for child in list(self._children):
+                child._compile()
+
+
+GLOBAL_EVENTS = EventBus()
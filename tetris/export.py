@@ -0,0 +1,298 @@
+import argparse
+import io
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from multiprocessing import Pool
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame  # noqa: E402
+
+from .constants import BLOCK_SIZE, SIDE_PANEL  # noqa: E402
+from .render import PlayerView, draw, frame_key, panel_height  # noqa: E402
+from .replay import (  # noqa: E402
+    RecordPosition,
+    apply_record,
+    iter_session,
+    telemetry_sessions,
+)
+from .state import GameState  # noqa: E402
+from .telemetry import TelemetryEvent  # noqa: E402
+
+FORMATS = ("png", "raw")
+
+
+@dataclass(frozen=True)
+class ExportLayout:
+    players: int
+    width: int
+    height: int
+    block_size: int
+
+    @property
+    def spacing(self) -> int:
+        return self.width * self.block_size + SIDE_PANEL + 40
+
+    @property
+    def frame_size(self) -> Tuple[int, int]:
+        board_width = self.width * self.block_size + SIDE_PANEL
+        if self.players == 1:
+            frame_width = board_width + 60
+        else:
+            frame_width = self.players * board_width + 100
+        return frame_width, panel_height(self.height, self.block_size)
+
+
+@dataclass(frozen=True)
+class ChunkTask:
+    paths: Tuple[Path, ...]
+    position: Optional[RecordPosition]
+    states: bytes
+    first_frame: int
+    frame_count: int
+    start_ns: int
+    fps: int
+    layout: ExportLayout
+    image_format: str
+    output: Path
+
+
+def frame_time(task: ChunkTask, frame: int) -> int:
+    return task.start_ns + frame * 1_000_000_000 // task.fps
+
+
+def scan_session(paths: Sequence[Path]) -> Tuple[int, int, int, int, int]:
+    first_ns = last_ns = 0
+    players = 0
+    width = height = 0
+    for _, record in iter_session(paths):
+        if not first_ns:
+            first_ns = record.timestamp_ns
+        last_ns = record.timestamp_ns
+        players = max(players, record.player + 1)
+        if record.event == TelemetryEvent.GAME_START and not width:
+            width, height = record.extra >> 16, record.extra & 0xFFFF
+    return first_ns, last_ns, players, width, height
+
+
+def plan_chunks(
+    paths: Sequence[Path],
+    start_ns: int,
+    frames: int,
+    fps: int,
+    chunk_frames: int,
+    layout: ExportLayout,
+    image_format: str,
+    output: Path,
+) -> Iterator[ChunkTask]:
+    # One fast replay without rendering; each chunk gets a pickled snapshot
+    # of every player's state and the record position to resume from.
+    states: Dict[int, GameState] = {}
+    position: Optional[RecordPosition] = None
+    records = iter_session(paths)
+    pending = next(records, None)
+    for first_frame in range(0, frames, chunk_frames):
+        boundary = start_ns + first_frame * 1_000_000_000 // fps
+        while pending is not None and pending[1].timestamp_ns <= boundary:
+            apply_record(states, pending[1])
+            pending = next(records, None)
+        position = pending[0] if pending is not None else None
+        yield ChunkTask(
+            paths=tuple(paths),
+            position=position,
+            states=pickle.dumps(states),
+            first_frame=first_frame,
+            frame_count=min(chunk_frames, frames - first_frame),
+            start_ns=start_ns,
+            fps=fps,
+            layout=layout,
+            image_format=image_format,
+            output=output,
+        )
+
+
+_fonts: Optional[Tuple[pygame.font.Font, pygame.font.Font]] = None
+
+
+def render_chunk(task: ChunkTask) -> Tuple[int, Optional[Path]]:
+    global _fonts
+    if _fonts is None:
+        pygame.font.init()
+        _fonts = (pygame.font.Font(None, 32), pygame.font.Font(None, 24))
+    font, small_font = _fonts
+    layout = task.layout
+    surface = pygame.Surface(layout.frame_size)
+    states: Dict[int, GameState] = pickle.loads(task.states)
+    records = (
+        iter_session(task.paths, task.position)
+        if task.position is not None
+        else iter(())
+    )
+    pending = next(records, None)
+
+    chunk_path: Optional[Path] = None
+    raw: Optional[BinaryIO] = None
+    if task.image_format == "raw":
+        chunk_path = task.output / f"chunk-{task.first_frame:08d}.raw"
+        raw = chunk_path.open("wb")
+    drawn: Optional[List[Tuple]] = None
+    encoded = b""
+    try:
+        for frame in range(task.first_frame, task.first_frame + task.frame_count):
+            until = frame_time(task, frame)
+            while pending is not None and pending[1].timestamp_ns <= until:
+                apply_record(states, pending[1])
+                pending = next(records, None)
+            players = sorted(states.items())
+            key = [(player, frame_key(state)) for player, state in players]
+            if key != drawn:
+                views = [
+                    PlayerView(
+                        state=state,
+                        label=f"Player {player + 1}",
+                        origin=(20 + player * layout.spacing, 0),
+                        controls=(),
+                        block_size=layout.block_size,
+                    )
+                    for player, state in players
+                ]
+                draw(surface, views, font, small_font)
+                drawn = key
+                if raw is not None:
+                    encoded = pygame.image.tobytes(surface, "RGB")
+                else:
+                    buffer = io.BytesIO()
+                    pygame.image.save(surface, buffer, "frame.png")
+                    encoded = buffer.getvalue()
+            if raw is not None:
+                raw.write(encoded)
+            else:
+                (task.output / f"frame-{frame:06d}.png").write_bytes(encoded)
+    finally:
+        if raw is not None:
+            raw.close()
+    return task.frame_count, chunk_path
+
+
+def export_session(
+    paths: Sequence[Path],
+    output: Path,
+    image_format: str = "png",
+    fps: int = 30,
+    start: float = 0.0,
+    duration: Optional[float] = None,
+    block_size: int = BLOCK_SIZE,
+    chunk_frames: int = 150,
+    workers: Optional[int] = None,
+    sink: Optional[BinaryIO] = None,
+) -> Tuple[int, Tuple[int, int]]:
+    first_ns, last_ns, players, width, height = scan_session(paths)
+    if not width:
+        raise ValueError("session has no recorded games")
+    layout = ExportLayout(max(1, players), width, height, block_size)
+    start_ns = first_ns + int(start * 1e9)
+    end_ns = (
+        last_ns if duration is None else min(last_ns, start_ns + int(duration * 1e9))
+    )
+    frames = max(0, (end_ns - start_ns) * fps // 1_000_000_000 + 1)
+
+    workers = workers or os.cpu_count() or 1
+    scratch = Path(tempfile.mkdtemp(prefix="tetris-export-")) if sink else output
+    scratch.mkdir(parents=True, exist_ok=True)
+    tasks = plan_chunks(
+        paths, start_ns, frames, fps, chunk_frames, layout, image_format, scratch
+    )
+    written = 0
+    try:
+        with Pool(workers) as pool:
+            # Workers write frames to disk and return only paths, in frame
+            # order, so memory stays flat however long the session is.
+            for count, chunk_path in pool.imap(render_chunk, tasks):
+                written += count
+                if chunk_path is not None and sink is not None:
+                    with chunk_path.open("rb") as chunk:
+                        shutil.copyfileobj(chunk, sink, 1 << 20)
+                    chunk_path.unlink()
+    finally:
+        if sink is not None:
+            shutil.rmtree(scratch, ignore_errors=True)
+    return written, layout.frame_size
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m tetris.export",
+        description="Render recorded telemetry sessions to PNG frames or raw video",
+    )
+    parser.add_argument("logs", type=Path, help="telemetry directory")
+    parser.add_argument("--session", help="session prefix (default: latest)")
+    parser.add_argument("--format", choices=FORMATS, default="png")
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        required=True,
+        help="frame directory for png, file or - for raw rgb24 video",
+    )
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--start", type=float, default=0.0, help="seconds")
+    parser.add_argument("--duration", type=float, help="seconds")
+    parser.add_argument("--block-size", type=int, default=BLOCK_SIZE)
+    parser.add_argument("--chunk-frames", type=int, default=150)
+    parser.add_argument("--workers", type=int)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    sessions = telemetry_sessions(args.logs)
+    if not sessions:
+        sys.exit(f"No telemetry files in {args.logs}")
+    name = args.session or max(sessions)
+    if name not in sessions:
+        sys.exit(f"Unknown session {name}; have {', '.join(sorted(sessions))}")
+
+    sink: Optional[BinaryIO] = None
+    if args.format == "raw":
+        sink = sys.stdout.buffer if str(args.output) == "-" else args.output.open("wb")
+    start = time.perf_counter()
+    try:
+        frames, (width, height) = export_session(
+            sessions[name],
+            args.output,
+            args.format,
+            args.fps,
+            args.start,
+            args.duration,
+            args.block_size,
+            args.chunk_frames,
+            args.workers,
+            sink,
+        )
+    finally:
+        if sink is not None and sink is not sys.stdout.buffer:
+            sink.close()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{frames} frames ({width}x{height}) in {elapsed:.2f} s, "
+        f"{frames / elapsed:.1f} frames/s",
+        file=sys.stderr,
+    )
+    if args.format == "raw":
+        print(
+            f"ffmpeg -f rawvideo -pix_fmt rgb24 -s {width}x{height} "
+            f"-r {args.fps} -i {args.output} clip.mp4",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    main()
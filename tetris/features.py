@@ -0,0 +1,123 @@
+from array import array
+from typing import Iterable, List, Set
+
+from .board import Board
+from .pieces import Tetromino
+
+
+class BoardFeatures:
+    def __init__(self, board: Board) -> None:
+        self.width = board.width
+        self.height = board.height
+        self.occupancy = bytearray(board.width * board.height)
+        self.heights = array("i", [0] * board.width)
+        self.holes = array("i", [0] * board.width)
+        self.wells = array("i", [0] * board.width)
+        self.row_transitions = array("i", [2] * board.height)
+        self.refresh(board)
+
+    def refresh(self, board: Board) -> None:
+        width = self.width
+        occupancy = self.occupancy
+        for y, row in enumerate(board.grid):
+            occupancy[y * width : (y + 1) * width] = bytes(
+                1 if cell else 0 for cell in row
+            )
+            self.row_transitions[y] = self._row_transitions(y)
+        for x in range(width):
+            self._refresh_column(x)
+
+    def on_lock(self, piece: Tetromino, cleared: List[int]) -> None:
+        width = self.width
+        height = self.height
+        occupancy = self.occupancy
+        heights = self.heights
+        holes = self.holes
+        rows: Set[int] = set()
+        cells = sorted(
+            ((piece.x + cx, piece.y + cy) for cx, cy in piece.cells()),
+            key=lambda cell: -cell[1],
+        )
+        for x, y in cells:
+            if not (0 <= x < width and 0 <= y < height):
+                continue
+            occupancy[y * width + x] = 1
+            rows.add(y)
+            top = height - heights[x]
+            if y > top:
+                holes[x] -= 1
+            else:
+                holes[x] += top - y - 1
+                heights[x] = height - y
+        if not cleared:
+            for y in rows:
+                self.row_transitions[y] = self._row_transitions(y)
+            return
+        self._remove_rows(cleared, rows)
+
+    def _remove_rows(self, cleared: List[int], touched: Iterable[int]) -> None:
+        width = self.width
+        height = self.height
+        occupancy = self.occupancy
+        transitions = self.row_transitions
+        tops = [height - h for h in self.heights]
+        empty_row = bytes(width)
+        # Shift in place: observers may hold memoryviews of these buffers.
+        for y in sorted(cleared):
+            occupancy[width : (y + 1) * width] = occupancy[0 : y * width]
+            occupancy[0:width] = empty_row
+            transitions[1 : y + 1] = transitions[0:y]
+            transitions[0] = 2
+        count = len(cleared)
+        cleared_rows = set(cleared)
+        for y in touched:
+            if y in cleared_rows:
+                continue
+            shifted = y + sum(1 for row in cleared if row > y)
+            transitions[shifted] = self._row_transitions(shifted)
+        for x in range(width):
+            if tops[x] in cleared_rows:
+                self._refresh_column(x)
+            else:
+                self.heights[x] -= count
+
+    def _refresh_column(self, x: int) -> None:
+        width = self.width
+        occupancy = self.occupancy
+        column = occupancy[x::width]
+        top = column.find(1)
+        if top < 0:
+            self.heights[x] = 0
+            self.holes[x] = 0
+            return
+        self.heights[x] = self.height - top
+        self.holes[x] = column.count(0, top)
+
+    def _row_transitions(self, y: int) -> int:
+        row = self.occupancy[y * self.width : (y + 1) * self.width]
+        transitions = 0
+        previous = 1
+        for cell in row:
+            if cell != previous:
+                transitions += 1
+            previous = cell
+        return transitions + (previous == 0)
+
+    @property
+    def total_holes(self) -> int:
+        return sum(self.holes)
+
+    @property
+    def bumpiness(self) -> int:
+        heights = self.heights
+        return sum(abs(heights[x] - heights[x + 1]) for x in range(self.width - 1))
+
+    def update_wells(self) -> array:
+        heights = self.heights
+        wells = self.wells
+        last = self.width - 1
+        for x in range(self.width):
+            left = heights[x - 1] if x > 0 else self.height
+            right = heights[x + 1] if x < last else self.height
+            wells[x] = max(0, min(left, right) - heights[x])
+        return wells
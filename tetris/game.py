@@ -1,31 +1,93 @@
-from dataclasses import dataclass
+import dataclasses
+import sqlite3
+import time
+from dataclasses import dataclass, field
 from enum import Enum, auto
+from pathlib import Path
 from typing import Dict, List, Optional, Sequence, Tuple
 
 import pygame
 
 from .actions import move_piece, rotate_piece
-from .audio import AudioManager
+from .assets import AssetBundle, TextLabel, load_bundle
+from .audio import SOUND_EFFECTS, AudioManager, sine_pcm
+from .battle import BattleMatch, load_snapshot
 from .constants import (
     AUTO_REPEAT_INITIAL,
     AUTO_REPEAT_INTERVAL,
-    BOARD_PIXEL_WIDTH,
+    BATTLE_PLAYERS,
+    BLOCK_SIZE,
+    BOARD_HEIGHT,
+    BOARD_WIDTH,
+    BATTLE_COLUMNS,
+    BATTLE_WINDOW,
     FPS,
+    IDLE_WAIT_MS,
+    PIECE_COLORS,
+    QUICKSAVE_PATH,
     SIDE_PANEL,
-    WINDOW_HEIGHT,
 )
 from .controls import InputMapping, handle_key_down
-from .render import PlayerView, draw
-from .state import GameState
+from .dataset import SOURCE_HUMAN, SampleWriter, attach_samples
+from .render import (
+    PlayerView,
+    PygameRenderer,
+    TileSet,
+    draw_board,
+    draw_piece,
+    frame_key,
+    panel_height,
+)
+from .present import BUFFERING_MODES, RenderThread
+from .profiler import FRAME_BUDGET_MS, SlowFrameProfiler
+from .serialize import AutoSave, load_state_file
+from .state import GameState, drop_delay_for_level
+from .stats import HighScore, SessionRecord, StatsStore
+from .telemetry import Telemetry
+from .view import Renderer
+
+MENU_HIGH_SCORES = 5
+
+ARROW_CONTROLS = (
+    "←/→ move",
+    "↓ soft drop",
+    "↑ rotate, Z ccw",
+    "Space hard drop",
+    "R restart",
+    "Esc menu",
+)
+WASD_CONTROLS = (
+    "A/D move",
+    "S soft drop",
+    "W rotate, Q ccw",
+    "Left Shift hard drop",
+    "R restart",
+    "Esc menu",
+)
+PLAYER_LABELS = ("Player 1", "Player 1 (WASD)", "Player 2 (Arrows)")
+REDRAW_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED)
 
 
 class GameMode(Enum):
     SINGLE = auto()
     MULTI = auto()
+    BATTLE = auto()
+    RESUME = auto()
+
 
+@dataclass(frozen=True)
+class BoardConfig:
+    width: int = BOARD_WIDTH
+    height: int = BOARD_HEIGHT
+    block_size: int = BLOCK_SIZE
 
-def drop_delay_for_level(level: int) -> int:
-    return max(100, 800 - (level - 1) * 60)
+    @property
+    def pixel_width(self) -> int:
+        return self.width * self.block_size
+
+    @property
+    def window_height(self) -> int:
+        return panel_height(self.height, self.block_size)
 
 
 @dataclass
@@ -40,6 +102,7 @@ class PlayerRuntime:
     move_left_event: int
     move_right_event: int
     rotate_event: int
+    block_size: int = BLOCK_SIZE
     soft_drop_active: bool = False
     left_held: bool = False
     right_held: bool = False
@@ -47,9 +110,15 @@ class PlayerRuntime:
     left_repeat_fast: bool = False
     right_repeat_fast: bool = False
     rotate_repeat_fast: bool = False
+    session_started_at: float = 0.0
+    session_clock: float = 0.0
+    piece_clock: float = 0.0
+    piece_times: List[Tuple[str, float]] = field(default_factory=list)
+    session_recorded: bool = False
 
     def reset(self) -> None:
-        self.state = GameState()
+        self.state.reset()
+        self.start_session()
         self.soft_drop_active = False
         self.left_held = self.right_held = self.rotate_held = False
         self.left_repeat_fast = self.right_repeat_fast = self.rotate_repeat_fast = False
@@ -75,35 +144,175 @@ class PlayerRuntime:
     def apply_pending_garbage(self) -> None:
         self.state.apply_pending_garbage()
 
+    def start_session(self) -> None:
+        self.session_started_at = time.time()
+        self.session_clock = self.piece_clock = time.perf_counter()
+        self.piece_times = []
+        self.session_recorded = False
+
+    def record_lock(self, shape_key: str) -> None:
+        now = time.perf_counter()
+        self.piece_times.append((shape_key, (now - self.piece_clock) * 1000))
+        self.piece_clock = now
+
+    def finish_session(self, stats: Optional[StatsStore], mode: "GameMode") -> None:
+        if self.session_recorded or not self.piece_times:
+            return
+        self.session_recorded = True
+        if stats is None:
+            return
+        state = self.state
+        stats.record_session(
+            SessionRecord(
+                player=self.label,
+                mode=mode.name,
+                started_at=self.session_started_at,
+                duration=time.perf_counter() - self.session_clock,
+                score=state.score,
+                level=state.level,
+                lines=state.board.lines_cleared,
+                piece_times=self.piece_times,
+            )
+        )
+
 
-def main() -> None:
+def main(
+    config: Optional[BoardConfig] = None,
+    telemetry_dir: Optional[Path] = None,
+    battle_players: int = BATTLE_PLAYERS,
+    profile_dir: Optional[Path] = None,
+    frame_budget_ms: float = FRAME_BUDGET_MS,
+    buffering: Optional[str] = None,
+    samples_dir: Optional[Path] = None,
+) -> None:
+    config = config or BoardConfig()
     pygame.init()
     pygame.display.set_caption("Tetris")
-    base_width = BOARD_PIXEL_WIDTH + SIDE_PANEL + 60
-    screen = pygame.display.set_mode((base_width, WINDOW_HEIGHT))
+    screen = pygame.display.set_mode(window_size_for_mode(GameMode.SINGLE, config))
     clock = pygame.time.Clock()
     font = pygame.font.Font(None, 32)
     small_font = pygame.font.Font(None, 24)
     title_font = pygame.font.Font(None, 64)
 
-    audio = AudioManager()
+    assets = load_assets(
+        {"title": title_font, "font": font, "small": small_font}, config.block_size
+    )
+    tiles = None
+    if assets is not None:
+        title_font = assets.font("title", title_font)
+        font = assets.font("font", font)
+        small_font = assets.font("small", small_font)
+        tiles = assets.tiles(config.block_size)
+
+    audio = AudioManager(assets)
+    stats = open_stats_store()
+    telemetry = Telemetry(telemetry_dir) if telemetry_dir is not None else None
+    samples = SampleWriter(samples_dir) if samples_dir is not None else None
+    profiler = (
+        SlowFrameProfiler(profile_dir, frame_budget_ms)
+        if profile_dir is not None
+        else None
+    )
 
     running = True
     while running:
-        mode = show_menu(screen, clock, title_font, font, small_font)
+        mode = show_menu(
+            screen, clock, title_font, font, small_font, stats, QUICKSAVE_PATH
+        )
         if mode is None:
             break
-        running = run_game(screen, clock, font, small_font, audio, mode)
+        if mode == GameMode.BATTLE:
+            running = run_battle(
+                screen, clock, small_font, config, battle_players, tiles
+            )
+            continue
+        game_config = config
+        resume = None
+        if mode == GameMode.RESUME:
+            resume = load_state_file(QUICKSAVE_PATH)
+            if resume is None:
+                continue
+            mode = GameMode.SINGLE
+            game_config = dataclasses.replace(
+                config, width=resume.board.width, height=resume.board.height
+            )
+        running = run_game(
+            screen,
+            clock,
+            font,
+            small_font,
+            audio,
+            mode,
+            game_config,
+            stats,
+            telemetry,
+            tiles,
+            profiler=profiler,
+            quicksave=QUICKSAVE_PATH,
+            resume=resume,
+            buffering=buffering,
+            samples=samples,
+        )
 
+    if profiler is not None:
+        profiler.close()
+        if profiler.captures:
+            print(f"Saved {len(profiler.captures)} slow frames to {profile_dir}")
+    if stats is not None:
+        stats.close()
+    if telemetry is not None:
+        telemetry.close()
+    if samples is not None:
+        samples.close()
+        if samples.dropped:
+            print(f"Dropped {samples.dropped} training samples")
+    if assets is not None:
+        assets.close()
     pygame.quit()
 
 
-def window_size_for_mode(mode: GameMode) -> Tuple[int, int]:
+def static_text_labels() -> List[TextLabel]:
+    labels = [
+        TextLabel("title", "Tetris", (240, 240, 240)),
+        TextLabel("font", "Press 1 for Single Player", (200, 200, 200)),
+        TextLabel("font", "Press 2 for Battle", (200, 200, 200)),
+        TextLabel("font", "Press 3 for Bot Battle", (200, 200, 200)),
+        TextLabel("font", "Press 4 to Resume", (200, 200, 200)),
+        TextLabel("small", "Esc to quit", (160, 160, 160)),
+        TextLabel("font", "High Scores", (240, 240, 240)),
+        TextLabel("font", "Next", (240, 240, 240)),
+        TextLabel("font", "Game Over - Press R", (250, 250, 250)),
+    ]
+    labels += [TextLabel("font", label, (255, 255, 255)) for label in PLAYER_LABELS]
+    labels += [
+        TextLabel("small", hint, (160, 160, 160))
+        for hint in dict.fromkeys(ARROW_CONTROLS + WASD_CONTROLS)
+    ]
+    return labels
+
+
+def load_assets(
+    fonts: Dict[str, pygame.font.Font], block_size: int
+) -> Optional[AssetBundle]:
+    return load_bundle(
+        fonts, static_text_labels(), [block_size], SOUND_EFFECTS, sine_pcm
+    )
+
+
+def open_stats_store() -> Optional[StatsStore]:
+    try:
+        return StatsStore()
+    except (OSError, sqlite3.Error) as exc:
+        print(f"Stats unavailable: {exc}")
+        return None
+
+
+def window_size_for_mode(mode: GameMode, config: BoardConfig) -> Tuple[int, int]:
     if mode == GameMode.SINGLE:
-        width = BOARD_PIXEL_WIDTH + SIDE_PANEL + 60
+        width = config.pixel_width + SIDE_PANEL + 60
     else:
-        width = 2 * (BOARD_PIXEL_WIDTH + SIDE_PANEL) + 100
-    return width, WINDOW_HEIGHT
+        width = 2 * (config.pixel_width + SIDE_PANEL) + 100
+    return width, config.window_height
 
 
 def create_player_runtime(
@@ -111,10 +320,11 @@ def create_player_runtime(
     mapping: InputMapping,
     origin: Tuple[int, int],
     controls_hint: Sequence[str],
+    config: BoardConfig,
 ) -> PlayerRuntime:
     runtime = PlayerRuntime(
         label=label,
-        state=GameState(),
+        state=GameState(config.width, config.height),
         mapping=mapping,
         origin=origin,
         controls_hint=controls_hint,
@@ -123,8 +333,10 @@ def create_player_runtime(
         move_left_event=pygame.event.custom_type(),
         move_right_event=pygame.event.custom_type(),
         rotate_event=pygame.event.custom_type(),
+        block_size=config.block_size,
     )
     runtime.set_drop_timer(drop_delay_for_level(runtime.state.level))
+    runtime.start_session()
     return runtime
 
 
@@ -135,11 +347,45 @@ def run_game(
     small_font: pygame.font.Font,
     audio: AudioManager,
     mode: GameMode,
+    config: BoardConfig,
+    stats: Optional[StatsStore] = None,
+    telemetry: Optional[Telemetry] = None,
+    tiles: Optional[TileSet] = None,
+    renderer: Optional[Renderer] = None,
+    profiler: Optional[SlowFrameProfiler] = None,
+    quicksave: Optional[Path] = None,
+    resume: Optional[GameState] = None,
+    buffering: Optional[str] = None,
+    samples: Optional[SampleWriter] = None,
 ) -> bool:
-    width, height = window_size_for_mode(mode)
-    screen = pygame.display.set_mode((width, height))
+    if renderer is None:
+        width, height = window_size_for_mode(mode, config)
+        screen = pygame.display.set_mode((width, height))
+        renderer = PygameRenderer(screen, font, small_font)
+    render_thread = (
+        RenderThread(renderer, BUFFERING_MODES[buffering])
+        if buffering is not None
+        else None
+    )
 
-    player_runtimes = create_players(mode)
+    player_runtimes = create_players(mode, config)
+    if resume is not None:
+        player_runtimes[0].state = resume
+        player_runtimes[0].set_drop_timer(drop_delay_for_level(resume.level))
+    for idx, runtime in enumerate(player_runtimes):
+        runtime.state.player_id = idx
+    audio.set_players(len(player_runtimes))
+    if telemetry is not None:
+        for idx, runtime in enumerate(player_runtimes):
+            runtime.state.attach_telemetry(telemetry, idx)
+    if samples is not None:
+        for idx, runtime in enumerate(player_runtimes):
+            attach_samples(runtime.state, samples, idx, SOURCE_HUMAN)
+    autosave = None
+    if quicksave is not None and mode == GameMode.SINGLE:
+        autosave = AutoSave(quicksave)
+        player_runtimes[0].state.events.subscribe(autosave)
+        autosave.save(player_runtimes[0].state)
 
     event_map: Dict[int, Tuple[str, PlayerRuntime]] = {}
     for runtime in player_runtimes:
@@ -151,13 +397,54 @@ def run_game(
 
     running = True
     return_to_menu = False
+    drawn: Optional[List[Tuple]] = None
+    input_ns = 0
 
     while running:
-        clock.tick(FPS)
         for runtime in player_runtimes:
             runtime.apply_pending_garbage()
 
-        for event in pygame.event.get():
+        frame = [frame_key(runtime.state) for runtime in player_runtimes]
+        redraw = frame != drawn
+        if redraw:
+            player_views = [
+                PlayerView(
+                    state=runtime.state,
+                    label=runtime.label,
+                    origin=runtime.origin,
+                    controls=runtime.controls_hint,
+                    block_size=runtime.block_size,
+                    tiles=tiles,
+                )
+                for runtime in player_runtimes
+            ]
+            if render_thread is not None:
+                render_thread.submit(player_views, input_ns)
+                input_ns = 0
+            else:
+                renderer.draw(player_views)
+            drawn = frame
+
+        for runtime in player_runtimes:
+            if runtime.state.game_over:
+                runtime.finish_session(stats, mode)
+
+        if profiler is not None:
+            profiler.end_frame([runtime.state for runtime in player_runtimes])
+        if redraw and render_thread is None:
+            clock.tick(FPS)
+        events = wait_for_events(IDLE_WAIT_MS)
+        if render_thread is not None and not input_ns:
+            if any(event.type == pygame.KEYDOWN for event in events):
+                input_ns = time.perf_counter_ns()
+        if profiler is not None:
+            profiler.start_frame()
+
+        for event in events:
+            if event.type in REDRAW_EVENTS:
+                drawn = None
+                continue
+
             if event.type == pygame.QUIT:
                 running = False
                 return_to_menu = False
@@ -170,6 +457,7 @@ def run_game(
                     break
                 elif event.key == pygame.K_r:
                     for runtime in player_runtimes:
+                        runtime.finish_session(stats, mode)
                         runtime.reset()
                     continue
 
@@ -177,6 +465,7 @@ def run_game(
                     state = runtime.state
                     if state.game_over:
                         continue
+                    locking_shape = state.current_piece.shape_key
                     result = handle_key_down(
                         event,
                         state,
@@ -185,6 +474,7 @@ def run_game(
                         runtime.mapping,
                     )
                     if result is not None:
+                        runtime.record_lock(locking_shape)
                         lines = result.lines_cleared
                         process_locked_piece(
                             idx,
@@ -249,6 +539,7 @@ def run_game(
                     continue
                 if action == "drop":
                     if not move_piece(state, dy=1):
+                        runtime.record_lock(state.current_piece.shape_key)
                         lines = lock_current_piece(state, audio)
                         process_locked_piece(
                             player_runtimes.index(runtime),
@@ -303,34 +594,141 @@ def run_game(
                         pygame.time.set_timer(runtime.rotate_event, 0)
                         runtime.rotate_repeat_fast = False
 
-        player_views = [
-            PlayerView(
-                state=runtime.state,
-                label=runtime.label,
-                origin=runtime.origin,
-                controls=runtime.controls_hint,
-            )
-            for runtime in player_runtimes
-        ]
-        draw(screen, player_views, font, small_font)
-        pygame.display.flip()
+    if profiler is not None:
+        profiler.cancel_frame()
+    if render_thread is not None:
+        render_thread.close()
+    # A saved game is left to be resumed, not finished; recording it now would
+    # count the same game again when the resumed session ends.
+    if autosave is not None and autosave.save(player_runtimes[0].state):
+        player_runtimes[0].session_recorded = True
+    for runtime in player_runtimes:
+        runtime.finish_session(stats, mode)
+    if telemetry is not None:
+        telemetry.flush()
 
     if return_to_menu:
         return True
     return False
 
 
-def create_players(mode: GameMode) -> List[PlayerRuntime]:
+def battle_layout(config: BoardConfig, players: int) -> Tuple[int, int, int]:
+    columns = min(players, BATTLE_COLUMNS)
+    rows = -(-players // columns)
+    block_size = max(
+        3,
+        min(
+            config.block_size,
+            BATTLE_WINDOW[0] // (columns * (config.width + 2)),
+            BATTLE_WINDOW[1] // (rows * (config.height + 3)),
+        ),
+    )
+    return columns, rows, block_size
+
+
+def run_battle(
+    screen: pygame.Surface,
+    clock: pygame.time.Clock,
+    small_font: pygame.font.Font,
+    config: BoardConfig,
+    players: int,
+    tiles: Optional[TileSet] = None,
+) -> bool:
+    columns, rows, block_size = battle_layout(config, players)
+    cell_width = (config.width + 2) * block_size
+    cell_height = (config.height + 3) * block_size
+    screen = pygame.display.set_mode((columns * cell_width, rows * cell_height))
+    if block_size != config.block_size:
+        tiles = None
+    views = [GameState(config.width, config.height) for _ in range(players)]
+    seed = 0
+
+    while True:
+        match = BattleMatch(players, config.width, config.height, seed=seed)
+        match.start()
+        drawn: Optional[List[Tuple]] = None
+        restart = False
+        try:
+            while not restart:
+                live = match.running()
+                for view, snapshot in zip(views, match.snapshots()):
+                    load_snapshot(view, snapshot)
+                frame = [frame_key(view) for view in views]
+                if frame != drawn:
+                    screen.fill((12, 12, 12))
+                    for idx, view in enumerate(views):
+                        row, column = divmod(idx, columns)
+                        draw_battle_player(
+                            screen,
+                            view,
+                            f"P{idx + 1}  {view.score}",
+                            small_font,
+                            (column * cell_width + block_size, row * cell_height),
+                            block_size,
+                            tiles,
+                        )
+                    pygame.display.flip()
+                    drawn = frame
+                clock.tick(FPS)
+
+                for event in wait_for_events(1 if live else IDLE_WAIT_MS):
+                    if event.type in REDRAW_EVENTS:
+                        drawn = None
+                    elif event.type == pygame.QUIT:
+                        return False
+                    elif event.type == pygame.KEYDOWN:
+                        if event.key == pygame.K_ESCAPE:
+                            return True
+                        if event.key == pygame.K_r:
+                            restart = True
+        finally:
+            match.close()
+        seed += 1
+
+
+def draw_battle_player(
+    screen: pygame.Surface,
+    state: GameState,
+    label: str,
+    small_font: pygame.font.Font,
+    origin: Tuple[int, int],
+    block_size: int,
+    tiles: Optional[TileSet],
+) -> None:
+    origin_x, origin_y = origin
+    board_y = origin_y + 2 * block_size
+    width = state.board.width * block_size
+    height = state.board.height * block_size
+    pygame.draw.rect(screen, (30, 30, 36), (origin_x, board_y, width, height))
+    draw_board(screen, state.board, origin_x, board_y, block_size, tiles)
+    if state.game_over:
+        overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 180))
+        screen.blit(overlay, (origin_x, board_y))
+    else:
+        draw_piece(
+            screen,
+            state.current_piece,
+            PIECE_COLORS[state.current_piece.shape_key],
+            origin_x,
+            board_y,
+            block_size,
+            tiles,
+        )
+    text = small_font.render(label, True, (200, 200, 200))
+    screen.blit(text, (origin_x, origin_y + max(0, 2 * block_size - text.get_height())))
+
+
+def wait_for_events(timeout: int) -> List[pygame.event.Event]:
+    first = pygame.event.wait(timeout)
+    events = [] if first.type == pygame.NOEVENT else [first]
+    events.extend(pygame.event.get())
+    return events
+
+
+def create_players(mode: GameMode, config: BoardConfig) -> List[PlayerRuntime]:
     base_origin = (20, 0)
 
-    arrow_controls = [
-        "←/→ move",
-        "↓ soft drop",
-        "↑ rotate, Z ccw",
-        "Space hard drop",
-        "R restart",
-        "Esc menu",
-    ]
     arrow_mapping = InputMapping(
         left=pygame.K_LEFT,
         right=pygame.K_RIGHT,
@@ -346,19 +744,12 @@ def create_players(mode: GameMode) -> List[PlayerRuntime]:
                 label="Player 1",
                 mapping=arrow_mapping,
                 origin=base_origin,
-                controls_hint=arrow_controls,
+                controls_hint=ARROW_CONTROLS,
+                config=config,
             )
         ]
 
-    spacing = BOARD_PIXEL_WIDTH + SIDE_PANEL + 40
-    wasd_controls = [
-        "A/D move",
-        "S soft drop",
-        "W rotate, Q ccw",
-        "Left Shift hard drop",
-        "R restart",
-        "Esc menu",
-    ]
+    spacing = config.pixel_width + SIDE_PANEL + 40
     wasd_mapping = InputMapping(
         left=pygame.K_a,
         right=pygame.K_d,
@@ -372,13 +763,15 @@ def create_players(mode: GameMode) -> List[PlayerRuntime]:
         label="Player 1 (WASD)",
         mapping=wasd_mapping,
         origin=base_origin,
-        controls_hint=wasd_controls,
+        controls_hint=WASD_CONTROLS,
+        config=config,
     )
     right_player = create_player_runtime(
         label="Player 2 (Arrows)",
         mapping=arrow_mapping,
         origin=(base_origin[0] + spacing, base_origin[1]),
-        controls_hint=arrow_controls,
+        controls_hint=ARROW_CONTROLS,
+        config=config,
     )
 
     return [left_player, right_player]
@@ -395,7 +788,6 @@ def process_locked_piece(
     if lines < 0:
         lines = 0
     if not already_advanced:
-        runtime.state.add_score_for_lines(lines)
         runtime.state.spawn_next()
         if runtime.state.game_over:
             runtime.stop_drop_timer()
@@ -414,13 +806,13 @@ def process_locked_piece(
                 if idx == player_index:
                     continue
                 if not other.state.game_over:
-                    other.state.queue_garbage(garbage)
+                    other.state.queue_garbage(garbage, player_index)
 
 
 def lock_current_piece(state: GameState, audio: Optional[AudioManager]) -> int:
-    lines = state.board.lock_piece(state.current_piece)
+    lines = state.lock_piece()
     if audio:
-        audio.play_lock(lines)
+        audio.play_lock(lines, state.player_id)
     return lines
 
 
@@ -430,9 +822,28 @@ def show_menu(
     title_font: pygame.font.Font,
     font: pygame.font.Font,
     small_font: pygame.font.Font,
+    stats: Optional[StatsStore] = None,
+    quicksave: Optional[Path] = None,
 ) -> Optional[GameMode]:
+    generation: Optional[int] = None
+    leaderboard: List[pygame.Surface] = []
+    can_resume = quicksave is not None and quicksave.exists()
+    redraw = True
     while True:
-        for event in pygame.event.get():
+        if stats is not None and stats.generation != generation:
+            generation = stats.generation
+            scores = stats.top_scores(MENU_HIGH_SCORES)
+            leaderboard = render_leaderboard(scores, font, small_font)
+            redraw = True
+        if redraw:
+            draw_menu(screen, title_font, font, small_font, leaderboard, can_resume)
+            pygame.display.flip()
+            redraw = False
+            clock.tick(FPS)
+
+        for event in wait_for_events(IDLE_WAIT_MS):
+            if event.type in REDRAW_EVENTS:
+                redraw = True
             if event.type == pygame.QUIT:
                 return None
             if event.type == pygame.KEYDOWN:
@@ -442,18 +853,50 @@ def show_menu(
                     return GameMode.SINGLE
                 if event.key in (pygame.K_2, pygame.K_KP2):
                     return GameMode.MULTI
+                if event.key in (pygame.K_3, pygame.K_KP3):
+                    return GameMode.BATTLE
+                if event.key in (pygame.K_4, pygame.K_KP4) and can_resume:
+                    return GameMode.RESUME
 
-        screen.fill((10, 10, 16))
-        title = title_font.render("Tetris", True, (240, 240, 240))
-        subtitle = font.render("Press 1 for Single Player", True, (200, 200, 200))
-        subtitle2 = font.render("Press 2 for Battle", True, (200, 200, 200))
-        info = small_font.render("Esc to quit", True, (160, 160, 160))
 
-        screen.blit(title, title.get_rect(center=(screen.get_width() // 2, 120)))
-        screen.blit(subtitle, subtitle.get_rect(center=(screen.get_width() // 2, 220)))
-        screen.blit(
-            subtitle2, subtitle2.get_rect(center=(screen.get_width() // 2, 270))
-        )
-        screen.blit(info, info.get_rect(center=(screen.get_width() // 2, 340)))
-        pygame.display.flip()
-        clock.tick(60)
+def draw_menu(
+    screen: pygame.Surface,
+    title_font: pygame.font.Font,
+    font: pygame.font.Font,
+    small_font: pygame.font.Font,
+    leaderboard: Sequence[pygame.Surface],
+    can_resume: bool = False,
+) -> None:
+    screen.fill((10, 10, 16))
+    center_x = screen.get_width() // 2
+    title = title_font.render("Tetris", True, (240, 240, 240))
+    subtitle = font.render("Press 1 for Single Player", True, (200, 200, 200))
+    subtitle2 = font.render("Press 2 for Battle", True, (200, 200, 200))
+    subtitle3 = font.render("Press 3 for Bot Battle", True, (200, 200, 200))
+    info = small_font.render("Esc to quit", True, (160, 160, 160))
+    lines = [subtitle, subtitle2, subtitle3]
+    if can_resume:
+        lines.append(font.render("Press 4 to Resume", True, (200, 200, 200)))
+    lines.append(info)
+
+    screen.blit(title, title.get_rect(center=(center_x, 120)))
+    y = 220
+    for surface in lines:
+        screen.blit(surface, surface.get_rect(center=(center_x, y)))
+        y += 50
+
+    for surface in leaderboard:
+        screen.blit(surface, surface.get_rect(center=(center_x, y)))
+        y += 26
+
+
+def render_leaderboard(
+    scores: Sequence[HighScore], font: pygame.font.Font, small_font: pygame.font.Font
+) -> List[pygame.Surface]:
+    if not scores:
+        return []
+    lines = [font.render("High Scores", True, (240, 240, 240))]
+    for rank, entry in enumerate(scores, start=1):
+        text = f"{rank}. {entry.score}  L{entry.level}  {entry.lines} lines  {entry.player}"
+        lines.append(small_font.render(text, True, (180, 180, 180)))
+    return lines
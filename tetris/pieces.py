@@ -1,8 +1,6 @@
 from dataclasses import dataclass
 from typing import Dict, Iterable, Optional, Sequence, Tuple
 
-from .constants import BOARD_WIDTH
-
 TETROMINO_SHAPES: Dict[str, Sequence[Sequence[str]]] = {
     "I": (
         ("....", "XXXX", "....", "...."),
@@ -38,20 +36,32 @@ TETROMINO_SHAPES: Dict[str, Sequence[Sequence[str]]] = {
 }
 
 
-@dataclass
+def _layout_cells(layout: Sequence[str]) -> Tuple[Tuple[int, int], ...]:
+    return tuple(
+        (col_idx, row_idx)
+        for row_idx, row in enumerate(layout)
+        for col_idx, char in enumerate(row)
+        if char == "X"
+    )
+
+
+SHAPE_CELLS: Dict[str, Tuple[Tuple[Tuple[int, int], ...], ...]] = {
+    key: tuple(_layout_cells(layout) for layout in layouts)
+    for key, layouts in TETROMINO_SHAPES.items()
+}
+
+
+@dataclass(slots=True)
 class Tetromino:
     shape_key: str
     rotation: int = 0
-    x: int = BOARD_WIDTH // 2 - 2
+    x: int = 0
     y: int = 0
 
     def cells(self, rotation: Optional[int] = None) -> Iterable[Tuple[int, int]]:
-        rot = self._normalized_rotation(rotation)
-        layout = TETROMINO_SHAPES[self.shape_key][rot]
-        for row_idx, row in enumerate(layout):
-            for col_idx, char in enumerate(row):
-                if char == "X":
-                    yield col_idx, row_idx
+        cells = SHAPE_CELLS[self.shape_key]
+        rot = self.rotation if rotation is None else rotation
+        return cells[rot % len(cells)]
 
     def rotated(self, direction: int) -> int:
         return self._normalized_rotation(self.rotation + direction)
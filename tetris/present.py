@@ -0,0 +1,150 @@
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+from .constants import FPS
+from .view import PlayerView, Renderer, snapshot_views
+
+BUFFERING_MODES = {"double": 2, "triple": 3}
+
+
+@dataclass(frozen=True)
+class Frame:
+    views: Tuple[PlayerView, ...]
+    # Arrival of the oldest input this frame is the first to show; 0 if none.
+    input_ns: int = 0
+
+
+def _percentile(samples: Sequence[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class FramePacing:
+    """Present timestamps and input-to-present latencies, in nanoseconds."""
+
+    def __init__(self) -> None:
+        self.presents = array("q")
+        self.latencies = array("q")
+
+    def record(self, input_ns: int, presented_ns: int) -> None:
+        self.presents.append(presented_ns)
+        if input_ns:
+            self.latencies.append(presented_ns - input_ns)
+
+    def summary(self) -> Dict[str, float]:
+        presents = self.presents
+        intervals = [(b - a) / 1e6 for a, b in zip(presents, presents[1:])]
+        latencies = [value / 1e6 for value in self.latencies]
+        mean = sum(intervals) / len(intervals) if intervals else 0.0
+        jitter = (
+            (sum((value - mean) ** 2 for value in intervals) / len(intervals)) ** 0.5
+            if intervals
+            else 0.0
+        )
+        return {
+            "frames": len(presents),
+            "latency_p50_ms": _percentile(latencies, 0.5),
+            "latency_p99_ms": _percentile(latencies, 0.99),
+            "interval_mean_ms": mean,
+            "interval_p99_ms": _percentile(intervals, 0.99),
+            "interval_jitter_ms": jitter,
+        }
+
+
+class SnapshotBuffer:
+    """Hands finished frames from the simulation to the render thread.
+
+    With depth 2 (double buffering) there is one pending slot and publishing
+    waits until the renderer has taken the previous frame. With depth 3
+    (triple buffering) a newer frame replaces a pending one, so the
+    simulation never waits and the renderer always gets the latest frame.
+    """
+
+    def __init__(self, depth: int = 3) -> None:
+        if depth not in (2, 3):
+            raise ValueError(f"buffer depth must be 2 or 3, got {depth}")
+        self.depth = depth
+        self.replaced = 0
+        self._pending: Optional[Frame] = None
+        self._closed = False
+        self._ready = threading.Condition()
+
+    def publish(self, frame: Frame) -> None:
+        with self._ready:
+            if self._pending is not None:
+                if self.depth == 2:
+                    while self._pending is not None and not self._closed:
+                        self._ready.wait()
+                else:
+                    # The replaced frame was never shown; its input still counts.
+                    if self._pending.input_ns and (
+                        not frame.input_ns or self._pending.input_ns < frame.input_ns
+                    ):
+                        frame = Frame(frame.views, self._pending.input_ns)
+                    self.replaced += 1
+            self._pending = frame
+            self._ready.notify_all()
+
+    def take(self) -> Optional[Frame]:
+        with self._ready:
+            while self._pending is None and not self._closed:
+                self._ready.wait()
+            frame, self._pending = self._pending, None
+            self._ready.notify_all()
+            return frame
+
+    def close(self) -> None:
+        with self._ready:
+            self._closed = True
+            self._ready.notify_all()
+
+
+class RenderThread:
+    """Draws the latest published frame on its own thread, at most fps a second.
+
+    The simulation thread keeps handling input while a draw or flip is in
+    progress; pygame releases the GIL while it blits and presents. On a
+    free-threaded build (python3.13t) drawing also runs alongside the game
+    logic instead of interleaving with it.
+    """
+
+    def __init__(self, renderer: Renderer, depth: int = 3, fps: int = FPS) -> None:
+        self.renderer = renderer
+        self.buffer = SnapshotBuffer(depth)
+        self.pacing = FramePacing()
+        self.period_ns = 1_000_000_000 // fps if fps else 0
+        self.error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="render", daemon=True)
+        self._thread.start()
+
+    def submit(self, views: Sequence[PlayerView], input_ns: int = 0) -> None:
+        if self.error is not None:
+            raise RuntimeError("render thread failed") from self.error
+        self.buffer.publish(Frame(snapshot_views(views), input_ns))
+
+    def _run(self) -> None:
+        clock = time.perf_counter_ns
+        next_present = 0
+        try:
+            while True:
+                frame = self.buffer.take()
+                if frame is None:
+                    return
+                self.renderer.draw(frame.views)
+                now = clock()
+                self.pacing.record(frame.input_ns, now)
+                next_present = max(now, next_present + self.period_ns)
+                if next_present > now:
+                    time.sleep((next_present - now) / 1e9)
+        except BaseException as exc:
+            self.error = exc
+            self.buffer.close()
+
+    def close(self) -> None:
+        self.buffer.close()
+        self._thread.join()
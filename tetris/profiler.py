@@ -0,0 +1,231 @@
+import argparse
+import json
+import sys
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from pathlib import Path
+from types import CodeType
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from .state import GameState
+
+Stack = Tuple[Tuple[CodeType, int], ...]
+
+FRAME_BUDGET_MS = 1000 / 60
+SAMPLE_INTERVAL_MS = 1.0
+HISTORY_FRAMES = 3
+MAX_CAPTURES = 50
+MAX_STACK_DEPTH = 64
+
+
+@dataclass(frozen=True)
+class FrameTiming:
+    index: int
+    start_ns: int
+    end_ns: int
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+class StackSampler:
+    """Samples one thread's Python stack while a frame is in progress."""
+
+    def __init__(self, thread_id: int, interval_ms: float, capacity: int) -> None:
+        self.thread_id = thread_id
+        self.interval = interval_ms / 1000
+        self.samples: Deque[Tuple[int, Stack]] = deque(maxlen=capacity)
+        self.active = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(
+            target=self._run, name="frame-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        frames_of = sys._current_frames
+        clock = time.perf_counter_ns
+        samples = self.samples
+        while True:
+            # Between frames the game is idle; sleep instead of sampling it.
+            self.active.wait()
+            if self._stopped:
+                return
+            frame = frames_of().get(self.thread_id)
+            stack = []
+            while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                stack.append((frame.f_code, frame.f_lineno))
+                frame = frame.f_back
+            samples.append((clock(), tuple(stack)))
+            time.sleep(self.interval)
+
+    def between(self, start_ns: int, end_ns: int) -> List[Stack]:
+        return [stack for at, stack in list(self.samples) if start_ns <= at <= end_ns]
+
+    def stop(self) -> None:
+        self._stopped = True
+        self.active.set()
+        self._thread.join()
+
+
+def _frame_name(code: CodeType, lineno: int) -> str:
+    return f"{code.co_name} ({Path(code.co_filename).name}:{lineno})"
+
+
+def fold_stacks(stacks: Sequence[Stack]) -> List[Tuple[str, int]]:
+    counts = Counter(
+        ";".join(_frame_name(code, lineno) for code, lineno in reversed(stack))
+        for stack in stacks
+    )
+    return counts.most_common()
+
+
+def describe_state(state: GameState) -> Dict[str, Any]:
+    piece = state.current_piece
+    board = state.board
+    return {
+        "score": state.score,
+        "level": state.level,
+        "lines": board.lines_cleared,
+        "game_over": state.game_over,
+        "pending_garbage": state.pending_garbage,
+        "last_cleared": list(board.last_cleared),
+        "revision": board.revision,
+        "piece": [piece.shape_key, piece.rotation, piece.x, piece.y],
+        "next": state.next_piece.shape_key,
+        "board": ["".join(".#"[bool(cell)] for cell in row) for row in board.grid],
+    }
+
+
+class SlowFrameProfiler:
+    """Keeps recent frame timings and stack samples; dumps them on a spike.
+
+    A capture covers the slow frame and the HISTORY_FRAMES before it, as
+    folded stacks (one "root;...;leaf count" line each) plus every player's
+    state at the end of the slow frame.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        budget_ms: float = FRAME_BUDGET_MS,
+        history_frames: int = HISTORY_FRAMES,
+        interval_ms: float = SAMPLE_INTERVAL_MS,
+        max_captures: int = MAX_CAPTURES,
+    ) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+        self.budget_ns = int(budget_ms * 1e6)
+        self.max_captures = max_captures
+        self.captures: List[Path] = []
+        self.frames: Deque[FrameTiming] = deque(maxlen=history_frames + 1)
+        self._index = 0
+        self._start_ns: Optional[int] = None
+        # Samples for the history window at up to one per interval.
+        capacity = int(budget_ms * 8 * (history_frames + 1) / interval_ms) + 1
+        self.sampler = StackSampler(threading.get_ident(), interval_ms, capacity)
+        # The sampler can only run when the game thread releases the GIL.
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, interval_ms / 1000))
+
+    def start_frame(self) -> None:
+        self._start_ns = time.perf_counter_ns()
+        self.sampler.active.set()
+
+    def end_frame(self, states: Sequence[GameState]) -> None:
+        self.sampler.active.clear()
+        start = self._start_ns
+        if start is None:
+            return
+        self._start_ns = None
+        end = time.perf_counter_ns()
+        self._index += 1
+        timing = FrameTiming(self._index, start, end)
+        self.frames.append(timing)
+        if end - start > self.budget_ns and len(self.captures) < self.max_captures:
+            self.capture(timing, states)
+
+    def cancel_frame(self) -> None:
+        # The frame was opened but never finished, e.g. on leaving the game.
+        self.sampler.active.clear()
+        self._start_ns = None
+
+    def capture(self, slow: FrameTiming, states: Sequence[GameState]) -> Path:
+        window = list(self.frames)
+        per_frame = [
+            (timing, self.sampler.between(timing.start_ns, timing.end_ns))
+            for timing in window
+        ]
+        report = {
+            "frame": slow.index,
+            "duration_ms": round(slow.duration_ms, 3),
+            "budget_ms": self.budget_ns / 1e6,
+            "captured_at": time.time(),
+            "frames": [
+                {
+                    "index": timing.index,
+                    "duration_ms": round(timing.duration_ms, 3),
+                    "samples": len(stacks),
+                    "stacks": fold_stacks(stacks),
+                }
+                for timing, stacks in per_frame
+            ],
+            "states": [describe_state(state) for state in states],
+        }
+        path = self.directory / f"slow-frame-{slow.index:07d}.json"
+        path.write_text(json.dumps(report, indent=1))
+        self.captures.append(path)
+        return path
+
+    def close(self) -> None:
+        self.sampler.stop()
+        sys.setswitchinterval(self._switch_interval)
+
+
+def summarize(path: Path, top: int) -> None:
+    report = json.loads(path.read_text())
+    print(
+        f"{path.name}: frame {report['frame']} took {report['duration_ms']:.1f} ms "
+        f"(budget {report['budget_ms']:.1f} ms)"
+    )
+    for frame in report["frames"]:
+        print(
+            f"  frame {frame['index']}: {frame['duration_ms']:7.2f} ms, "
+            f"{frame['samples']} samples"
+        )
+    leaves: Counter = Counter()
+    for stack, count in report["frames"][-1]["stacks"]:
+        leaves[stack.rsplit(";", 1)[-1]] += count
+    for leaf, count in leaves.most_common(top):
+        print(f"  {count:5d}  {leaf}")
+    for idx, state in enumerate(report["states"]):
+        print(
+            f"  player {idx + 1}: score {state['score']} level {state['level']} "
+            f"lines {state['lines']} cleared rows {state['last_cleared']} "
+            f"pending garbage {state['pending_garbage']}"
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m tetris.profiler", description="Summarize slow-frame captures"
+    )
+    parser.add_argument("captures", type=Path, help="capture file or directory")
+    parser.add_argument("--top", type=int, default=8, help="hottest leaf frames")
+    args = parser.parse_args(argv)
+    paths = (
+        sorted(args.captures.glob("slow-frame-*.json"))
+        if args.captures.is_dir()
+        else [args.captures]
+    )
+    if not paths:
+        sys.exit(f"No captures in {args.captures}")
+    for path in paths:
+        summarize(path, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,56 @@
 from dataclasses import dataclass
-from typing import Sequence, Tuple
+from typing import Dict, Optional, Sequence, Tuple
 
 import pygame
 
 from .board import Board
 from .constants import (
     BLOCK_SIZE,
-    BOARD_HEIGHT,
-    BOARD_PIXEL_WIDTH,
-    BOARD_WIDTH,
+    CELL_COLORS,
+    MIN_WINDOW_HEIGHT,
+    PIECE_CELLS,
     PIECE_COLORS,
-    WINDOW_HEIGHT,
 )
 from .pieces import Tetromino
 from .state import GameState
+from .view import PlayerView, frame_key
 
 
-@dataclass
-class PlayerView:
-    state: GameState
-    label: str
-    origin: Tuple[int, int]
-    controls: Sequence[str]
+@dataclass(frozen=True)
+class TileSet:
+    blocks: Dict[int, pygame.Surface]
+    ghosts: Dict[int, pygame.Surface]
+    previews: Dict[int, pygame.Surface]
+
+
+def board_pixel_size(board: Board, block_size: int) -> Tuple[int, int]:
+    return board.width * block_size, board.height * block_size
+
+
+def panel_height(rows: int, block_size: int) -> int:
+    return max(rows * block_size, MIN_WINDOW_HEIGHT)
+
+
+class PygameRenderer:
+    def __init__(
+        self,
+        screen: pygame.Surface,
+        font: pygame.font.Font,
+        small_font: pygame.font.Font,
+        flip: bool = True,
+    ) -> None:
+        self.screen = screen
+        self.font = font
+        self.small_font = small_font
+        self.flip = flip
+
+    def draw(self, views: Sequence[PlayerView]) -> None:
+        draw(self.screen, views, self.font, self.small_font)
+        if self.flip:
+            pygame.display.flip()
+
+    def close(self) -> None:
+        pass
 
 
 def draw(
@@ -43,14 +72,20 @@ def draw_player_area(
 ) -> None:
     origin_x, origin_y = view.origin
     state = view.state
-    draw_board(screen, state.board, origin_x, origin_y)
-    draw_ghost_piece(screen, state.board, state.current_piece, origin_x, origin_y)
+    block_size = view.block_size
+    tiles = view.tiles
+    draw_board(screen, state.board, origin_x, origin_y, block_size, tiles)
+    draw_ghost_piece(
+        screen, state.board, state.current_piece, origin_x, origin_y, block_size, tiles
+    )
     draw_piece(
         screen,
         state.current_piece,
         PIECE_COLORS[state.current_piece.shape_key],
         origin_x,
         origin_y,
+        block_size,
+        tiles,
     )
     draw_sidebar(
         screen,
@@ -61,27 +96,48 @@ def draw_player_area(
         origin_y,
         view.label,
         view.controls,
+        block_size,
+        tiles,
     )
-    draw_grid(screen, origin_x, origin_y)
+    draw_grid(screen, state.board, origin_x, origin_y, block_size)
     if state.game_over:
-        draw_game_over(screen, font, origin_x, origin_y)
+        draw_game_over(screen, state.board, font, origin_x, origin_y, block_size)
 
 
 def draw_board(
-    screen: pygame.Surface, board: Board, offset_x: int, offset_y: int
+    screen: pygame.Surface,
+    board: Board,
+    offset_x: int,
+    offset_y: int,
+    block_size: int = BLOCK_SIZE,
+    tiles: Optional[TileSet] = None,
 ) -> None:
-    for y in range(BOARD_HEIGHT):
-        for x in range(BOARD_WIDTH):
-            color = board.grid[y][x]
-            if color:
+    if tiles is not None:
+        blocks = tiles.blocks
+        screen.blits(
+            [
+                (blocks[cell], (offset_x + x * block_size, offset_y + y * block_size))
+                for y, row in enumerate(board.grid)
+                if any(row)
+                for x, cell in enumerate(row)
+                if cell
+            ],
+            False,
+        )
+        return
+    for y, row in enumerate(board.grid):
+        if not any(row):
+            continue
+        for x, cell in enumerate(row):
+            if cell:
                 pygame.draw.rect(
                     screen,
-                    color,
+                    CELL_COLORS[cell],
                     pygame.Rect(
-                        offset_x + x * BLOCK_SIZE,
-                        offset_y + y * BLOCK_SIZE,
-                        BLOCK_SIZE,
-                        BLOCK_SIZE,
+                        offset_x + x * block_size,
+                        offset_y + y * block_size,
+                        block_size,
+                        block_size,
                     ),
                 )
 
@@ -92,14 +148,20 @@ def draw_piece(
     color: Tuple[int, int, int],
     offset_x: int,
     offset_y: int,
+    block_size: int = BLOCK_SIZE,
+    tiles: Optional[TileSet] = None,
 ) -> None:
+    tile = tiles.blocks[PIECE_CELLS[piece.shape_key]] if tiles is not None else None
     for cx, cy in piece.cells():
         board_y = piece.y + cy
         if board_y < 0:
             continue
-        px = offset_x + (piece.x + cx) * BLOCK_SIZE
-        py = offset_y + board_y * BLOCK_SIZE
-        pygame.draw.rect(screen, color, pygame.Rect(px, py, BLOCK_SIZE, BLOCK_SIZE))
+        px = offset_x + (piece.x + cx) * block_size
+        py = offset_y + board_y * block_size
+        if tile is not None:
+            screen.blit(tile, (px, py))
+        else:
+            pygame.draw.rect(screen, color, pygame.Rect(px, py, block_size, block_size))
 
 
 def draw_ghost_piece(
@@ -108,27 +170,42 @@ def draw_ghost_piece(
     piece: Tetromino,
     offset_x: int,
     offset_y: int,
+    block_size: int = BLOCK_SIZE,
+    tiles: Optional[TileSet] = None,
 ) -> None:
     offset = 0
     while board.valid(piece, dy=offset + 1):
         offset += 1
     ghost_y = piece.y + offset
+    if tiles is not None:
+        tile = tiles.ghosts[PIECE_CELLS[piece.shape_key]]
+        for cx, cy in piece.cells():
+            board_y = ghost_y + cy
+            if board_y >= 0:
+                screen.blit(
+                    tile,
+                    (
+                        offset_x + (piece.x + cx) * block_size,
+                        offset_y + board_y * block_size,
+                    ),
+                )
+        return
     base_color = PIECE_COLORS[piece.shape_key]
     fill_color = (*base_color, 80)
     outline_color = tuple(min(255, c + 60) for c in base_color)
-    ghost_cell_surface = pygame.Surface((BLOCK_SIZE, BLOCK_SIZE), pygame.SRCALPHA)
+    ghost_cell_surface = pygame.Surface((block_size, block_size), pygame.SRCALPHA)
     ghost_cell_surface.fill(fill_color)
     for cx, cy in piece.cells():
         board_y = ghost_y + cy
         if board_y < 0:
             continue
-        px = offset_x + (piece.x + cx) * BLOCK_SIZE
-        py = offset_y + board_y * BLOCK_SIZE
+        px = offset_x + (piece.x + cx) * block_size
+        py = offset_y + board_y * block_size
         screen.blit(ghost_cell_surface, (px, py))
         pygame.draw.rect(
             screen,
             outline_color,
-            pygame.Rect(px, py, BLOCK_SIZE, BLOCK_SIZE),
+            pygame.Rect(px, py, block_size, block_size),
             2,
         )
 
@@ -142,8 +219,10 @@ def draw_sidebar(
     offset_y: int,
     label: str,
     controls_hint: Sequence[str],
+    block_size: int = BLOCK_SIZE,
+    tiles: Optional[TileSet] = None,
 ) -> None:
-    panel_x = offset_x + BOARD_PIXEL_WIDTH + 20
+    panel_x = offset_x + state.board.width * block_size + 20
     score_text = font.render(f"{label}", True, (255, 255, 255))
     screen.blit(score_text, (panel_x, offset_y + 10))
 
@@ -160,9 +239,11 @@ def draw_sidebar(
 
     next_label = font.render("Next", True, (240, 240, 240))
     screen.blit(next_label, (panel_x, y))
-    draw_next_piece_preview(screen, state.next_piece, (panel_x, y + 40))
+    draw_next_piece_preview(
+        screen, state.next_piece, (panel_x, y + 40), max(8, block_size), tiles
+    )
 
-    y = offset_y + WINDOW_HEIGHT - 150
+    y = offset_y + panel_height(state.board.height, block_size) - 150
     for text in controls_hint:
         surface = small_font.render(text, True, (160, 160, 160))
         screen.blit(surface, (panel_x, y))
@@ -170,46 +251,65 @@ def draw_sidebar(
 
 
 def draw_next_piece_preview(
-    screen: pygame.Surface, piece: Tetromino, top_left: Tuple[int, int]
+    screen: pygame.Surface,
+    piece: Tetromino,
+    top_left: Tuple[int, int],
+    block_size: int = BLOCK_SIZE,
+    tiles: Optional[TileSet] = None,
 ) -> None:
     preview_x, preview_y = top_left
     from .pieces import TETROMINO_SHAPES
 
     layout = TETROMINO_SHAPES[piece.shape_key][0]
     color = PIECE_COLORS[piece.shape_key]
+    tile = tiles.previews.get(PIECE_CELLS[piece.shape_key]) if tiles else None
     for row_idx, row in enumerate(layout):
         for col_idx, char in enumerate(row):
             if char == "X":
                 rect = pygame.Rect(
-                    preview_x + col_idx * (BLOCK_SIZE // 2),
-                    preview_y + row_idx * (BLOCK_SIZE // 2),
-                    BLOCK_SIZE // 2,
-                    BLOCK_SIZE // 2,
+                    preview_x + col_idx * (block_size // 2),
+                    preview_y + row_idx * (block_size // 2),
+                    block_size // 2,
+                    block_size // 2,
                 )
-                pygame.draw.rect(screen, color, rect)
+                if tile is not None:
+                    screen.blit(tile, rect)
+                else:
+                    pygame.draw.rect(screen, color, rect)
 
 
-def draw_grid(screen: pygame.Surface, offset_x: int, offset_y: int) -> None:
-    for x in range(BOARD_WIDTH + 1):
-        start_pos = (offset_x + x * BLOCK_SIZE, offset_y)
-        end_pos = (offset_x + x * BLOCK_SIZE, offset_y + BOARD_HEIGHT * BLOCK_SIZE)
+def draw_grid(
+    screen: pygame.Surface,
+    board: Board,
+    offset_x: int,
+    offset_y: int,
+    block_size: int = BLOCK_SIZE,
+) -> None:
+    pixel_width, pixel_height = board_pixel_size(board, block_size)
+    for x in range(board.width + 1):
+        start_pos = (offset_x + x * block_size, offset_y)
+        end_pos = (offset_x + x * block_size, offset_y + pixel_height)
         pygame.draw.line(screen, (40, 40, 40), start_pos, end_pos)
-    for y in range(BOARD_HEIGHT + 1):
-        start_pos = (offset_x, offset_y + y * BLOCK_SIZE)
-        end_pos = (offset_x + BOARD_WIDTH * BLOCK_SIZE, offset_y + y * BLOCK_SIZE)
+    for y in range(board.height + 1):
+        start_pos = (offset_x, offset_y + y * block_size)
+        end_pos = (offset_x + pixel_width, offset_y + y * block_size)
         pygame.draw.line(screen, (40, 40, 40), start_pos, end_pos)
 
 
 def draw_game_over(
-    screen: pygame.Surface, font: pygame.font.Font, offset_x: int, offset_y: int
+    screen: pygame.Surface,
+    board: Board,
+    font: pygame.font.Font,
+    offset_x: int,
+    offset_y: int,
+    block_size: int = BLOCK_SIZE,
 ) -> None:
-    overlay = pygame.Surface(
-        (BOARD_WIDTH * BLOCK_SIZE, BOARD_HEIGHT * BLOCK_SIZE), pygame.SRCALPHA
-    )
+    pixel_width, pixel_height = board_pixel_size(board, block_size)
+    overlay = pygame.Surface((pixel_width, pixel_height), pygame.SRCALPHA)
     overlay.fill((0, 0, 0, 180))
     screen.blit(overlay, (offset_x, offset_y))
     text = font.render("Game Over - Press R", True, (250, 250, 250))
     text_rect = text.get_rect(
-        center=(offset_x + BOARD_PIXEL_WIDTH // 2, offset_y + WINDOW_HEIGHT // 2)
+        center=(offset_x + pixel_width // 2, offset_y + pixel_height // 2)
     )
     screen.blit(text, text_rect)
@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .constants import PIECE_CELLS
+from .pieces import Tetromino
+from .state import GameState
+from .telemetry import TelemetryEvent, TelemetryRecord, read_records, telemetry_files
+
+SHAPE_KEYS = {cell: key for key, cell in PIECE_CELLS.items()}
+
+
+@dataclass(frozen=True)
+class RecordPosition:
+    file_index: int
+    record_index: int
+
+
+def telemetry_sessions(directory: Path) -> Dict[str, List[Path]]:
+    sessions: Dict[str, List[Path]] = {}
+    for path in telemetry_files(directory):
+        sessions.setdefault(path.name.rsplit("-", 1)[0], []).append(path)
+    return sessions
+
+
+def iter_session(
+    paths: Sequence[Path], start: Optional[RecordPosition] = None
+) -> Iterator[Tuple[RecordPosition, TelemetryRecord]]:
+    first_file = start.file_index if start else 0
+    for file_index in range(first_file, len(paths)):
+        skip = start.record_index if start and file_index == first_file else 0
+        records = islice(read_records(paths[file_index]), skip, None)
+        for record_index, record in enumerate(records, start=skip):
+            yield RecordPosition(file_index, record_index), record
+
+
+def _piece(record: TelemetryRecord) -> Tetromino:
+    return Tetromino(SHAPE_KEYS[record.shape], record.rotation, record.x, record.y)
+
+
+def apply_record(states: Dict[int, GameState], record: TelemetryRecord) -> None:
+    event = record.event
+    if event == TelemetryEvent.GAME_START:
+        state = GameState(record.extra >> 16, record.extra & 0xFFFF)
+        state.current_piece = _piece(record)
+        state.next_piece = Tetromino(SHAPE_KEYS[record.value])
+        states[record.player] = state
+        return
+    state = states.get(record.player)
+    if state is None:
+        return
+    if event == TelemetryEvent.SPAWN:
+        state.current_piece = _piece(record)
+        state.next_piece = Tetromino(SHAPE_KEYS[record.value])
+    elif event in (TelemetryEvent.MOVE, TelemetryEvent.ROTATE):
+        piece = state.current_piece
+        piece.rotation = record.rotation
+        piece.x = record.x
+        piece.y = record.y
+    elif event == TelemetryEvent.LOCK:
+        state.board.lock_piece(_piece(record))
+        state.score = record.extra
+    elif event == TelemetryEvent.GARBAGE_RECEIVED:
+        state.board.add_garbage_row(record.x)
+        state.current_piece.y -= 1
+    elif event == TelemetryEvent.LEVEL_UP:
+        state.level = record.value
+    elif event == TelemetryEvent.GAME_OVER:
+        state.game_over = True
+        state.score = record.value
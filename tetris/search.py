@@ -0,0 +1,170 @@
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from .actions import ROTATION_KICKS
+from .board import Board
+from .pieces import TETROMINO_SHAPES, Tetromino
+
+SEARCH_INPUTS = ("left", "right", "rotate_cw", "rotate_ccw", "soft_drop")
+# Layouts are 4x4, so a piece can hang up to three columns past the left wall.
+X_PAD = 3
+# Rows kept above the spawn row; rotation kicks can lift a piece by one row.
+Y_PAD = 4
+LANDING_UNKNOWN = -(1 << 30)
+
+
+@dataclass(frozen=True)
+class Placement:
+    rotation: int
+    x: int
+    y: int
+    inputs: Tuple[str, ...]
+
+
+def _layout_masks(shape_key: str) -> List[Tuple[Tuple[int, int], ...]]:
+    masks = []
+    for layout in TETROMINO_SHAPES[shape_key]:
+        rows = []
+        for row_idx, row in enumerate(layout):
+            mask = sum(1 << col for col, char in enumerate(row) if char == "X")
+            if mask:
+                rows.append((row_idx, mask))
+        masks.append(tuple(rows))
+    return masks
+
+
+PIECE_MASKS: Dict[str, List[Tuple[Tuple[int, int], ...]]] = {
+    key: _layout_masks(key) for key in TETROMINO_SHAPES
+}
+
+
+class PlacementSearch:
+    def __init__(self, board: Board, piece: Tetromino, allow_ccw: bool = True) -> None:
+        width = board.width
+        self.board = board
+        self.piece = piece
+        self.masks = PIECE_MASKS[piece.shape_key]
+        self.top = min(piece.y, 0) - Y_PAD
+        self.columns = width + X_PAD
+        self.rows = board.height - self.top
+        rotations = len(self.masks)
+        if rotations == 1:
+            self.directions: Tuple[int, ...] = ()
+        elif rotations == 2 or not allow_ccw:
+            self.directions = (1,)
+        else:
+            self.directions = (1, -1)
+
+        # Rows padded with solid walls: X_PAD columns on the left, four on
+        # the right, and four solid rows under the floor.
+        wall = (1 << X_PAD) - 1 | ((1 << 4) - 1) << (width + X_PAD)
+        solid = (1 << (width + X_PAD + 4)) - 1
+        grid: List[int] = [wall] * (-self.top)
+        for row in board.grid:
+            mask = wall
+            for x, cell in enumerate(row):
+                if cell:
+                    mask |= 1 << (x + X_PAD)
+            grid.append(mask)
+        grid += [solid] * 4
+        self.grid = grid
+
+    def fits(self, rotation: int, x: int, y: int) -> bool:
+        row = y - self.top
+        if row < 0:
+            return False
+        grid = self.grid
+        shift = x + X_PAD
+        if shift < 0:
+            return False
+        for offset, mask in self.masks[rotation]:
+            if grid[row + offset] & (mask << shift):
+                return False
+        return True
+
+    def index(self, rotation: int, x: int, y: int) -> int:
+        return (rotation * self.rows + y - self.top) * self.columns + x + X_PAD
+
+    def run(self) -> List[Placement]:
+        piece = self.piece
+        rotations = len(self.masks)
+        start = (piece.rotation % rotations, piece.x, piece.y)
+        if not self.fits(*start):
+            return []
+        columns = self.columns
+        states = rotations * self.rows * columns
+        visited = bytearray((states + 7) >> 3)
+        parents = array("i", [-1]) * states
+        moves = bytearray(states)
+        # Landing row of each state once known, so hard drops are walked once
+        # per column instead of once per visited state.
+        landing_rows = array("i", [LANDING_UNKNOWN]) * states
+        fits = self.fits
+        index = self.index
+        directions = self.directions
+
+        first = index(*start)
+        visited[first >> 3] |= 1 << (first & 7)
+        queue = deque([start])
+        landings: Dict[Tuple[int, int, int], int] = {}
+        while queue:
+            rotation, x, y = queue.popleft()
+            current = index(rotation, x, y)
+
+            landing_y = landing_rows[current]
+            if landing_y == LANDING_UNKNOWN:
+                landing_y = y
+                walked = current
+                while fits(rotation, x, landing_y + 1):
+                    landing_y += 1
+                    walked += columns
+                    if landing_rows[walked] != LANDING_UNKNOWN:
+                        landing_y = landing_rows[walked]
+                        break
+                for row in range(current, walked + 1, columns):
+                    landing_rows[row] = landing_y
+            landing = (rotation, x, landing_y)
+            if landing not in landings:
+                landings[landing] = current
+
+            candidates = [
+                (0, rotation, x - 1, y),
+                (1, rotation, x + 1, y),
+                (4, rotation, x, y + 1),
+            ]
+            for direction in directions:
+                target = (rotation + direction) % rotations
+                for dx, dy in ROTATION_KICKS:
+                    if fits(target, x + dx, y + dy):
+                        move = 2 if direction == 1 else 3
+                        candidates.append((move, target, x + dx, y + dy))
+                        break
+
+            for move, next_rotation, next_x, next_y in candidates:
+                if move in (0, 1, 4) and not fits(next_rotation, next_x, next_y):
+                    continue
+                following = index(next_rotation, next_x, next_y)
+                if visited[following >> 3] & (1 << (following & 7)):
+                    continue
+                visited[following >> 3] |= 1 << (following & 7)
+                parents[following] = current
+                moves[following] = move
+                queue.append((next_rotation, next_x, next_y))
+
+        placements = []
+        for (rotation, x, y), state_index in landings.items():
+            inputs = ["hard_drop"]
+            while state_index != first:
+                inputs.append(SEARCH_INPUTS[moves[state_index]])
+                state_index = parents[state_index]
+            inputs.reverse()
+            placements.append(Placement(rotation, x, y, tuple(inputs)))
+        return placements
+
+
+def reachable_placements(
+    board: Board, piece: Tetromino, allow_ccw: bool = True
+) -> List[Placement]:
+    return PlacementSearch(board, piece, allow_ccw).run()
@@ -0,0 +1,228 @@
+import os
+import random
+import struct
+from pathlib import Path
+from typing import Optional
+
+from .board import Board
+from .constants import CELL_COLORS, PIECE_CELLS
+from .events import GLOBAL_EVENTS, EventBus, GameListener
+from .pieces import Tetromino
+from .state import GameState
+
+STATE_MAGIC = b"TSAV"
+STATE_VERSION = 1
+# magic, version, flags, width, height
+STATE_HEADER = struct.Struct("<4sBBHH")
+# score, level, lines, pending garbage, player, game over,
+# shape, rotation, x, y, next shape
+STATE_FIELDS = struct.Struct("<qHIIBBBBhhB")
+# Mersenne Twister state: 624 words plus the position in them.
+RNG_STATE = struct.Struct("<625I")
+GAUSS = struct.Struct("<d")
+FLAG_RNG = 1
+FLAG_GAUSS = 2
+SHAPE_KEYS = {cell: key for key, cell in PIECE_CELLS.items()}
+
+# Cell value -> ASCII bit, for building the occupancy bitset in one int().
+_OCCUPANCY = bytes(0x30 if value == 0 else 0x31 for value in range(256))
+_HIGH_NIBBLE = bytes((value & 0x0F) << 4 for value in range(256))
+_SPLIT_HIGH = bytes(value >> 4 for value in range(256))
+_SPLIT_LOW = bytes(value & 0x0F for value in range(256))
+
+
+def pack_occupancy(board: Board) -> bytes:
+    """Row-major bitset of filled cells, first cell in the top bit."""
+    cells = board.width * board.height
+    flat = b"".join(board.grid).translate(_OCCUPANCY)
+    return int(flat, 2).to_bytes((cells + 7) // 8, "big")
+
+
+def dump_state(state: GameState, include_rng: bool = True) -> bytes:
+    board = state.board
+    width, height = board.width, board.height
+    flat = b"".join(board.grid)
+    occupancy = pack_occupancy(board)
+    # Occupied cells only, two colors per byte.
+    colors = flat.translate(None, b"\x00")
+    high = colors[0::2].translate(_HIGH_NIBBLE)
+    low = colors[1::2].ljust(len(high), b"\x00")
+    packed = (int.from_bytes(high, "big") | int.from_bytes(low, "big")).to_bytes(
+        len(high), "big"
+    )
+
+    flags = 0
+    tail = b""
+    if include_rng:
+        _, words, gauss = state.rng.getstate()
+        flags |= FLAG_RNG
+        tail = RNG_STATE.pack(*words)
+        if gauss is not None:
+            flags |= FLAG_GAUSS
+            tail += GAUSS.pack(gauss)
+
+    piece = state.current_piece
+    return b"".join(
+        (
+            STATE_HEADER.pack(STATE_MAGIC, STATE_VERSION, flags, width, height),
+            STATE_FIELDS.pack(
+                state.score,
+                state.level,
+                board.lines_cleared,
+                state.pending_garbage,
+                state.player_id,
+                state.game_over,
+                PIECE_CELLS[piece.shape_key],
+                piece.rotation,
+                piece.x,
+                piece.y,
+                PIECE_CELLS[state.next_piece.shape_key],
+            ),
+            occupancy,
+            packed,
+            tail,
+        )
+    )
+
+
+def load_state(blob: bytes) -> GameState:
+    try:
+        return _load_state(memoryview(blob))
+    except (struct.error, KeyError, IndexError) as exc:
+        raise ValueError(f"corrupt game state: {exc}") from exc
+
+
+def _load_state(blob: memoryview) -> GameState:
+    magic, version, flags, width, height = STATE_HEADER.unpack_from(blob)
+    if magic != STATE_MAGIC or version != STATE_VERSION:
+        raise ValueError(f"not a v{STATE_VERSION} game state")
+    (
+        score,
+        level,
+        lines,
+        pending_garbage,
+        player_id,
+        game_over,
+        shape,
+        rotation,
+        x,
+        y,
+        next_shape,
+    ) = STATE_FIELDS.unpack_from(blob, STATE_HEADER.size)
+
+    cells = width * height
+    offset = STATE_HEADER.size + STATE_FIELDS.size
+    occupancy_end = offset + (cells + 7) // 8
+    if occupancy_end > len(blob):
+        # Checked before allocating anything sized by the header.
+        raise ValueError("truncated board")
+    occupancy = int.from_bytes(blob[offset:occupancy_end], "big")
+    if occupancy >> cells:
+        raise ValueError("occupancy bits past the end of the board")
+    occupied = occupancy.bit_count()
+    colors_end = occupancy_end + (occupied + 1) // 2
+    packed = bytes(blob[occupancy_end:colors_end])
+    colors = bytearray(len(packed) * 2)
+    colors[0::2] = packed.translate(_SPLIT_HIGH)
+    colors[1::2] = packed.translate(_SPLIT_LOW)
+    del colors[occupied:]
+    if (
+        len(colors) != occupied
+        or 0 in colors
+        or max(colors, default=1) >= len(CELL_COLORS)
+    ):
+        raise ValueError("cell colors do not match the occupancy bitset")
+
+    flat = bytearray(cells)
+    bits = format(occupancy, f"0{cells}b") if cells else ""
+    position = bits.find("1")
+    for color in colors:
+        flat[position] = color
+        position = bits.find("1", position + 1)
+
+    end = colors_end
+    if flags & FLAG_RNG:
+        words = RNG_STATE.unpack_from(blob, end)
+        end += RNG_STATE.size
+        gauss = None
+        if flags & FLAG_GAUSS:
+            (gauss,) = GAUSS.unpack_from(blob, end)
+            end += GAUSS.size
+        # setstate replaces everything seeding would have set up.
+        rng = random.Random.__new__(random.Random)
+        rng.setstate((3, words, gauss))
+    else:
+        rng = random.Random()
+    if end != len(blob):
+        raise ValueError(f"{len(blob) - end} unexpected trailing bytes")
+
+    if width < 4 or height < 4:
+        raise ValueError(f"Board must be at least 4x4, got {width}x{height}")
+    board = Board.__new__(Board)
+    board.width = width
+    board.height = height
+    board.grid = [flat[row : row + width] for row in range(0, cells, width)]
+    board.lines_cleared = lines
+    board.last_cleared = []
+    board.revision = 0
+    state = GameState.__new__(GameState)
+    state.rng = rng
+    state.board = board
+    state.current_piece = Tetromino(SHAPE_KEYS[shape], rotation, x, y)
+    state.next_piece = Tetromino(SHAPE_KEYS[next_shape])
+    state.score = score
+    state.level = level
+    state.game_over = bool(game_over)
+    state.pending_garbage = pending_garbage
+    state.events = EventBus(GLOBAL_EVENTS)
+    state.player_id = player_id
+    return state
+
+
+def save_state_file(path: Path, state: GameState) -> None:
+    # Written beside the target and renamed, so a crash never leaves half a save.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix(path.suffix + ".tmp")
+    partial.write_bytes(dump_state(state))
+    os.replace(partial, path)
+
+
+def load_state_file(path: Path) -> Optional[GameState]:
+    try:
+        return load_state(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as exc:
+        print(f"Ignoring saved game {path}: {exc}")
+        return None
+
+
+class AutoSave(GameListener):
+    """Keeps a save file current: written on every spawn, removed on game over."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.failed = False
+
+    def save(self, state: GameState) -> bool:
+        if self.failed or state.game_over:
+            return False
+        try:
+            save_state_file(self.path, state)
+        except OSError as exc:
+            print(f"Autosave disabled: {exc}")
+            self.failed = True
+            return False
+        return True
+
+    def on_game_start(self, state: GameState) -> None:
+        self.save(state)
+
+    def on_spawn(self, state: GameState) -> None:
+        self.save(state)
+
+    def on_game_over(self, state: GameState) -> None:
+        try:
+            self.path.unlink(missing_ok=True)
+        except OSError:
+            pass
@@ -0,0 +1,381 @@
+import argparse
+import asyncio
+import os
+import random
+import resource
+import struct
+import sys
+import time
+from array import array
+from typing import Dict, List, Optional, Sequence
+
+from .actions import hard_drop, move_piece, rotate_piece
+from .constants import BOARD_HEIGHT, BOARD_WIDTH, PIECE_CELLS
+from .state import GameState, drop_delay_for_level
+
+# tick, score, lines, level, shape, next shape, rotation, x, y, game over
+STATUS = struct.Struct("<IiIHBBBhhB")
+INPUT_LEFT = ord("l")
+INPUT_RIGHT = ord("r")
+INPUT_SOFT_DROP = ord("d")
+INPUT_ROTATE_CW = ord("c")
+INPUT_ROTATE_CCW = ord("z")
+INPUT_HARD_DROP = ord("h")
+INPUT_RESTART = ord("n")
+GAME_INPUTS = bytes(
+    (
+        INPUT_LEFT,
+        INPUT_RIGHT,
+        INPUT_SOFT_DROP,
+        INPUT_ROTATE_CW,
+        INPUT_ROTATE_CCW,
+        INPUT_HARD_DROP,
+    )
+)
+MAX_PENDING_INPUT = 64
+TICK_RATE = 60
+# Ticks the scheduler may run back to back before it drops the backlog.
+MAX_CATCH_UP_TICKS = 4
+
+
+def raise_file_limit() -> int:
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    return hard
+
+
+def peak_rss_kb() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class MatchSession(asyncio.Protocol):
+    """One connected client and its game; inputs are applied on the next tick."""
+
+    __slots__ = (
+        "server",
+        "state",
+        "transport",
+        "inputs",
+        "queued",
+        "gravity_tick",
+        "sent_key",
+    )
+
+    def __init__(self, server: "MatchServer", seed: int) -> None:
+        self.server = server
+        self.state = GameState(server.width, server.height, seed)
+        self.transport: Optional[asyncio.Transport] = None
+        self.inputs = bytearray()
+        self.queued = False
+        self.gravity_tick = 0
+        self.sent_key = -1
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport  # type: ignore[assignment]
+        self.server.add_session(self)
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self.transport = None
+        self.server.remove_session(self)
+
+    def data_received(self, data: bytes) -> None:
+        inputs = self.inputs
+        if len(inputs) < MAX_PENDING_INPUT:
+            inputs += data[: MAX_PENDING_INPUT - len(inputs)]
+        if not self.queued:
+            self.queued = True
+            self.server.input_queue.append(self)
+
+    def apply_inputs(self) -> None:
+        state = self.state
+        for code in self.inputs:
+            if code == INPUT_RESTART:
+                if state.game_over:
+                    state.reset()
+                    self.server.schedule_gravity(self)
+                continue
+            if state.game_over:
+                continue
+            if code == INPUT_LEFT:
+                move_piece(state, dx=-1)
+            elif code == INPUT_RIGHT:
+                move_piece(state, dx=1)
+            elif code == INPUT_SOFT_DROP:
+                if move_piece(state, dy=1):
+                    state.score += 1
+            elif code == INPUT_ROTATE_CW:
+                rotate_piece(state, 1)
+            elif code == INPUT_ROTATE_CCW:
+                rotate_piece(state, -1)
+            elif code == INPUT_HARD_DROP:
+                hard_drop(state)
+                self.server.schedule_gravity(self)
+        self.inputs.clear()
+        self.queued = False
+
+    def apply_gravity(self) -> None:
+        state = self.state
+        if state.game_over:
+            return
+        if not move_piece(state, dy=1):
+            state.lock_piece()
+            state.spawn_next()
+        self.server.schedule_gravity(self)
+
+    def send_status(self, tick: int) -> None:
+        state = self.state
+        piece = state.current_piece
+        # Cheap change detector: the fields a client can see, folded together.
+        key = hash(
+            (
+                state.board.revision,
+                piece.rotation,
+                piece.x,
+                piece.y,
+                state.score,
+                state.game_over,
+            )
+        )
+        if key == self.sent_key or self.transport is None:
+            return
+        self.sent_key = key
+        self.transport.write(
+            STATUS.pack(
+                tick,
+                state.score,
+                state.board.lines_cleared,
+                state.level,
+                PIECE_CELLS[piece.shape_key],
+                PIECE_CELLS[state.next_piece.shape_key],
+                piece.rotation,
+                piece.x,
+                piece.y,
+                state.game_over,
+            )
+        )
+
+
+class MatchServer:
+    """Hosts every game on one event loop, advanced by a shared tick.
+
+    Gravity is kept on a timing wheel keyed by tick and inputs on a queue of
+    sessions that received data, so a tick only touches games with work due.
+    """
+
+    def __init__(
+        self,
+        width: int = BOARD_WIDTH,
+        height: int = BOARD_HEIGHT,
+        tick_rate: int = TICK_RATE,
+        seed: int = 0,
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.tick_rate = tick_rate
+        self.tick = 0
+        self.sessions: Dict[int, MatchSession] = {}
+        self.input_queue: List[MatchSession] = []
+        self.wheel: Dict[int, List[MatchSession]] = {}
+        self.latencies = array("d")
+        self.skipped_ticks = 0
+        self._seeds = random.Random(seed)
+
+    def create_session(self) -> MatchSession:
+        return MatchSession(self, self._seeds.getrandbits(32))
+
+    def add_session(self, session: MatchSession) -> None:
+        self.sessions[id(session)] = session
+        self.schedule_gravity(session)
+
+    def remove_session(self, session: MatchSession) -> None:
+        self.sessions.pop(id(session), None)
+
+    def schedule_gravity(self, session: MatchSession) -> None:
+        delay = drop_delay_for_level(session.state.level)
+        due = self.tick + max(1, delay * self.tick_rate // 1000)
+        session.gravity_tick = due
+        self.wheel.setdefault(due, []).append(session)
+
+    def step(self) -> None:
+        self.tick += 1
+        tick = self.tick
+        touched = self.input_queue
+        self.input_queue = []
+        for session in touched:
+            session.apply_inputs()
+        due = self.wheel.pop(tick, ())
+        for session in due:
+            # Hard drops reschedule gravity, leaving stale wheel entries behind.
+            if session.gravity_tick == tick and id(session) in self.sessions:
+                session.apply_gravity()
+                touched.append(session)
+        for session in touched:
+            session.send_status(tick)
+
+    async def run(self, stop: asyncio.Event) -> None:
+        period = 1.0 / self.tick_rate
+        next_tick = time.perf_counter() + period
+        while not stop.is_set():
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                # Behind schedule: still yield so sockets are serviced.
+                await asyncio.sleep(0)
+            self.step()
+            now = time.perf_counter()
+            self.latencies.append(now - next_tick)
+            next_tick += period
+            if now - next_tick > MAX_CATCH_UP_TICKS * period:
+                skipped = int((now - next_tick) / period)
+                self.skipped_ticks += skipped
+                next_tick += skipped * period
+
+    def take_latencies(self) -> List[float]:
+        samples = sorted(self.latencies)
+        self.latencies = array("d")
+        return samples
+
+
+def percentile(samples: Sequence[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+async def serve(path: str, tick_rate: int, stats_interval: float) -> None:
+    raise_file_limit()
+    match = MatchServer(tick_rate=tick_rate)
+    loop = asyncio.get_running_loop()
+    if os.path.exists(path):
+        os.unlink(path)
+    server = await loop.create_unix_server(match.create_session, path, backlog=4096)
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(match.run(stop))
+    idle_rss = peak_rss_kb()
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        while True:
+            await asyncio.sleep(stats_interval)
+            now_wall, now_cpu = time.perf_counter(), time.process_time()
+            cpu_pct = (now_cpu - cpu) / (now_wall - wall) * 100
+            wall, cpu = now_wall, now_cpu
+            samples = match.take_latencies()
+            games = len(match.sessions)
+            rss = peak_rss_kb()
+            per_game = (rss - idle_rss) * 1024 / games if games else 0.0
+            skipped, match.skipped_ticks = match.skipped_ticks, 0
+            print(
+                f"games={games} rss_kb={rss} bytes_per_game={per_game:.0f} "
+                f"ticks={len(samples)} skipped={skipped} cpu_pct={cpu_pct:.0f} "
+                f"p50_ms={percentile(samples, 0.5) * 1000:.2f} "
+                f"p99_ms={percentile(samples, 0.99) * 1000:.2f}",
+                flush=True,
+            )
+    finally:
+        stop.set()
+        await ticker
+        server.close()
+        os.unlink(path)
+
+
+class LoadClient(asyncio.Protocol):
+    __slots__ = ("transport", "received")
+
+    def __init__(self) -> None:
+        self.transport: Optional[asyncio.Transport] = None
+        self.received = 0
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport  # type: ignore[assignment]
+
+    def data_received(self, data: bytes) -> None:
+        self.received += len(data)
+        # At a status boundary the last byte is the game-over flag.
+        if data[-1] and self.received % STATUS.size == 0 and self.transport is not None:
+            self.transport.write(bytes((INPUT_RESTART,)))
+
+    @property
+    def statuses(self) -> int:
+        return self.received // STATUS.size
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self.transport = None
+
+
+async def generate_load(
+    path: str, players: int, rate: float, duration: float, seed: int = 0
+) -> None:
+    raise_file_limit()
+    loop = asyncio.get_running_loop()
+    clients: List[LoadClient] = []
+    for start in range(0, players, 256):
+        batch = [
+            loop.create_unix_connection(LoadClient, path)
+            for _ in range(min(256, players - start))
+        ]
+        clients += [protocol for _, protocol in await asyncio.gather(*batch)]
+    print(f"connected {len(clients)} players", flush=True)
+
+    # One shared timer sends everyone's inputs instead of a task per player.
+    rng = random.Random(seed)
+    period = 0.05
+    per_period = players * rate * period
+    sent = 0
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        count = int(per_period) + (rng.random() < per_period % 1)
+        for client in rng.choices(clients, k=count):
+            if client.transport is not None:
+                client.transport.write(bytes((rng.choice(GAME_INPUTS),)))
+                sent += 1
+        await asyncio.sleep(period)
+    statuses = sum(client.statuses for client in clients)
+    print(
+        f"sent {sent} inputs ({sent / duration:.0f}/s), "
+        f"received {statuses} statuses ({statuses / duration:.0f}/s)",
+        flush=True,
+    )
+    for client in clients:
+        if client.transport is not None:
+            client.transport.close()
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m tetris.server", description="Headless match server"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_cmd = commands.add_parser("serve", help="host games on a unix socket")
+    serve_cmd.add_argument("--socket", default="/tmp/tetris.sock")
+    serve_cmd.add_argument("--tick-rate", type=int, default=TICK_RATE)
+    serve_cmd.add_argument("--stats-interval", type=float, default=2.0)
+
+    load = commands.add_parser("load", help="simulate players against a server")
+    load.add_argument("--socket", default="/tmp/tetris.sock")
+    load.add_argument("--players", type=int, default=100)
+    load.add_argument("--rate", type=float, default=4.0, help="inputs per second")
+    load.add_argument("--duration", type=float, default=10.0, help="seconds")
+    load.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    try:
+        if args.command == "serve":
+            asyncio.run(serve(args.socket, args.tick_rate, args.stats_interval))
+        else:
+            asyncio.run(
+                generate_load(
+                    args.socket, args.players, args.rate, args.duration, args.seed
+                )
+            )
+    except KeyboardInterrupt:
+        print("stopped", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
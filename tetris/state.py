@@ -1,44 +1,121 @@
 import random
+from typing import Any, Dict, Optional
 
 from .board import Board
-from .constants import BOARD_WIDTH, SCORES_PER_LINE
+from .constants import BOARD_HEIGHT, BOARD_WIDTH, SCORES_PER_LINE
 from .pieces import TETROMINO_SHAPES, Tetromino
+from .events import GLOBAL_EVENTS, EventBus
+from .telemetry import Telemetry, TelemetryListener
+
+SHAPE_KEYS = tuple(TETROMINO_SHAPES)
+
+
+def drop_delay_for_level(level: int) -> int:
+    return max(100, 800 - (level - 1) * 60)
 
 
 class GameState:
-    def __init__(self) -> None:
-        self.board = Board()
+    __slots__ = (
+        "rng",
+        "board",
+        "current_piece",
+        "next_piece",
+        "score",
+        "level",
+        "game_over",
+        "pending_garbage",
+        "events",
+        "player_id",
+    )
+
+    def __init__(
+        self,
+        width: int = BOARD_WIDTH,
+        height: int = BOARD_HEIGHT,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.rng = random.Random(seed)
+        self.board = Board(width, height)
         self.current_piece = self._make_piece()
         self.next_piece = self._make_piece()
         self.score = 0
         self.level = 1
         self.game_over = False
         self.pending_garbage = 0
+        self.events = EventBus(GLOBAL_EVENTS)
+        self.player_id = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Subscribers belong to this process; a copy starts with a fresh bus.
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        del fields["events"]
+        return fields
+
+    def __setstate__(self, fields: Dict[str, Any]) -> None:
+        for name, value in fields.items():
+            setattr(self, name, value)
+        self.events = EventBus(GLOBAL_EVENTS)
 
     def _make_piece(self) -> Tetromino:
-        return Tetromino(random.choice(list(TETROMINO_SHAPES)))
+        return Tetromino(self.rng.choice(SHAPE_KEYS), x=self.board.width // 2 - 2)
+
+    def reset(self, seed: Optional[int] = None) -> None:
+        events, player_id = self.events, self.player_id
+        self.__init__(self.board.width, self.board.height, seed)
+        self.events = events
+        self.player_id = player_id
+        emit = events.game_start
+        if emit is not None:
+            emit(self)
 
-    def reset(self) -> None:
-        self.__init__()
+    def attach_telemetry(self, telemetry: Telemetry, player_id: int) -> None:
+        self.player_id = player_id
+        listener = TelemetryListener(telemetry)
+        self.events.subscribe(listener)
+        listener.on_game_start(self)
 
     def spawn_next(self) -> None:
         self.current_piece = self.next_piece
         self.next_piece = self._make_piece()
         self.current_piece.rotation = 0
-        self.current_piece.x = BOARD_WIDTH // 2 - 2
+        self.current_piece.x = self.board.width // 2 - 2
         self.current_piece.y = 0
+        emit = self.events.spawn
+        if emit is not None:
+            emit(self)
         if not self.board.valid(self.current_piece):
-            self.game_over = True
+            self._end_game()
+
+    def lock_piece(self) -> int:
+        piece = self.current_piece
+        lines = self.board.lock_piece(piece)
+        if lines:
+            emit_clear = self.events.line_clear
+            if emit_clear is not None:
+                emit_clear(self, self.board.last_cleared)
+        self.add_score_for_lines(lines)
+        emit = self.events.lock
+        if emit is not None:
+            emit(self, piece, lines)
+        return lines
 
     def add_score_for_lines(self, lines: int) -> None:
         if not lines:
             return
         self.score += SCORES_PER_LINE.get(lines, lines * 100)
-        self.level = self.board.lines_cleared // 10 + 1
+        level = self.board.lines_cleared // 10 + 1
+        if level != self.level:
+            self.level = level
+            emit = self.events.level_change
+            if emit is not None:
+                emit(self, level)
 
-    def queue_garbage(self, lines: int) -> None:
+    def queue_garbage(self, lines: int, source: int = -1) -> None:
         if lines > 0:
             self.pending_garbage += lines
+            emit = self.events.garbage_queued
+            if emit is not None:
+                emit(self, lines, source)
 
     def apply_pending_garbage(self) -> None:
         if self.pending_garbage <= 0 or self.game_over:
@@ -46,9 +123,18 @@ class GameState:
         lines = self.pending_garbage
         self.pending_garbage = 0
         self.current_piece.y -= lines
-        self.board.add_garbage(lines)
+        holes = self.board.add_garbage(lines, self.rng)
+        emit = self.events.garbage_applied
+        if emit is not None:
+            emit(self, holes)
         while not self.board.valid(self.current_piece):
             self.current_piece.y -= 1
             if self.current_piece.y < -4:
-                self.game_over = True
+                self._end_game()
                 break
+
+    def _end_game(self) -> None:
+        self.game_over = True
+        emit = self.events.game_over
+        if emit is not None:
+            emit(self)
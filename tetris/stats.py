@@ -0,0 +1,173 @@
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .constants import STATS_PATH
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    duration REAL NOT NULL,
+    score INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    lines INTEGER NOT NULL,
+    pieces INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_by_score ON sessions (score DESC, started_at);
+CREATE TABLE IF NOT EXISTS piece_times (
+    session_id INTEGER NOT NULL REFERENCES sessions (id),
+    seq INTEGER NOT NULL,
+    shape TEXT NOT NULL,
+    duration_ms REAL NOT NULL,
+    PRIMARY KEY (session_id, seq)
+) WITHOUT ROWID;
+"""
+
+
+@dataclass
+class SessionRecord:
+    player: str
+    mode: str
+    started_at: float
+    duration: float
+    score: int
+    level: int
+    lines: int
+    piece_times: List[Tuple[str, float]] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class HighScore:
+    player: str
+    mode: str
+    score: int
+    level: int
+    lines: int
+    started_at: float
+
+
+class StatsStore:
+    def __init__(
+        self,
+        path: Path = STATS_PATH,
+        batch_size: int = 64,
+        flush_interval: float = 1.0,
+    ) -> None:
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._reader = self._connect()
+        self._reader.executescript(SCHEMA)
+        self._queue: "queue.Queue[Optional[SessionRecord]]" = queue.Queue()
+        self._generation = 0
+        self._cache: Dict[int, Tuple[int, Tuple[HighScore, ...]]] = {}
+        self._writer = threading.Thread(
+            target=self._write_loop, name="stats-writer", daemon=True
+        )
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def record_session(self, record: SessionRecord) -> None:
+        self._queue.put_nowait(record)
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def top_scores(self, limit: int = 10) -> Tuple[HighScore, ...]:
+        generation = self._generation
+        cached = self._cache.get(limit)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+        rows = self._reader.execute(
+            "SELECT player, mode, score, level, lines, started_at FROM sessions "
+            "ORDER BY score DESC, started_at LIMIT ?",
+            (limit,),
+        ).fetchall()
+        scores = tuple(HighScore(*row) for row in rows)
+        self._cache[limit] = (generation, scores)
+        return scores
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._writer.join()
+        self._reader.close()
+
+    def _write_loop(self) -> None:
+        conn = self._connect()
+        pending: List[SessionRecord] = []
+        deadline: Optional[float] = None
+        running = True
+        while running:
+            timeout = (
+                None if deadline is None else max(0.0, deadline - time.monotonic())
+            )
+            try:
+                record = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                record = None
+            else:
+                if record is None:
+                    running = False
+                else:
+                    pending.append(record)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_interval
+            if pending and (
+                not running
+                or len(pending) >= self.batch_size
+                or time.monotonic() >= (deadline or 0.0)
+            ):
+                self._commit(conn, pending)
+                pending = []
+                deadline = None
+        conn.close()
+
+    def _commit(
+        self, conn: sqlite3.Connection, records: Sequence[SessionRecord]
+    ) -> None:
+        try:
+            with conn:
+                for record in records:
+                    cursor = conn.execute(
+                        "INSERT INTO sessions (player, mode, started_at, duration, "
+                        "score, level, lines, pieces) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            record.player,
+                            record.mode,
+                            record.started_at,
+                            record.duration,
+                            record.score,
+                            record.level,
+                            record.lines,
+                            len(record.piece_times),
+                        ),
+                    )
+                    session_id = cursor.lastrowid
+                    conn.executemany(
+                        "INSERT INTO piece_times (session_id, seq, shape, duration_ms) "
+                        "VALUES (?, ?, ?, ?)",
+                        [
+                            (session_id, seq, shape, duration_ms)
+                            for seq, (shape, duration_ms) in enumerate(
+                                record.piece_times
+                            )
+                        ],
+                    )
+        except sqlite3.Error as exc:
+            print(f"Unable to save stats: {exc}")
+            return
+        self._generation += 1
@@ -0,0 +1,268 @@
+import queue
+import struct
+import threading
+import time
+from enum import IntEnum
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    BinaryIO,
+    Callable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+)
+
+from .constants import PIECE_CELLS
+from .events import GameListener
+from .pieces import Tetromino
+
+if TYPE_CHECKING:
+    from .state import GameState
+
+FILE_HEADER = struct.Struct("<4sHH")
+FILE_MAGIC = b"TTEL"
+FILE_VERSION = 1
+# timestamp_ns, event, player, shape, rotation, x, y, value, extra
+RECORD = struct.Struct("<QBBBbhhii")
+
+
+class TelemetryEvent(IntEnum):
+    GAME_START = 0
+    SPAWN = 1
+    MOVE = 2
+    ROTATE = 3
+    LOCK = 4
+    GARBAGE_SENT = 5
+    GARBAGE_RECEIVED = 6
+    LEVEL_UP = 7
+    GAME_OVER = 8
+
+
+class TelemetryRecord(NamedTuple):
+    timestamp_ns: int
+    event: int
+    player: int
+    shape: int
+    rotation: int
+    x: int
+    y: int
+    value: int
+    extra: int
+
+
+class Telemetry:
+    def __init__(
+        self,
+        directory: Path,
+        buffer_records: int = 4096,
+        max_file_bytes: int = 16 * 1024 * 1024,
+        clock: Callable[[], int] = time.monotonic_ns,
+    ) -> None:
+        self.directory = directory
+        self.max_file_bytes = max_file_bytes
+        directory.mkdir(parents=True, exist_ok=True)
+        self._prefix = time.strftime("telemetry-%Y%m%d-%H%M%S")
+        self._buffer_bytes = buffer_records * RECORD.size
+        self._buffer = bytearray(self._buffer_bytes)
+        self._offset = 0
+        self._failed = False
+        self._free: "queue.SimpleQueue[bytearray]" = queue.SimpleQueue()
+        for _ in range(3):
+            self._free.put(bytearray(self._buffer_bytes))
+        self._full: "queue.SimpleQueue[Optional[memoryview]]" = queue.SimpleQueue()
+        self._pack = RECORD.pack_into
+        self._clock = clock
+        self._writer = threading.Thread(
+            target=self._write_loop, name="telemetry-writer", daemon=True
+        )
+        self._writer.start()
+
+    def record(
+        self,
+        event: int,
+        player: int,
+        shape: int = 0,
+        rotation: int = 0,
+        x: int = 0,
+        y: int = 0,
+        value: int = 0,
+        extra: int = 0,
+    ) -> None:
+        offset = self._offset
+        self._pack(
+            self._buffer,
+            offset,
+            self._clock(),
+            event,
+            player,
+            shape,
+            rotation,
+            x,
+            y,
+            value,
+            extra,
+        )
+        offset += RECORD.size
+        if offset == self._buffer_bytes:
+            self._hand_off(offset)
+        else:
+            self._offset = offset
+
+    def piece_event(
+        self,
+        event: int,
+        player: int,
+        piece: Tetromino,
+        value: int = 0,
+        extra: int = 0,
+    ) -> None:
+        self.record(
+            event,
+            player,
+            PIECE_CELLS[piece.shape_key],
+            piece.rotation,
+            piece.x,
+            piece.y,
+            value,
+            extra,
+        )
+
+    def flush(self) -> None:
+        if self._offset:
+            self._hand_off(self._offset)
+
+    def close(self) -> None:
+        self.flush()
+        self._full.put(None)
+        self._writer.join()
+
+    def _hand_off(self, length: int) -> None:
+        if self._failed:
+            self._offset = 0
+            return
+        self._full.put(memoryview(self._buffer)[:length])
+        try:
+            self._buffer = self._free.get_nowait()
+        except queue.Empty:
+            self._buffer = bytearray(self._buffer_bytes)
+        self._offset = 0
+
+    def _write_loop(self) -> None:
+        index = 0
+        handle: Optional[BinaryIO] = None
+        written = 0
+        while True:
+            chunk = self._full.get()
+            if chunk is None:
+                break
+            if not self._failed:
+                try:
+                    if handle is None or written + len(chunk) > self.max_file_bytes:
+                        if handle is not None:
+                            handle.close()
+                            handle = None
+                        path = self.directory / f"{self._prefix}-{index:04d}.bin"
+                        handle = path.open("wb")
+                        handle.write(
+                            FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION, RECORD.size)
+                        )
+                        written = FILE_HEADER.size
+                        index += 1
+                    handle.write(chunk)
+                    written += len(chunk)
+                except OSError as exc:
+                    print(f"Telemetry disabled: {exc}")
+                    self._failed = True
+                    self._close_quietly(handle)
+                    handle = None
+            buffer = chunk.obj
+            chunk.release()
+            self._free.put(buffer)
+        self._close_quietly(handle)
+
+    @staticmethod
+    def _close_quietly(handle: Optional[BinaryIO]) -> None:
+        if handle is None:
+            return
+        try:
+            handle.close()
+        except OSError:
+            pass
+
+
+class TelemetryListener(GameListener):
+    def __init__(self, telemetry: Telemetry) -> None:
+        self.telemetry = telemetry
+
+    def on_game_start(self, state: "GameState") -> None:
+        self.telemetry.piece_event(
+            TelemetryEvent.GAME_START,
+            state.player_id,
+            state.current_piece,
+            value=PIECE_CELLS[state.next_piece.shape_key],
+            extra=state.board.width << 16 | state.board.height,
+        )
+
+    def on_spawn(self, state: "GameState") -> None:
+        self.telemetry.piece_event(
+            TelemetryEvent.SPAWN,
+            state.player_id,
+            state.current_piece,
+            value=PIECE_CELLS[state.next_piece.shape_key],
+        )
+
+    def on_move(self, state: "GameState", dx: int, dy: int) -> None:
+        self.telemetry.piece_event(
+            TelemetryEvent.MOVE, state.player_id, state.current_piece, dx, dy
+        )
+
+    def on_rotate(self, state: "GameState", direction: int) -> None:
+        self.telemetry.piece_event(
+            TelemetryEvent.ROTATE, state.player_id, state.current_piece, direction
+        )
+
+    def on_lock(self, state: "GameState", piece: Tetromino, lines: int) -> None:
+        self.telemetry.piece_event(
+            TelemetryEvent.LOCK, state.player_id, piece, lines, state.score
+        )
+
+    def on_garbage_queued(self, state: "GameState", lines: int, source: int) -> None:
+        if source >= 0:
+            self.telemetry.record(
+                TelemetryEvent.GARBAGE_SENT,
+                source,
+                value=lines,
+                extra=state.player_id,
+            )
+
+    def on_garbage_applied(self, state: "GameState", holes: List[int]) -> None:
+        for hole in holes:
+            self.telemetry.record(
+                TelemetryEvent.GARBAGE_RECEIVED, state.player_id, x=hole, value=1
+            )
+
+    def on_level_change(self, state: "GameState", level: int) -> None:
+        self.telemetry.record(TelemetryEvent.LEVEL_UP, state.player_id, value=level)
+
+    def on_game_over(self, state: "GameState") -> None:
+        self.telemetry.record(
+            TelemetryEvent.GAME_OVER,
+            state.player_id,
+            value=state.score,
+            extra=state.board.lines_cleared,
+        )
+
+
+def read_records(path: Path) -> Iterator[TelemetryRecord]:
+    data = path.read_bytes()
+    magic, version, record_size = FILE_HEADER.unpack_from(data)
+    if magic != FILE_MAGIC or version != FILE_VERSION or record_size != RECORD.size:
+        raise ValueError(f"{path} is not a telemetry v{FILE_VERSION} file")
+    for fields in RECORD.iter_unpack(memoryview(data)[FILE_HEADER.size :]):
+        yield TelemetryRecord(*fields)
+
+
+def telemetry_files(directory: Path) -> List[Path]:
+    return sorted(directory.glob("telemetry-*.bin"))
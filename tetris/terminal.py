@@ -0,0 +1,286 @@
+import os
+import select
+import sys
+import termios
+import time
+import tty
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from .actions import hard_drop, move_piece, rotate_piece
+from .board import Board
+from .constants import BOARD_HEIGHT, BOARD_WIDTH, CELL_COLORS, PIECE_CELLS
+from .pieces import TETROMINO_SHAPES
+from .state import GameState, drop_delay_for_level
+from .telemetry import Telemetry
+from .view import PlayerView, frame_key
+
+Cell = Tuple[str, str]
+
+SIDEBAR_COLUMNS = 24
+EMPTY_STYLE = "48;2;24;24;24"
+BORDER_STYLE = "48;2;60;60;60"
+TEXT_STYLE = "38;2;220;220;220"
+DIM_STYLE = "38;2;140;140;140"
+TERMINAL_CONTROLS = (
+    "←/→ or A/D move",
+    "↓ or S soft drop",
+    "↑ or W rotate, Z ccw",
+    "Space hard drop",
+    "R restart, Q quit",
+)
+KEY_SEQUENCES: Dict[bytes, str] = {
+    b"\x1b[A": "rotate_cw",
+    b"\x1b[B": "soft_drop",
+    b"\x1b[C": "right",
+    b"\x1b[D": "left",
+    b"a": "left",
+    b"d": "right",
+    b"s": "soft_drop",
+    b"w": "rotate_cw",
+    b"z": "rotate_ccw",
+    b" ": "hard_drop",
+    b"r": "restart",
+    b"q": "quit",
+    b"\x1b": "quit",
+    b"\x03": "quit",
+}
+
+
+def _background(color: Tuple[int, int, int]) -> str:
+    return f"48;2;{color[0]};{color[1]};{color[2]}"
+
+
+def _foreground(color: Tuple[int, int, int]) -> str:
+    return f"38;2;{color[0]};{color[1]};{color[2]}"
+
+
+class TerminalRenderer:
+    """ANSI renderer that rewrites only the character cells that changed."""
+
+    def __init__(self, stream: TextIO = sys.stdout) -> None:
+        self.stream = stream
+        self._previous: List[List[Cell]] = []
+        self.bytes_written = 0
+
+    def draw(self, views: Sequence[PlayerView]) -> None:
+        frame = self._compose(views)
+        out: List[str] = []
+        if len(frame) != len(self._previous) or (
+            frame and len(frame[0]) != len(self._previous[0])
+        ):
+            # Geometry changed: start from a cleared screen.
+            out.append("\x1b[0m\x1b[2J\x1b[?25l")
+            self._previous = [[(" ", "")] * len(row) for row in frame]
+        style = None
+        for y, (row, previous) in enumerate(zip(frame, self._previous)):
+            x = 0
+            width = len(row)
+            while x < width:
+                if row[x] == previous[x]:
+                    x += 1
+                    continue
+                out.append(f"\x1b[{y + 1};{x + 1}H")
+                while x < width and row[x] != previous[x]:
+                    char, cell_style = row[x]
+                    if cell_style != style:
+                        out.append(f"\x1b[0;{cell_style}m" if cell_style else "\x1b[0m")
+                        style = cell_style
+                    out.append(char)
+                    x += 1
+        self._previous = frame
+        if out:
+            data = "".join(out)
+            self.bytes_written += len(data)
+            self.stream.write(data)
+            self.stream.flush()
+
+    def close(self) -> None:
+        row = len(self._previous) + 1
+        self.stream.write(f"\x1b[0m\x1b[{row};1H\x1b[?25h\n")
+        self.stream.flush()
+
+    def _compose(self, views: Sequence[PlayerView]) -> List[List[Cell]]:
+        rows = max(view.state.board.height for view in views) + 2
+        columns = sum(
+            view.state.board.width * 2 + 2 + SIDEBAR_COLUMNS for view in views
+        )
+        frame = [[(" ", "")] * columns for _ in range(rows)]
+        left = 0
+        for view in views:
+            self._compose_player(frame, view, left)
+            left += view.state.board.width * 2 + 2 + SIDEBAR_COLUMNS
+        return frame
+
+    def _compose_player(
+        self, frame: List[List[Cell]], view: PlayerView, left: int
+    ) -> None:
+        state = view.state
+        board = state.board
+        width = board.width * 2 + 2
+        for x in range(width):
+            frame[0][left + x] = (" ", BORDER_STYLE)
+            frame[board.height + 1][left + x] = (" ", BORDER_STYLE)
+        for y, row in enumerate(board.grid):
+            line = frame[y + 1]
+            line[left] = line[left + width - 1] = (" ", BORDER_STYLE)
+            for x, cell in enumerate(row):
+                style = _background(CELL_COLORS[cell]) if cell else EMPTY_STYLE
+                line[left + 1 + x * 2] = line[left + 2 + x * 2] = (" ", style)
+
+        piece = state.current_piece
+        color = CELL_COLORS[PIECE_CELLS[piece.shape_key]]
+        if not state.game_over:
+            drop = 0
+            while board.valid(piece, dy=drop + 1):
+                drop += 1
+            for cx, cy in piece.cells():
+                self._put_cell(
+                    frame,
+                    board,
+                    left,
+                    piece.x + cx,
+                    piece.y + cy + drop,
+                    ("[", "]"),
+                    f"{EMPTY_STYLE};{_foreground(color)}",
+                )
+            for cx, cy in piece.cells():
+                self._put_cell(
+                    frame,
+                    board,
+                    left,
+                    piece.x + cx,
+                    piece.y + cy,
+                    (" ", " "),
+                    _background(color),
+                )
+        else:
+            banner = "GAME OVER - R".center(width - 2)
+            self._put_text(frame, board.height // 2 + 1, left + 1, banner, TEXT_STYLE)
+
+        panel = left + width + 2
+        lines = [
+            (view.label, TEXT_STYLE),
+            ("", ""),
+            (f"Score: {state.score}", TEXT_STYLE),
+            (f"Level: {state.level}", TEXT_STYLE),
+            (f"Lines: {board.lines_cleared}", TEXT_STYLE),
+            ("", ""),
+            ("Next", TEXT_STYLE),
+        ]
+        for y, (text, style) in enumerate(lines):
+            self._put_text(frame, y, panel, text, style)
+        next_piece = state.next_piece
+        preview = TETROMINO_SHAPES[next_piece.shape_key][0]
+        next_style = _background(CELL_COLORS[PIECE_CELLS[next_piece.shape_key]])
+        for row_idx, row in enumerate(preview[:2]):
+            for col_idx, char in enumerate(row):
+                if char == "X":
+                    x = panel + col_idx * 2
+                    line = frame[len(lines) + 1 + row_idx]
+                    line[x] = line[x + 1] = (" ", next_style)
+        for idx, text in enumerate(view.controls):
+            y = board.height + 1 - len(view.controls) + idx
+            if y > len(lines) + 3:
+                self._put_text(frame, y, panel, text, DIM_STYLE)
+
+    @staticmethod
+    def _put_cell(
+        frame: List[List[Cell]],
+        board: Board,
+        left: int,
+        x: int,
+        y: int,
+        chars: Tuple[str, str],
+        style: str,
+    ) -> None:
+        if 0 <= x < board.width and 0 <= y < board.height:
+            line = frame[y + 1]
+            line[left + 1 + x * 2] = (chars[0], style)
+            line[left + 2 + x * 2] = (chars[1], style)
+
+    @staticmethod
+    def _put_text(
+        frame: List[List[Cell]], y: int, x: int, text: str, style: str
+    ) -> None:
+        line = frame[y]
+        for offset, char in enumerate(text[: len(line) - x]):
+            line[x + offset] = (char, style)
+
+
+def read_keys(data: bytes) -> Iterator[str]:
+    idx = 0
+    while idx < len(data):
+        if data.startswith(b"\x1b[", idx) and idx + 2 < len(data):
+            sequence = data[idx : idx + 3]
+            idx += 3
+        else:
+            sequence = data[idx : idx + 1].lower()
+            idx += 1
+        action = KEY_SEQUENCES.get(sequence)
+        if action is not None:
+            yield action
+
+
+def run_terminal_game(
+    width: int = BOARD_WIDTH,
+    height: int = BOARD_HEIGHT,
+    telemetry_dir: Optional[Path] = None,
+) -> None:
+    state = GameState(width, height)
+    telemetry = Telemetry(telemetry_dir) if telemetry_dir is not None else None
+    if telemetry is not None:
+        state.attach_telemetry(telemetry, 0)
+    renderer = TerminalRenderer()
+    view = PlayerView(state, "Player 1", (0, 0), TERMINAL_CONTROLS)
+    fd = sys.stdin.fileno()
+    saved = termios.tcgetattr(fd)
+    tty.setcbreak(fd)
+    next_drop = time.monotonic() + drop_delay_for_level(state.level) / 1000
+    drawn = None
+    try:
+        while True:
+            key = frame_key(state)
+            if key != drawn:
+                renderer.draw([view])
+                drawn = key
+            timeout = (
+                None if state.game_over else max(0.0, next_drop - time.monotonic())
+            )
+            ready, _, _ = select.select([fd], [], [], timeout)
+            if ready:
+                for action in read_keys(os.read(fd, 64)):
+                    if action == "quit":
+                        return
+                    if action == "restart":
+                        state.reset()
+                        next_drop = time.monotonic()
+                    elif not state.game_over:
+                        _apply_action(state, action)
+            now = time.monotonic()
+            if not state.game_over and now >= next_drop:
+                if not move_piece(state, dy=1):
+                    state.lock_piece()
+                    state.spawn_next()
+                next_drop = now + drop_delay_for_level(state.level) / 1000
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+        renderer.close()
+        if telemetry is not None:
+            telemetry.close()
+
+
+def _apply_action(state: GameState, action: str) -> None:
+    if action == "left":
+        move_piece(state, dx=-1)
+    elif action == "right":
+        move_piece(state, dx=1)
+    elif action == "soft_drop":
+        if move_piece(state, dy=1):
+            state.score += 1
+    elif action == "rotate_cw":
+        rotate_piece(state, 1)
+    elif action == "rotate_ccw":
+        rotate_piece(state, -1)
+    elif action == "hard_drop":
+        hard_drop(state)
@@ -0,0 +1,85 @@
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any, Optional, Protocol, Sequence, Tuple
+
+from .board import Board
+from .constants import BLOCK_SIZE
+from .pieces import Tetromino
+from .state import GameState
+
+if TYPE_CHECKING:
+    from .render import TileSet
+
+
+@dataclass(frozen=True)
+class PlayerView:
+    state: GameState
+    label: str
+    origin: Tuple[int, int]
+    controls: Sequence[str]
+    block_size: int = BLOCK_SIZE
+    tiles: Optional["TileSet"] = None
+
+
+def frame_key(state: GameState) -> Tuple[Any, ...]:
+    piece = state.current_piece
+    return (
+        state.board.revision,
+        piece.shape_key,
+        piece.rotation,
+        piece.x,
+        piece.y,
+        state.next_piece.shape_key,
+        state.score,
+        state.level,
+        state.game_over,
+    )
+
+
+def snapshot_state(state: GameState) -> GameState:
+    """Copy of everything a renderer reads, detached from the live game.
+
+    Rows become bytes, so the copy cannot be changed by later moves. The RNG
+    and event bus are left unset; a snapshot is for drawing, not playing.
+    """
+    board = state.board
+    frozen = Board.__new__(Board)
+    frozen.width = board.width
+    frozen.height = board.height
+    frozen.grid = list(map(bytes, board.grid))
+    frozen.lines_cleared = board.lines_cleared
+    frozen.last_cleared = list(board.last_cleared)
+    frozen.revision = board.revision
+    piece = state.current_piece
+    snapshot = GameState.__new__(GameState)
+    snapshot.board = frozen
+    snapshot.current_piece = Tetromino(
+        piece.shape_key, piece.rotation, piece.x, piece.y
+    )
+    snapshot.next_piece = Tetromino(state.next_piece.shape_key)
+    snapshot.score = state.score
+    snapshot.level = state.level
+    snapshot.game_over = state.game_over
+    snapshot.pending_garbage = state.pending_garbage
+    snapshot.player_id = state.player_id
+    return snapshot
+
+
+def snapshot_views(views: Sequence[PlayerView]) -> Tuple[PlayerView, ...]:
+    return tuple(replace(view, state=snapshot_state(view.state)) for view in views)
+
+
+class Renderer(Protocol):
+    def draw(self, views: Sequence[PlayerView]) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class NullRenderer:
+    def __init__(self) -> None:
+        self.frames = 0
+
+    def draw(self, views: Sequence[PlayerView]) -> None:
+        self.frames += 1
+
+    def close(self) -> None:
+        pass